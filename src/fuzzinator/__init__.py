@@ -6,7 +6,9 @@
 # according to those terms.
 
 from .controller import Controller
+from .file_slots import FileSlots
 from .pkgdata import __version__
+from .resource_limits import ResourceLimits
 
 from . import call
 from . import exporter
@@ -14,5 +16,6 @@ from . import formatter
 from . import fuzzer
 from . import listener
 from . import reduce
+from . import scheduler
 from . import tracker
 from . import update
@@ -7,6 +7,7 @@
 
 from .adaptive_timeout_decorator import AdaptiveTimeoutDecorator
 from .anonymize_decorator import AnonymizeDecorator
+from .batch_subprocess_call import BatchSubprocessCall
 from .call import Call
 from .call_decorator import CallDecorator
 from .exit_code_filter import ExitCodeFilter
@@ -15,10 +16,12 @@ from .file_writer_decorator import FileWriterDecorator
 from .gdb_backtrace_decorator import GdbBacktraceDecorator
 from .lldb_backtrace_decorator import LldbBacktraceDecorator
 from .non_issue import NonIssue
+from .output_buffer import OutputBuffer
 from .platform_info_decorator import PlatformInfoDecorator
 from .regex_automaton import RegexAutomaton
 from .regex_automaton_filter import RegexAutomatonFilter
 from .regex_filter import RegexFilter
+from .result_cache_decorator import ResultCacheDecorator
 from .sanitizer_analyzer_decorator import SanitizerAnalyzerDecorator
 from .sanitizer_automaton_filter import SanitizerAutomatonFilter
 from .stdin_subprocess_call import StdinSubprocessCall
@@ -33,6 +36,12 @@ except ImportError:
     pass
 
 try:
+    from .core_dump_backtrace_decorator import CoreDumpBacktraceDecorator
+except ImportError:
+    pass
+
+try:
+    from .forkserver_subprocess_call import ForkserverSubprocessCall
     from .test_runner_subprocess_call import TestRunnerSubprocessCall
 except ImportError:
     pass
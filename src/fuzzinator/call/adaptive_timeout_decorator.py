@@ -1,27 +1,134 @@
-# Copyright (c) 2021-2023 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2021-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
 # This file may not be copied, modified, or distributed except
 # according to those terms.
 
+import hashlib
+import mmap
+import os
+import tempfile
+import time
+
+from bisect import bisect_left
 from inspect import signature
-from math import ceil, sqrt
+from itertools import accumulate
+from math import ceil, log, sqrt
 from multiprocessing import Value
 
+from ..config import as_path
+
+
+class RunTimeSketch:
+    """
+    Streaming quantile sketch of SUT run times, stored in a memory-mapped file
+    so that it can be shared (and updated) by multiple processes. The run
+    times are counted in logarithmic buckets (like in DDSketch), which gives
+    quantiles with a bounded relative error.
+
+    The updates of the sketch are not synchronized between processes. A
+    concurrent update may get lost, which only makes the sketch slightly
+    more approximate.
+
+    :param str path: path of the file backing the sketch (created if it does
+        not exist).
+    :param float accuracy: relative accuracy of the quantiles.
+    """
+
+    min_time = 1e-4
+    buckets = 2048
+
+    def __init__(self, path, accuracy=0.01):
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = log(self.gamma)
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o600)
+        try:
+            size = self.buckets * 8
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            self.mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self.counts = memoryview(self.mmap).cast('Q')
+
+    def close(self):
+        self.counts.release()
+        self.mmap.close()
+
+    def add(self, run_time):
+        """
+        Count a run time (in seconds).
+        """
+        index = ceil(log(run_time / self.min_time) / self.log_gamma) if run_time > self.min_time else 0
+        self.counts[min(index, self.buckets - 1)] += 1
+
+    def quantiles(self, *qs):
+        """
+        Estimate quantiles of the run times.
+
+        :param float qs: the quantiles to estimate (between 0 and 1).
+        :return: the number of the run times counted so far, and the estimated
+            run time for each quantile (``None`` if the sketch is empty).
+        """
+        cumulative = list(accumulate(self.counts))
+        count = cumulative[-1]
+        estimates = []
+        for q in qs:
+            if not count:
+                estimates.append(None)
+                continue
+            index = bisect_left(cumulative, max(q * count, 1))
+            # The representative value of a bucket has the same relative
+            # distance from both bounds of the bucket.
+            estimates.append(self.min_time * 2 * self.gamma ** index / (self.gamma + 1))
+        return count, estimates
+
 
 class AdaptiveTimeoutDecorator:
     """
-    Decorator for SUT calls used in validate or reduce jobs. It helps
-    dynamically optimizing the timeout of SUT calls. It works with SUTs
-    that receive and respect a ``timeout`` kwarg both in their ``__init__``
-    and ``__call__`` methods. Further requirement is that the issue dict
-    provided by the decorated SUT call must contain ``time`` and ``id`` fields.
-    Having these requirements fulfilled, the decorator adapts the timeout of
-    the next call by taking the geometric mean of the previous two execution
-    times that reproduced the expected issue.
+    Decorator for SUT calls that helps dynamically optimizing the timeout of
+    SUT calls. It works with SUTs that receive and respect a ``timeout``
+    kwarg both in their ``__init__`` and ``__call__`` methods.
+
+    By default, the decorator is meant for SUT calls used in validate or
+    reduce jobs. Its further requirement is that the issue dict provided by
+    the decorated SUT call must contain ``time`` and ``id`` fields. Having
+    these requirements fulfilled, the decorator adapts the timeout of the next
+    call by taking the geometric mean of the previous two execution times that
+    reproduced the expected issue.
+
+    If the ``percentile`` parameter is given, the decorator can be used in any
+    job, including fuzz jobs. Then, it keeps a streaming quantile sketch of
+    the run times of the SUT (see :class:`RunTimeSketch`), shared by all the
+    jobs (processes) of the fuzz session, and sets the timeout of every call to
+    the given percentile of the run times multiplied by ``factor`` (but never
+    longer than the configured timeout). If a call takes as long as the
+    shortened timeout, i.e., the SUT seems to hang, the call is repeated with
+    the configured timeout before its result is returned (whether the SUT
+    call reports timeouts as issues or not). The run time of a call that
+    times out is only known to be at least the timeout, thus, it is counted
+    in the sketch as the timeout (a censored sample), which keeps the
+    percentiles from being underestimated when many calls time out. The
+    sketch is closed when the context of the SUT call is exited. The
+    decorated SUT call object exposes the statistics of the sketch in its
+    ``timeout_stats`` attribute, which is reported to the listeners by the
+    jobs via
+    :meth:`fuzzinator.listener.EventListener.on_call_timeout_updated`.
+
+    **Optional parameters of the decorator:**
 
-    The decorator takes no parameter.
+      - ``percentile``: percentile of the run times to base the timeout on
+        (e.g., 99; default: percentile-based timeout is disabled).
+      - ``factor``: multiplier of the percentile (default: 2).
+      - ``min_samples``: number of run times to collect before the timeout is
+        shortened (default: 100).
+      - ``sketch_file``: path of the file backing the shared sketch, which
+        may also be shared by fuzz sessions (default: a file in the working
+        directory of the fuzz session, named after the configuration of the
+        decorated SUT call).
 
     **Example configuration snippet:**
 
@@ -36,28 +143,78 @@ class AdaptiveTimeoutDecorator:
             command=./bin/foo {test}
             cwd=/home/alice/foo
             timeout=3
+
+            [sut.bar]
+            call=fuzzinator.call.SubprocessCall
+            call.decorate(0)=fuzzinator.call.AdaptiveTimeoutDecorator
+
+            [sut.bar.call]
+            command=./bin/bar {test}
+            cwd=/home/alice/bar
+            timeout=10
+
+            [sut.bar.call.decorate(0)]
+            percentile=99
+            factor=3
+            sketch_file=/home/alice/bar/times.sketch
     """
 
-    def __init__(self, **kwargs):
-        pass
+    def __init__(self, *, percentile=None, factor=None, min_samples=None, sketch_file=None, work_dir=None, **kwargs):
+        self.percentile = float(percentile) if percentile else None
+        self.factor = float(factor) if factor else 2.0
+        self.min_samples = int(min_samples) if min_samples else 100
+        self.sketch_file = as_path(sketch_file) if sketch_file else None
+        # The implicit working directory of the decorator is unique to every
+        # instance but its parent is the working directory of the session.
+        self.sketch_dir = os.path.dirname(work_dir) if work_dir else tempfile.gettempdir()
 
     def __call__(self, call_class):
+        decorator = self
 
         class DecoratedCall(call_class):
 
             def __init__(self, **kwargs):
                 signature(self.__init__).bind(**kwargs)
                 super().__init__(**kwargs)
+                self.__sketch = None
+                self.__sketch_file = None
                 if 'timeout' in kwargs:
                     self.__initial_timeout = int(kwargs['timeout'])
-                    # NOTE: not checking for parallelism, we simply prepare for it
-                    self.__adapted_timeout = Value('i', -1, lock=False)
+                    if decorator.percentile:
+                        self.__sketch_file = decorator.sketch_file or self.__default_sketch_file(kwargs)
+                        self.__adapted_timeout = self.__initial_timeout
+                        self.__calls = 0
+                        self.timeout_stats = {}
+                    else:
+                        # NOTE: not checking for parallelism, we simply prepare for it
+                        self.__adapted_timeout = Value('i', -1, lock=False)
                 else:
                     self.__initial_timeout = None
                     self.__adapted_timeout = None
             __init__.__signature__ = signature(call_class.__init__)
 
+            @staticmethod
+            def __default_sketch_file(kwargs):
+                # The implicit working directory of the SUT call is unique to
+                # every instance, it must not distinguish configurations.
+                classes = [f'{c.__module__}.{c.__qualname__}' for c in call_class.__mro__]
+                config = sorted((key, str(value)) for key, value in kwargs.items() if key != 'work_dir')
+                digest = hashlib.sha256(repr((classes, config)).encode('utf-8')).hexdigest()
+                return os.path.join(decorator.sketch_dir, f'times-{digest[:16]}.sketch')
+
+            def __exit__(self, *exc):
+                try:
+                    return super().__exit__(*exc)
+                finally:
+                    # The sketch is opened again if the call is reused.
+                    if self.__sketch:
+                        self.__sketch.close()
+                        self.__sketch = None
+
             def __call__(self, *, test, **kwargs):
+                if self.__sketch_file:
+                    return self.__call_with_percentile(test=test, **kwargs)
+
                 if self.__adapted_timeout:
                     adapted_timeout = self.__adapted_timeout.value
                     if adapted_timeout == -1:
@@ -77,4 +234,53 @@ class AdaptiveTimeoutDecorator:
                     self.__adapted_timeout.value = min(max(ceil(sqrt(issue['time'] * self.__adapted_timeout.value)), 1), self.__initial_timeout)
                 return issue
 
+            def __call_with_percentile(self, *, test, **kwargs):
+                if not self.__sketch:
+                    self.__sketch = RunTimeSketch(self.__sketch_file)
+
+                # Re-estimating the percentile walks the whole sketch, hence
+                # it is done periodically only.
+                if self.__calls % 32 == 0:
+                    self.__update_timeout()
+                self.__calls += 1
+
+                timeout = self.__adapted_timeout
+                kwargs['timeout'] = timeout
+                start_time = time.time()
+                issue = super().__call__(test=test, **kwargs)
+                run_time = time.time() - start_time
+
+                if run_time < timeout:
+                    self.__sketch.add(run_time)
+                    return issue
+
+                if timeout < self.__initial_timeout:
+                    # The SUT seems to hang (no matter whether that is
+                    # reported as an issue or not), but it may just be slow:
+                    # confirm with the configured timeout.
+                    timeout = self.__initial_timeout
+                    kwargs['timeout'] = timeout
+                    start_time = time.time()
+                    issue = super().__call__(test=test, **kwargs)
+                    run_time = time.time() - start_time
+                    if run_time < timeout:
+                        self.__sketch.add(run_time)
+                        self.timeout_stats['refuted_hangs'] = self.timeout_stats.get('refuted_hangs', 0) + 1
+                        # Adapt to the slower run times immediately.
+                        self.__update_timeout()
+                        return issue
+
+                # The run time of the hang is at least the timeout.
+                self.__sketch.add(timeout)
+                self.timeout_stats['hangs'] = self.timeout_stats.get('hangs', 0) + 1
+                return issue
+
+            def __update_timeout(self):
+                count, (p50, p90, percentile) = self.__sketch.quantiles(0.5, 0.9, decorator.percentile / 100)
+                if count >= decorator.min_samples:
+                    self.__adapted_timeout = min(percentile * decorator.factor, self.__initial_timeout)
+                else:
+                    self.__adapted_timeout = self.__initial_timeout
+                self.timeout_stats.update(samples=count, p50=p50, p90=p90, percentile=percentile, timeout=self.__adapted_timeout)
+
         return DecoratedCall
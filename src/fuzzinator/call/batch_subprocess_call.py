@@ -0,0 +1,203 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import logging
+import os
+import shutil
+import subprocess
+import time
+
+from ..config import as_bool, as_dict, as_pargs, as_path, decode
+from ..resource_limits import ResourceLimits
+from .call import Call
+from .non_issue import NonIssue
+from .output_buffer import run_subprocess, truncation_details
+
+logger = logging.getLogger(__name__)
+
+
+class BatchSubprocessCall(Call):
+    """
+    Subprocess invocation-based call of a SUT that can take multiple test
+    inputs (files) on its command line in one invocation. Besides being
+    callable with one test like other SUT calls, it can also be called with a
+    batch of tests via :meth:`call_batch`, which is used by fuzz jobs to
+    execute ``batch_size`` tests in one SUT process. If the SUT process of a
+    batch fails, the batch is bisected to find the test that triggered the
+    failure, which is then called individually to create the issue.
+
+    The test inputs are written to files in an implicit temporary working
+    directory.
+
+    **Mandatory parameter of the SUT call:**
+
+      - ``command``: string to pass to the child shell as a command to run. The
+        argument ``{tests}`` in the string is replaced by the paths of the
+        files that contain the test inputs. (``{tests}`` must be a standalone
+        argument.)
+
+    **Optional parameters of the SUT call:**
+
+      - ``cwd``: if not ``None``, change working directory before the command
+        invocation.
+      - ``env``: if not ``None``, a dictionary of variable names-values to
+        update the environment with.
+      - ``no_exit_code``: makes possible to force issue creation regardless of
+        the exit code.
+      - ``timeout``: run subprocess with timeout (per test, i.e., a batch of
+        tests gets a proportionally longer timeout).
+      - ``encoding``: stdout and stderr encoding (default: autodetect).
+      - ``max_output``: if not ``None``, the maximum number of bytes kept of
+        stdout and stderr each.
+      - ``filename``: name pattern for the test input files, which may contain
+        the substring ``{uid}`` as a placeholder for the index of the test in
+        the batch (default: ``test-{uid}``).
+      - ``batch_size``: number of tests to execute in one SUT process
+        (default: 10).
+      - ``memory_limit``, ``cpu_time_limit``, ``max_procs``,
+        ``max_file_size``, ``cgroup``: resource limits of the SUT process
+        (see :class:`fuzzinator.ResourceLimits`).
+
+    **Result of the SUT call:**
+
+      - If the child process exits with 0 exit code, no issue is returned.
+      - Otherwise, an issue with ``'exit_code'``, ``'stdout'``, ``'stderr'``
+        and ``'time'`` properties is returned. If the process was terminated
+        by a resource limit, the cause is recorded in the
+        ``'resource_limit'`` property.
+
+    **Example configuration snippet:**
+
+        .. code-block:: ini
+
+            [sut.foo]
+            call=fuzzinator.call.BatchSubprocessCall
+
+            [sut.foo.call]
+            # assuming that foo takes an arbitrary number of files as input
+            # specified on command line
+            command=./bin/foo {tests}
+            cwd=/home/alice/foo
+            filename=test-{uid}.js
+            batch_size=20
+    """
+
+    def __init__(self, *, command, cwd=None, env=None, no_exit_code=None, timeout=None, encoding=None, max_output=None, filename=None, batch_size=None, memory_limit=None, cpu_time_limit=None, max_procs=None, max_file_size=None, cgroup=None, work_dir, **kwargs):
+        self.command = command
+        self.cwd = as_path(cwd) if cwd else os.getcwd()
+        self.env = dict(os.environ, **as_dict(env)) if env else None
+        self.no_exit_code = as_bool(no_exit_code)
+        self.timeout = int(timeout) if timeout else None
+        self.encoding = encoding
+        self.max_output = int(max_output) if max_output else None
+        self.filename = filename or 'test-{uid}'
+        self.batch_size = int(batch_size) if batch_size else 10
+        self.limits = ResourceLimits(memory_limit=memory_limit, cpu_time_limit=cpu_time_limit, max_procs=max_procs, max_file_size=max_file_size, cgroup=cgroup)
+        self.work_dir = work_dir
+
+    def __exit__(self, *exc):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        return False
+
+    def __call__(self, *, test, timeout=None, **kwargs):
+        return self._run([test], timeout=timeout)
+
+    def call_batch(self, *, tests):
+        """
+        Call the SUT with a batch of tests. The tests are executed in as few
+        SUT processes as possible (at most ``batch_size`` tests per process,
+        but the batches given to this method are expected to be not larger).
+
+        If the process of a batch fails, the batch is bisected (assuming that
+        the tests are independent) to find the first test that triggers the
+        failure, and that test is called individually (via ``self``, i.e.,
+        through the decorators of the call, if any) to get the issue.
+
+        :param list tests: the tests to call the SUT with.
+        :return: The results of the SUT calls for a prefix of ``tests``, where
+            only the last result may be an issue (i.e., the tests after the
+            first issue-triggering test are not taken into account).
+        :rtype: list
+        """
+        results = []
+        start = 0
+        while start < len(tests):
+            end = len(tests)
+            if not self._run(tests[start:end]):
+                results.extend([None] * (end - start))
+                break
+
+            # Bisect [start:end) for the first failing test. The tests in
+            # [start:passed) are known to pass, the batch [passed:end) is
+            # known to fail.
+            passed = start
+            while end - passed > 1:
+                mid = (passed + end) // 2
+                if self._run(tests[passed:mid]):
+                    end = mid
+                else:
+                    passed = mid
+
+            results.extend([None] * (end - 1 - start))
+            issue = self(test=tests[end - 1])
+            results.append(issue)
+            if issue:
+                break
+            start = end
+
+        return results
+
+    def _run(self, tests, timeout=None):
+        os.makedirs(self.work_dir, exist_ok=True)
+        test_paths = []
+        for uid, test in enumerate(tests):
+            test_path = os.path.join(self.work_dir, self.filename.format(uid=uid))
+            with open(test_path, 'w' if not isinstance(test, bytes) else 'wb') as f:
+                f.write(test if isinstance(test, (str, bytes)) else str(test))
+            test_paths.append(test_path)
+
+        args = []
+        for arg in as_pargs(self.command):
+            if arg == '{tests}':
+                args.extend(test_paths)
+            else:
+                args.append(arg)
+
+        timeout = timeout or self.timeout
+        issue = {}
+
+        try:
+            start_time = time.time()
+            result = run_subprocess(args,
+                                    max_output=self.max_output,
+                                    cwd=self.cwd,
+                                    env=self.env,
+                                    limits=self.limits,
+                                    timeout=timeout * len(tests) if timeout else None)
+            end_time = time.time()
+            stdout, stderr = decode(result.stdout.getvalue(), self.encoding), decode(result.stderr.getvalue(), self.encoding)
+            logger.debug('%s\n%s', stdout, stderr)
+
+            issue = {
+                'exit_code': result.returncode,
+                'stdout': stdout,
+                'stderr': stderr,
+                'time': end_time - start_time,
+            }
+            issue.update(truncation_details(stdout=result.stdout, stderr=result.stderr))
+            resource_limit = self.limits.classify(result.returncode)
+            if resource_limit:
+                issue['resource_limit'] = resource_limit
+            if self.no_exit_code or result.returncode != 0:
+                return issue
+        except subprocess.TimeoutExpired as e:
+            logger.debug('BatchSubprocessCall execution timeout (%ds) expired.\n%s\n%s',
+                         e.timeout,
+                         decode(e.stdout or b'', self.encoding),
+                         decode(e.stderr or b'', self.encoding))
+
+        return NonIssue(issue)
@@ -0,0 +1,247 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import glob
+import logging
+import os
+import re
+import resource
+import shutil
+import subprocess
+import time
+
+from uuid import uuid4
+
+from ..config import as_bool, as_path, decode
+from .call_decorator import CallDecorator
+
+logger = logging.getLogger(__name__)
+
+
+class CoreDumpBacktraceDecorator(CallDecorator):
+    """
+    Decorator for subprocess-based SUT calls to get backtraces from the core
+    dumps of the crashing SUT processes, i.e., without executing the SUT once
+    more under a debugger (like :class:`fuzzinator.call.GdbBacktraceDecorator`
+    does), and also for crashes that are not reproducible.
+
+    The decorator works in two modes. By default, it enables core dumps for
+    the SUT (by raising the ``RLIMIT_CORE`` resource limit of the SUT
+    processes to the hard limit, via the resource limits of the decorated SUT
+    call, see :class:`fuzzinator.ResourceLimits`; thus, the decorated SUT call
+    should be one of the subprocess-based calls supporting resource limits),
+    and if the decorated SUT call returns an issue, it
+    moves the core dump of the crashing SUT process to ``core_dir`` and
+    extends the issue with the new ``'core'`` property containing the path of
+    the core dump. In ``symbolize`` mode, the decorator expects the path of a
+    core dump as the ``core`` argument of the call (i.e., it is meant to be
+    used in the ``enrich_call`` of the SUT, see
+    :class:`fuzzinator.Controller`), and it returns an issue with a
+    ``'backtrace'`` property containing the result of GDB's ``bt`` command on
+    the core dump (which is removed afterwards). The SUT is not executed in
+    this mode, unless the core dump does not exist anymore (e.g., because it
+    was removed above the quota of ``core_dir`` before the issue could be
+    enriched).
+
+    The location of core dumps is determined by the system (see
+    ``/proc/sys/kernel/core_pattern`` on Linux, which can only be set by the
+    administrator). Core dumps piped to a helper program (e.g., to
+    systemd-coredump) cannot be collected. Relative core patterns are
+    interpreted relative to ``cwd``, which should be the same as the working
+    directory of the SUT. The core dump of a crash is identified as the most
+    recent core dump created during the call, which may be ambiguous if the
+    SUT is called concurrently (see option ``fuzz_concurrency`` of SUTs).
+
+    **Mandatory parameters of the decorator:**
+
+      - ``executable``: path of the SUT executable (needed by GDB to
+        symbolize the core dumps).
+      - ``core_dir``: directory to collect the core dumps in (should be
+        shared by the ``call`` and ``enrich_call`` of the SUT).
+
+    **Optional parameters of the decorator:**
+
+      - ``cwd``: working directory of the SUT (default: the current working
+        directory).
+      - ``symbolize``: boolean to switch to symbolize mode (default:
+        ``False``).
+      - ``max_count``: maximum number of core dumps kept in ``core_dir``, the
+        oldest ones are removed above this limit (default: 10).
+      - ``max_size``: maximum total size of the core dumps kept in
+        ``core_dir`` in bytes (default: no limit).
+      - ``timeout``: timeout (in seconds) of GDB (default: no timeout).
+      - ``encoding``: GDB output encoding (default: autodetect).
+
+    **Example configuration snippet:**
+
+        .. code-block:: ini
+
+            [sut.foo]
+            call=fuzzinator.call.SubprocessCall
+            call.decorate(0)=fuzzinator.call.CoreDumpBacktraceDecorator
+            enrich_call=fuzzinator.call.SubprocessCall
+            enrich_call.decorate(0)=fuzzinator.call.CoreDumpBacktraceDecorator
+
+            [sut.foo.call]
+            # assuming that {test} is something that can be interpreted by foo as
+            # command line argument
+            command=./bin/foo {test}
+            cwd=/home/alice/foo
+
+            [sut.foo.call.decorate(0)]
+            executable=${sut.foo.call:cwd}/bin/foo
+            core_dir=${fuzzinator:work_dir}/cores/foo
+            cwd=${sut.foo.call:cwd}
+            max_size=1000000000
+
+            [sut.foo.enrich_call]
+            command=${sut.foo.call:command}
+            cwd=${sut.foo.call:cwd}
+
+            [sut.foo.enrich_call.decorate(0)]
+            executable=${sut.foo.call:cwd}/bin/foo
+            core_dir=${fuzzinator:work_dir}/cores/foo
+            cwd=${sut.foo.call:cwd}
+            symbolize=True
+    """
+
+    def __init__(self, *, executable, core_dir, cwd=None, symbolize=None, max_count=None, max_size=None, timeout=None, encoding=None, **kwargs):
+        self.executable = as_path(executable)
+        self.core_dir = as_path(core_dir)
+        self.cwd = as_path(cwd) if cwd else os.getcwd()
+        self.symbolize = as_bool(symbolize)
+        self.max_count = int(max_count) if max_count else 10
+        self.max_size = int(max_size) if max_size else None
+        self.timeout = int(timeout) if timeout else None
+        self.encoding = encoding
+
+    def init(self, cls, obj, **kwargs):
+        super(cls, obj).__init__(**kwargs)
+        # Only the limit of the SUT processes is raised, not that of the
+        # whole fuzzinator process.
+        _, hard = resource.getrlimit(resource.RLIMIT_CORE)
+        if hard == 0:
+            logger.warning('core dumps are disabled by the hard resource limit of the process')
+        if hasattr(obj, 'limits'):
+            obj.limits.max_core_size = hard
+        else:
+            logger.warning('%s does not support resource limits, core dumps are only created if the RLIMIT_CORE soft limit of the process allows', cls.__name__)
+
+    def call(self, cls, obj, *, test, **kwargs):
+        if self.symbolize:
+            core = kwargs.pop('core', None)
+            if core and os.path.exists(core):
+                backtrace = self._symbolize(core)
+                return {'backtrace': backtrace} if backtrace is not None else None
+            if core:
+                logger.warning('Core dump %s does not exist anymore (removed above the quota of %s?), re-running the SUT to symbolize its core dump.', core, self.core_dir)
+
+        start_time = time.time()
+        issue = super(cls, obj).__call__(test=test, **kwargs)
+        if not issue:
+            return issue
+
+        core = self._collect(start_time)
+        if core:
+            if self.symbolize:
+                backtrace = self._symbolize(core)
+                if backtrace is not None:
+                    issue['backtrace'] = backtrace
+            else:
+                issue['core'] = core
+        return issue
+
+    def _core_pattern(self):
+        try:
+            with open('/proc/sys/kernel/core_pattern') as f:
+                pattern = f.read().strip()
+            with open('/proc/sys/kernel/core_uses_pid') as f:
+                uses_pid = f.read().strip() == '1'
+        except OSError:
+            pattern, uses_pid = 'core', False
+
+        if pattern.startswith('|'):
+            logger.warning('core dumps are piped to %s, they cannot be collected', pattern[1:].split()[0])
+            return None
+
+        # The kernel appends the pid to patterns without %p if core_uses_pid
+        # is set. The %-specifiers of the pattern are turned into wildcards.
+        if uses_pid and '%p' not in pattern:
+            pattern += '.%p'
+        pattern = re.sub(r'%(.)', lambda m: '%' if m.group(1) == '%' else '*', glob.escape(pattern))
+        return os.path.join(self.cwd, pattern)
+
+    def _collect(self, start_time):
+        pattern = self._core_pattern()
+        if not pattern:
+            return None
+
+        cores = []
+        for path in glob.glob(pattern):
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            # Allow for the coarse timestamps of some file systems.
+            if mtime >= start_time - 1 and os.path.isfile(path):
+                cores.append((mtime, path))
+        if not cores:
+            logger.debug('No core dump found for the issue.')
+            return None
+
+        os.makedirs(self.core_dir, exist_ok=True)
+        # The decorator (and SUT call) objects are renewed after issues, their
+        # core dumps must not overwrite each other.
+        core = os.path.join(self.core_dir, f'core-{os.getpid()}-{uuid4().hex}')
+        try:
+            shutil.move(max(cores)[1], core)
+        except OSError as e:
+            # The core dump may have been taken by a concurrent SUT call.
+            logger.debug('Failed to collect core dump.', exc_info=e)
+            return None
+        self._cleanup()
+        return core if os.path.exists(core) else None
+
+    def _cleanup(self):
+        # Remove the oldest core dumps above the quota.
+        cores = []
+        for name in os.listdir(self.core_dir):
+            path = os.path.join(self.core_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            cores.append((st.st_mtime, path, st.st_size))
+        cores.sort()
+
+        total_size = sum(size for _, _, size in cores)
+        while cores and (len(cores) > self.max_count or (self.max_size is not None and total_size > self.max_size)):
+            _, path, size = cores.pop(0)
+            # The issue of the core dump may not have been enriched yet, then
+            # the SUT is re-run in symbolize mode.
+            logger.info('Removing core dump %s above the quota of %s.', path, self.core_dir)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    def _symbolize(self, core):
+        try:
+            result = subprocess.run(['gdb', '-batch', '-nx', '-ex', 'set width unlimited', '-ex', 'bt', self.executable, core],
+                                    stdin=subprocess.DEVNULL,
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE,
+                                    cwd=self.cwd,
+                                    timeout=self.timeout,
+                                    check=False)
+            return decode(result.stdout, self.encoding)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning('Failed to symbolize core dump %s', core, exc_info=e)
+            return None
+        finally:
+            os.remove(core)
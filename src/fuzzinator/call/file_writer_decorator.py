@@ -1,4 +1,4 @@
-# Copyright (c) 2016-2021 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
@@ -9,6 +9,9 @@ import logging
 import os
 import shutil
 
+from threading import Lock
+
+from ..file_slots import FileSlots
 from .call_decorator import CallDecorator
 
 logger = logging.getLogger(__name__)
@@ -26,6 +29,20 @@ class FileWriterDecorator(CallDecorator):
         substring ``{uid}`` as a placeholder for a unique string (replaced by
         the decorator).
 
+    **Optional parameters of the decorator:**
+
+      - ``storage``: where to write the test inputs to. ``disk`` (the default)
+        creates a new file in the working directory for every test and removes
+        it afterwards. ``tmpfs`` and ``memfd`` reuse a fixed set of in-memory
+        files (see :class:`fuzzinator.FileSlots`), which avoids most of the
+        file system operations per test. (Note that with ``memfd``, the path
+        passed to the SUT is a ``/proc/<pid>/fd/<fd>`` path, i.e., its name
+        does not follow ``filename``.)
+      - ``slots``: number of reused files for ``tmpfs`` and ``memfd`` storages
+        (default: 1). A file is reused only after the SUT call with the test
+        written to it has returned, thus, more slots are only needed if the
+        same SUT call object is called concurrently.
+
     The issue returned by the decorated SUT (if any) is extended with the new
     ``'filename'`` property containing the name of the generated file (although
     the file itself is removed).
@@ -44,20 +61,26 @@ class FileWriterDecorator(CallDecorator):
 
             [sut.foo.call.decorate(0)]
             filename=test-{uid}.txt
+            storage=tmpfs
     """
 
-    def __init__(self, *, filename, work_dir, **kwargs):
+    def __init__(self, *, filename, storage=None, slots=None, work_dir, **kwargs):
         if os.path.basename(filename) != filename:
             logger.warning('specifying directories in filename parameter of fuzzinator.call.FileWriterDecorator is deprecated (%s) (explicit use of ${fuzzinator:work_dir}?)', filename)
             filename = os.path.basename(filename)
 
         self.filename = filename
+        self.file_slots = FileSlots(storage=storage, filename=filename, slots=int(slots) if slots else 1, work_dir=work_dir) if storage and storage != 'disk' else None
 
         self.work_dir = work_dir
         self.uid = 0
+        # SUT calls sharing the decorator may be called concurrently.
+        self.uid_lock = Lock()
 
     def exit(self, cls, obj, *exc):
         suppress = super(cls, obj).__exit__(*exc)
+        if self.file_slots:
+            self.file_slots.close()
         shutil.rmtree(self.work_dir, ignore_errors=True)
         return suppress
 
@@ -67,8 +90,22 @@ class FileWriterDecorator(CallDecorator):
             # config file and its name will be what is expected by the kwargs.
             filename = kwargs['filename']
         else:
-            filename = self.filename.format(uid=self.uid)
-            self.uid += 1
+            with self.uid_lock:
+                uid = self.uid
+                self.uid += 1
+            filename = self.filename.format(uid=uid)
+
+            if self.file_slots:
+                # The slot is overwritten by a later test, no need to remove.
+                file_path = self.file_slots.write(test, uid)
+                try:
+                    issue = super(cls, obj).__call__(test=file_path, **kwargs)
+                finally:
+                    self.file_slots.release(file_path)
+                if issue:
+                    issue['filename'] = filename
+                return issue
+
         file_path = os.path.join(self.work_dir, filename)
 
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
@@ -0,0 +1,320 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import errno
+import fcntl
+import logging
+import os
+import select
+import shutil
+import signal
+import struct
+import subprocess
+import sys
+import time
+
+from ..config import as_bool, as_dict, as_pargs, as_path, decode
+from ..controller import Controller
+from ..resource_limits import ResourceLimits
+from .call import Call
+from .non_issue import NonIssue
+from .output_buffer import OutputBuffer, truncation_details
+
+logger = logging.getLogger(__name__)
+
+
+class ForkserverSubprocessCall(Call):
+    """
+    Forkserver-based call of a SUT that takes test input from its standard
+    input or from a file. The SUT is started only once (when the context of the
+    call is entered) and, after it has initialized itself, it forks a new child
+    process for every test instead of being executed anew.
+
+    The SUT must implement the forkserver protocol of AFL (SUTs instrumented by
+    the classic AFL compilers implement it automatically), i.e., the SUT is
+    started with file descriptor 198 open for reading control messages and file
+    descriptor 199 open for writing status messages, where every message is a
+    4-byte native integer:
+
+      1. When initialized, the SUT writes a hello message to 199.
+      2. For every test, the SUT reads a message from 198, forks, writes the pid
+         of the child to 199, waits for the child to terminate, and writes its
+         exit status (as returned by ``waitpid``) to 199.
+      3. The child closes 198 and 199 and processes the test.
+
+    The test input is written to a file in an implicit temporary working
+    directory, which is also the standard input of the SUT, and is rewound
+    before every test.
+
+    **Mandatory parameter of the SUT call:**
+
+      - ``command``: string to pass to the child shell as a command to run (all
+        occurrences of ``{test}`` in the string are replaced by the path of the
+        file that contains the test input).
+
+    **Optional parameters of the SUT call:**
+
+      - ``cwd``: if not ``None``, change working directory before the command
+        invocation.
+      - ``env``: if not ``None``, a dictionary of variable names-values to
+        update the environment with.
+      - ``no_exit_code``: makes possible to force issue creation regardless of
+        the exit code.
+      - ``timeout``: kill the child process of the SUT if it does not terminate
+        within the given number of seconds.
+      - ``init_timeout``: the number of seconds to wait for the SUT to
+        initialize itself and start the forkserver (default: 10 times
+        ``timeout``, or 60 seconds if ``timeout`` is not given). If the
+        forkserver does not start in time (or the SUT does not implement the
+        forkserver protocol), the SUT is killed and :exc:`TimeoutError` (or
+        :exc:`EOFError`) is raised. The forkserver is also restarted if it
+        does not respond to a test in time.
+      - ``encoding``: stdout and stderr encoding (default: autodetect).
+      - ``filename``: name of the file that contains the test input (default:
+        ``test``).
+      - ``max_output``: if not ``None``, the maximum number of bytes kept of
+        stdout and stderr each (the beginning and the end of the output are
+        kept, the middle is dropped).
+      - ``memory_limit``, ``cpu_time_limit``, ``max_procs``,
+        ``max_file_size``, ``cgroup``: resource limits of the SUT process,
+        inherited by its forked children (see
+        :class:`fuzzinator.ResourceLimits`).
+
+    **Result of the SUT call:**
+
+      - If the child process exits with 0 exit code, no issue is returned.
+      - Otherwise, an issue with ``'exit_code'``, ``'stdout'``, ``'stderr'``
+        and ``'time'`` properties is returned. If the output was truncated
+        because of ``max_output``, the number of dropped bytes is recorded in
+        ``'stdout_truncated'`` and/or ``'stderr_truncated'`` properties. If
+        the child process was terminated by a resource limit, the cause is
+        recorded in the ``'resource_limit'`` property.
+
+    .. note::
+
+       Not available on platforms without fcntl support (e.g., Windows).
+
+    **Example configuration snippet:**
+
+        .. code-block:: ini
+
+            [sut.foo]
+            call=fuzzinator.call.ForkserverSubprocessCall
+
+            [sut.foo.call]
+            # assuming that foo is instrumented with afl-gcc and takes one file
+            # as input specified on command line
+            command=./bin/foo {test}
+            cwd=/home/alice/foo
+            filename=test.js
+            timeout=5
+    """
+
+    CONTROL_FD = 198
+    STATUS_FD = 199
+
+    # Move the fds given in the first two arguments to the fixed positions of
+    # the forkserver fds and execute the rest of the arguments.
+    _launcher = ('import os, sys\n'
+                 f'targets = ({CONTROL_FD}, {STATUS_FD})\n'
+                 'fds = [int(fd) for fd in sys.argv[1:3]]\n'
+                 'dups = [os.dup(fd) for fd in fds]\n'
+                 'for dup, target in zip(dups, targets):\n'
+                 '    os.dup2(dup, target)\n'
+                 '    os.close(dup)\n'
+                 'for fd in fds:\n'
+                 '    if fd not in targets:\n'
+                 '        os.close(fd)\n'
+                 'os.execvp(sys.argv[3], sys.argv[3:])\n')
+
+    def __init__(self, *, command, cwd=None, env=None, no_exit_code=None, timeout=None, init_timeout=None, encoding=None, filename=None, max_output=None, memory_limit=None, cpu_time_limit=None, max_procs=None, max_file_size=None, cgroup=None, work_dir, **kwargs):
+        self.command = command
+        self.cwd = as_path(cwd) if cwd else os.getcwd()
+        self.env = dict(os.environ, **as_dict(env)) if env else None
+        self.no_exit_code = as_bool(no_exit_code)
+        self.timeout = int(timeout) if timeout else None
+        self.init_timeout = float(init_timeout) if init_timeout else 10 * self.timeout if self.timeout else 60
+        self.encoding = encoding
+        self.filename = filename or 'test'
+        self.max_output = int(max_output) if max_output else None
+        self.limits = ResourceLimits(memory_limit=memory_limit, cpu_time_limit=cpu_time_limit, max_procs=max_procs, max_file_size=max_file_size, cgroup=cgroup)
+        self.work_dir = work_dir
+
+        self.proc = None
+        self.test_file = None
+        self.control_fd = None
+        self.status_fd = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        return False
+
+    def __call__(self, *, test, timeout=None, **kwargs):
+        if not self.proc or self.proc.poll() is not None:
+            self.start()
+
+        self.test_file.seek(0)
+        self.test_file.truncate()
+        self.test_file.write(test if isinstance(test, bytes) else str(test).encode('utf-8', errors='ignore'))
+        self.test_file.flush()
+        self.test_file.seek(0)
+
+        streams = {self.proc.stdout.fileno(): OutputBuffer(self.max_output), self.proc.stderr.fileno(): OutputBuffer(self.max_output)}
+        timeout = timeout or self.timeout
+        issue = {}
+
+        try:
+            start_time = time.time()
+            os.write(self.control_fd, struct.pack('i', 0))
+            pid = self._read_status(streams, start_time + self.init_timeout)
+            if pid is None:
+                raise TimeoutError('forkserver did not fork in time')
+            status = self._read_status(streams, start_time + timeout if timeout else None)
+            if status is None:
+                os.kill(pid, signal.SIGKILL)
+                if self._read_status(streams, time.time() + self.init_timeout) is None:
+                    raise TimeoutError('forkserver did not report the killed child in time')
+                logger.debug('ForkserverSubprocessCall execution timeout (%ds) expired.\n%s\n%s',
+                             timeout,
+                             decode(streams[self.proc.stdout.fileno()].getvalue(), self.encoding),
+                             decode(streams[self.proc.stderr.fileno()].getvalue(), self.encoding))
+                return NonIssue(issue)
+            end_time = time.time()
+            self._read_streams(streams)
+        except (OSError, EOFError) as e:
+            logger.warning('Forkserver of %s stopped unexpectedly.', self.command, exc_info=e)
+            self.stop()
+            return NonIssue(issue)
+
+        exit_code = os.waitstatus_to_exitcode(status)
+        stdout, stderr = decode(streams[self.proc.stdout.fileno()].getvalue(), self.encoding), decode(streams[self.proc.stderr.fileno()].getvalue(), self.encoding)
+        logger.debug('%s\n%s', stdout, stderr)
+
+        issue = {
+            'exit_code': exit_code,
+            'stdout': stdout,
+            'stderr': stderr,
+            'time': end_time - start_time,
+        }
+        issue.update(truncation_details(stdout=streams[self.proc.stdout.fileno()], stderr=streams[self.proc.stderr.fileno()]))
+        resource_limit = self.limits.classify(exit_code)
+        if resource_limit:
+            issue['resource_limit'] = resource_limit
+        if self.no_exit_code or exit_code != 0:
+            return issue
+        return NonIssue(issue)
+
+    def start(self):
+        self.stop()
+
+        os.makedirs(self.work_dir, exist_ok=True)
+        test_path = os.path.join(self.work_dir, self.filename)
+        self.test_file = open(test_path, 'w+b')
+
+        control_r, control_w = os.pipe()
+        status_r, status_w = os.pipe()
+
+        # The forkserver fds must be set up in the child, at fixed positions,
+        # which is done by a launcher (as a preexec_fn is not safe in
+        # multi-threaded processes). The resource limits are applied to the
+        # forkserver, too.
+        try:
+            self.proc = self.limits.popen([sys.executable, '-I', '-S', '-c', self._launcher, str(control_r), str(status_w)] + as_pargs(self.command.format(test=test_path)),
+                                          stdin=self.test_file,
+                                          stdout=subprocess.PIPE,
+                                          stderr=subprocess.PIPE,
+                                          cwd=self.cwd,
+                                          env=self.env,
+                                          pass_fds=(control_r, status_w),
+                                          start_new_session=True)
+        finally:
+            os.close(control_r)
+            os.close(status_w)
+        self.control_fd = control_w
+        self.status_fd = status_r
+
+        for stream in [self.proc.stdout, self.proc.stderr]:
+            fl = fcntl.fcntl(stream.fileno(), fcntl.F_GETFL)
+            fcntl.fcntl(stream.fileno(), fcntl.F_SETFL, fl | os.O_NONBLOCK)
+
+        # Wait for the hello message of the initialized forkserver. Output of
+        # the initialization is dropped.
+        try:
+            hello = self._read_status({self.proc.stdout.fileno(): OutputBuffer(0), self.proc.stderr.fileno(): OutputBuffer(0)}, time.time() + self.init_timeout)
+        except (OSError, EOFError):
+            self.stop()
+            raise
+        if hello is None:
+            self.stop()
+            raise TimeoutError(f'Forkserver of {self.command} did not start within {self.init_timeout}s.')
+
+    def stop(self):
+        for fd in [self.control_fd, self.status_fd]:
+            if fd is not None:
+                os.close(fd)
+        self.control_fd = None
+        self.status_fd = None
+
+        if self.proc:
+            Controller.kill_process_group(self.proc)
+            self.proc.stdout.close()
+            self.proc.stderr.close()
+            self.proc = None
+
+        if self.test_file:
+            self.test_file.close()
+            self.test_file = None
+
+    def _read_status(self, streams, deadline):
+        # Read a 4-byte message from the forkserver, while collecting the
+        # output of the SUT into streams (to avoid the SUT blocking on full
+        # pipes). Returns None if deadline passes before the message arrives.
+        msg = b''
+        open_fds = set(streams)
+        while len(msg) < 4:
+            time_left = deadline - time.time() if deadline is not None else None
+            if time_left is not None and time_left <= 0:
+                return None
+
+            try:
+                read_fds = select.select([self.status_fd] + list(open_fds), [], [], time_left)[0]
+            except select.error as e:
+                if e.args[0] == errno.EINTR:
+                    continue
+                raise
+
+            if any(fd in open_fds for fd in read_fds):
+                open_fds -= self._read_streams(streams)
+            if self.status_fd in read_fds:
+                chunk = os.read(self.status_fd, 4 - len(msg))
+                if not chunk:
+                    raise EOFError('forkserver closed its status pipe')
+                msg += chunk
+
+        return struct.unpack('i', msg)[0]
+
+    @staticmethod
+    def _read_streams(streams):
+        # Read all available output from the non-blocking streams. Returns the
+        # streams that reached EOF.
+        eof_fds = set()
+        for fd, buffer in streams.items():
+            while True:
+                try:
+                    chunk = os.read(fd, 65536)
+                except BlockingIOError:
+                    break
+                if not chunk:
+                    eof_fds.add(fd)
+                    break
+                buffer.write(chunk)
+        return eof_fds
@@ -38,13 +38,19 @@ class GdbBacktraceDecorator(CallDecorator):
     The new ``'backtrace'`` issue property will contain the result of GDB's
     ``bt`` command after the halt of the SUT.
 
+    As the decorator executes the SUT once more (under GDB) for every issue,
+    it is best used in the ``enrich_call`` of the SUT instead of its ``call``
+    (see :class:`fuzzinator.Controller`). Then, backtraces are collected in the
+    background and only once for every unique issue, not for every duplicate.
+
     **Example configuration snippet:**
 
         .. code-block:: ini
 
             [sut.foo]
             call=fuzzinator.call.SubprocessCall
-            call.decorate(0)=fuzzinator.call.GdbBacktraceDecorator
+            enrich_call=fuzzinator.call.SubprocessCall
+            enrich_call.decorate(0)=fuzzinator.call.GdbBacktraceDecorator
 
             [sut.foo.call]
             # assuming that {test} is something that can be interpreted by foo as
@@ -53,7 +59,12 @@ class GdbBacktraceDecorator(CallDecorator):
             cwd=/home/alice/foo
             env={"BAR": "1"}
 
-            [sut.foo.call.decorate(0)]
+            [sut.foo.enrich_call]
+            command=${sut.foo.call:command}
+            cwd=${sut.foo.call:cwd}
+            env=${sut.foo.call:env}
+
+            [sut.foo.enrich_call.decorate(0)]
             command=${sut.foo.call:command}
             cwd=${sut.foo.call:cwd}
             env={"BAR": "1", "BAZ": "1"}
@@ -40,13 +40,19 @@ class LldbBacktraceDecorator(CallDecorator):
     The new ``'backtrace'`` issue property will contain the result of Lldb's
     ``bt`` command after the halt of the SUT.
 
+    As the decorator executes the SUT once more (under Lldb) for every issue,
+    it is best used in the ``enrich_call`` of the SUT instead of its ``call``
+    (see :class:`fuzzinator.Controller`). Then, backtraces are collected in the
+    background and only once for every unique issue, not for every duplicate.
+
     **Example configuration snippet:**
 
         .. code-block:: ini
 
             [sut.foo]
             call=fuzzinator.call.SubprocessCall
-            call.decorate(0)=fuzzinator.call.LldbBacktraceDecorator
+            enrich_call=fuzzinator.call.SubprocessCall
+            enrich_call.decorate(0)=fuzzinator.call.LldbBacktraceDecorator
 
             [sut.foo.call]
             # assuming that {test} is something that can be interpreted by foo as
@@ -55,7 +61,12 @@ class LldbBacktraceDecorator(CallDecorator):
             cwd=/home/alice/foo
             env={"BAR": "1"}
 
-            [sut.foo.call.decorate(0)]
+            [sut.foo.enrich_call]
+            command=${sut.foo.call:command}
+            cwd=${sut.foo.call:cwd}
+            env=${sut.foo.call:env}
+
+            [sut.foo.enrich_call.decorate(0)]
             command=${sut.foo.call:command}
             cwd=${sut.foo.call:cwd}
             env={"BAR": "1", "BAZ": "1"}
@@ -0,0 +1,173 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import logging
+import subprocess
+import time
+
+from collections import deque
+from threading import Thread
+
+from ..controller import Controller
+
+logger = logging.getLogger(__name__)
+
+
+class OutputBuffer:
+    """
+    Auxiliary class to capture the output stream of a SUT with bounded memory
+    use. If a maximum size is given, only the first and last halves of that
+    size are kept of the output (the last half in a ring buffer), and the
+    number of bytes dropped from between them is recorded.
+
+    :param int max_size: maximum number of bytes to keep (``None`` means no
+        limit).
+    """
+
+    def __init__(self, max_size=None):
+        self.max_size = max_size
+        self.head = []
+        self.head_size = 0
+        self.tail = deque()
+        self.tail_size = 0
+        self.size = 0
+
+    @property
+    def truncated(self):
+        """
+        Number of bytes dropped from the output.
+        """
+        return self.size - self.head_size - self.tail_size
+
+    def write(self, data):
+        self.size += len(data)
+        if self.max_size is None:
+            self.head.append(data)
+            self.head_size += len(data)
+            return
+
+        head_max = self.max_size // 2
+        if self.head_size < head_max:
+            part = data[:head_max - self.head_size]
+            self.head.append(part)
+            self.head_size += len(part)
+            data = data[len(part):]
+
+        if data:
+            tail_max = self.max_size - head_max
+            self.tail.append(data)
+            self.tail_size += len(data)
+            while self.tail and self.tail_size - len(self.tail[0]) >= tail_max:
+                self.tail_size -= len(self.tail.popleft())
+            if self.tail_size > tail_max:
+                self.tail[0] = self.tail[0][self.tail_size - tail_max:]
+                self.tail_size = tail_max
+
+    def read_from(self, stream, chunk_size=65536):
+        """
+        Capture a binary stream until EOF.
+        """
+        while True:
+            chunk = stream.read1(chunk_size)
+            if not chunk:
+                break
+            self.write(chunk)
+
+    def getvalue(self):
+        """
+        Return the captured output. If bytes were dropped, a line marking the
+        truncation is inserted between the first and last parts.
+        """
+        parts = list(self.head)
+        if self.truncated:
+            parts.append(f'\n[... {self.truncated} bytes truncated ...]\n'.encode('ascii'))
+        parts.extend(self.tail)
+        return b''.join(parts)
+
+
+def truncation_details(**buffers):
+    """
+    Create the truncation metadata of an issue dictionary: the number of bytes
+    dropped from each captured stream, as ``'<name>_truncated'`` properties.
+    Streams without truncation are omitted.
+
+    :param buffers: :class:`OutputBuffer` objects by stream name.
+    """
+    return {f'{name}_truncated': buffer.truncated for name, buffer in buffers.items() if buffer.truncated}
+
+
+def run_subprocess(args, *, max_output=None, input=None, timeout=None, limits=None, **kwargs):
+    """
+    Run a subprocess like ``subprocess.run(args, stdout=PIPE, stderr=PIPE)``,
+    but capture its stdout and stderr in :class:`OutputBuffer` objects of
+    ``max_output`` size. If ``limits`` (a :class:`fuzzinator.ResourceLimits`
+    object) is given, the subprocess is started with the limits applied.
+
+    :return: a :class:`subprocess.CompletedProcess` object with
+        :class:`OutputBuffer` objects as its ``stdout`` and ``stderr``.
+    :raises subprocess.TimeoutExpired: if the process does not terminate
+        within ``timeout`` seconds (the process is killed).
+
+    The output pipes may be kept open by the descendants of the process even
+    after it has exited. If the pipes are not closed soon after the exit, the
+    process group of the process is killed. The output of descendants that
+    have left the process group is dropped (and they are left running).
+    """
+    stdout, stderr = OutputBuffer(max_output), OutputBuffer(max_output)
+
+    with (limits.popen if limits else subprocess.Popen)(args,
+                                                        stdin=subprocess.PIPE if input is not None else None,
+                                                        stdout=subprocess.PIPE,
+                                                        stderr=subprocess.PIPE,
+                                                        start_new_session=True,
+                                                        **kwargs) as proc:
+
+        def _write_input():
+            try:
+                proc.stdin.write(input)
+                proc.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+
+        threads = [Thread(target=stdout.read_from, args=(proc.stdout,), daemon=True),
+                   Thread(target=stderr.read_from, args=(proc.stderr,), daemon=True)]
+        if input is not None:
+            threads.append(Thread(target=_write_input, daemon=True))
+        for thread in threads:
+            thread.start()
+
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # Also kill the descendants of the process, which would keep the
+            # output pipes open.
+            Controller.kill_process_group(proc)
+            _join_threads(proc, threads)
+            raise subprocess.TimeoutExpired(args, timeout, output=stdout.getvalue(), stderr=stderr.getvalue()) from None
+
+        _join_threads(proc, threads)
+
+    return subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
+
+
+def _join_threads(proc, threads, timeout=1):
+    # Wait for the threads that read the output of (and write the input to)
+    # an exited process, and kill the rest of its process group if the pipes
+    # are kept open.
+    for kill in [False, True]:
+        if kill:
+            Controller.kill_process_group(proc)
+        deadline = time.time() + timeout
+        for thread in threads:
+            thread.join(max(deadline - time.time(), 0))
+        if not any(thread.is_alive() for thread in threads):
+            return
+
+    # The pipes cannot be closed while the threads are blocked on them (that
+    # would block, too), so they are left to the threads.
+    logger.warning('The pipes of %s are kept open by processes outside of its process group, dropping the rest of its output.', proc.args)
+    proc.stdin, proc.stdout, proc.stderr = None, None, None
@@ -7,6 +7,16 @@
 
 import re
 
+from functools import lru_cache
+
+try:
+    from re import _parser as sre_parse
+    from re._constants import BRANCH, LITERAL, MAX_REPEAT, MIN_REPEAT, SUBPATTERN
+except ImportError:
+    # Python < 3.11
+    import sre_parse  # pylint: disable=deprecated-module
+    from sre_constants import BRANCH, LITERAL, MAX_REPEAT, MIN_REPEAT, SUBPATTERN  # pylint: disable=deprecated-module
+
 
 class RegexAutomaton:
     """
@@ -36,12 +46,17 @@ class RegexAutomaton:
 
     If a pattern lacks the instructions and the slashes then it is
     interpreted as an ``msc /<pattern>/``.
+
+    To speed up processing, lines are screened with literal substrings that any
+    match of a pattern must contain (if such substrings can be determined from
+    the pattern), and the pattern is only searched for in candidate lines.
     """
     regex_pattern = re.compile(r'm(?P<field_op>.)(?P<next_line_op>.) */(?P<regex>.*)/')
 
     def __init__(self, instructions, existing_fields=None):
         self.instructions = instructions
         self.existing_fields = existing_fields or []
+        self.prefilters = [self.required_literals(pattern) for pattern, _, _ in instructions]
 
     @classmethod
     def split_pattern(cls, pattern):
@@ -50,9 +65,72 @@ class RegexAutomaton:
             return re.compile(match.group('regex')), match.group('field_op')[0], match.group('next_line_op')[0]
         return re.compile(pattern), 's', 'c'
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def required_literals(pattern):
+        """
+        Determine literal substrings that every match of a compiled regex
+        pattern must contain.
+
+        :return: tuple of alternatives, each alternative being a tuple of
+            literals of which at least one must be contained by every match; or
+            None if no such literals could be determined.
+        """
+        if not isinstance(pattern.pattern, str) or pattern.flags & re.IGNORECASE:
+            return None
+        try:
+            return tuple(RegexAutomaton._seq_required_literals(sre_parse.parse(pattern.pattern, pattern.flags))) or None
+        except Exception:
+            return None
+
+    @staticmethod
+    def _seq_required_literals(seq):
+        # Collect the requirements of a sequence of regex items: runs of
+        # literals, and the requirements of mandatory groups, repeats, and
+        # alternations (where every branch must have a requirement, and the
+        # most selective one of each branch is used).
+        requirements = []
+        run = ''
+        for op, av in seq:
+            if op is LITERAL:
+                run += chr(av)
+                continue
+
+            if run:
+                requirements.append((run,))
+                run = ''
+
+            if op is SUBPATTERN and not av[1] and not av[2]:
+                requirements.extend(RegexAutomaton._seq_required_literals(av[3]))
+            elif op in (MAX_REPEAT, MIN_REPEAT) and av[0] >= 1:
+                requirements.extend(RegexAutomaton._seq_required_literals(av[2]))
+            elif op is BRANCH:
+                branches = [RegexAutomaton._seq_required_literals(branch) for branch in av[1]]
+                if all(branches):
+                    requirements.append(tuple(sorted({literal
+                                                      for branch in branches
+                                                      for literal in max(branch, key=lambda alts: (min(len(alt) for alt in alts), -len(alts)))})))
+        if run:
+            requirements.append((run,))
+
+        return list(dict.fromkeys(requirements))
+
+    @staticmethod
+    def _screen(line, literals):
+        for alts in literals:
+            for literal in alts:
+                if literal in line:
+                    break
+            else:
+                return False
+        return True
+
     def process_line(self, line, issue):
         updated = False
-        for pattern, field_op, next_line_op in self.instructions:
+        for (pattern, field_op, next_line_op), literals in zip(self.instructions, self.prefilters):
+            if literals and not self._screen(line, literals):
+                continue
+
             match = pattern.search(line)
             if not match:
                 continue
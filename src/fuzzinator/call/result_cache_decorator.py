@@ -0,0 +1,176 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import hashlib
+import os
+import pickle
+import sqlite3
+
+from collections import OrderedDict
+from threading import Lock
+
+from ..config import as_list, as_path
+from .call_decorator import CallDecorator
+
+# The results cached in memory, shared by the SUT call objects of the same
+# configuration in a process (e.g., by the jobs run by a worker process, or by
+# the concurrent calls of a job), and the version stamp of the SUT that they
+# belong to, by configuration.
+_memory_caches = {}
+_memory_lock = Lock()
+
+
+class ResultCacheDecorator(CallDecorator):
+    """
+    Decorator to memoize the results of a SUT call, i.e., to avoid executing the
+    SUT again with a test that it has already been executed with. The results
+    are looked up by the configuration of the decorated SUT call, by the
+    version stamp of the SUT, and by the digest of the test. (Only the ``test``
+    argument of the call is taken into account, all other arguments are
+    ignored. Therefore, the decorator should be applied last, after the
+    decorators that transform the test, e.g., after
+    :class:`fuzzinator.call.FileWriterDecorator`.)
+
+    The results are cached in memory (in a least recently used manner, shared
+    by the SUT call objects of the same configuration within a process) and,
+    optionally, in an SQLite database file, which can be shared by the jobs of
+    the SUT (in any process) and also by fuzz sessions. The results of a SUT
+    are invalidated only when its own stamp changes, so the database file can
+    be shared by SUTs with different stamps, too.
+
+    The version stamp of the SUT is made up of the modification times of the
+    files listed in the ``stamp`` parameter. To invalidate the cache when the
+    SUT is updated, the ``update_stamp`` option of the SUT should name a file
+    that is touched whenever an update job of the SUT completes, and that file
+    should be listed as a stamp (see the example below).
+
+    The decorated SUT call object exposes the number of cache hits and misses
+    in its ``cache_hits`` and ``cache_misses`` attributes, which are reported
+    to the listeners by the jobs via
+    :meth:`fuzzinator.listener.EventListener.on_call_cache_updated`.
+
+    **Optional parameters of the decorator:**
+
+      - ``size``: maximum number of results cached in memory (default: 1024).
+      - ``cache_file``: path of the SQLite database file to cache the results
+        in (default: no on-disk cache).
+      - ``stamp``: array of file paths that determine the version of the SUT.
+
+    **Example configuration snippet:**
+
+        .. code-block:: ini
+
+            [sut.foo]
+            call=fuzzinator.call.StdinSubprocessCall
+            call.decorate(0)=fuzzinator.call.ResultCacheDecorator
+            update_stamp=${fuzzinator:work_dir}/foo.updated
+
+            [sut.foo.call]
+            command=/home/alice/foo/bin/foo -
+
+            [sut.foo.call.decorate(0)]
+            size=4096
+            cache_file=${fuzzinator:work_dir}/foo-results.sqlite
+            stamp=["/home/alice/foo/bin/foo", "${sut.foo:update_stamp}"]
+    """
+
+    def __init__(self, *, size=None, cache_file=None, stamp=None, **kwargs):
+        self.size = int(size) if size else 1024
+        self.cache_file = as_path(cache_file) if cache_file else None
+        self.stamp_files = [as_path(path) for path in as_list(stamp)] if stamp else []
+
+        self.db = None
+        self.db_stamp = None
+
+    def init(self, cls, obj, **kwargs):
+        super(cls, obj).__init__(**kwargs)
+        # The implicit working directory of the SUT call is unique to every
+        # instance, it must not distinguish configurations.
+        classes = [f'{c.__module__}.{c.__qualname__}' for c in cls.__mro__]
+        config = sorted((key, str(value)) for key, value in kwargs.items() if key != 'work_dir')
+        obj.cache_config = hashlib.sha256(repr((classes, config)).encode('utf-8')).hexdigest()
+        obj.cache_hits = 0
+        obj.cache_misses = 0
+
+    def call(self, cls, obj, *, test, **kwargs):
+        digest = hashlib.sha256(test if isinstance(test, bytes) else str(test).encode('utf-8', errors='ignore')).hexdigest()
+        key = (obj.cache_config, digest)
+
+        with _memory_lock:
+            memory = _memory_caches.setdefault(obj.cache_config, {'results': OrderedDict(), 'stamp': None})
+            self._check_stamp(obj.cache_config, memory)
+            found, result = self._lookup(key, memory)
+        if found:
+            obj.cache_hits += 1
+            return result
+
+        obj.cache_misses += 1
+        result = super(cls, obj).__call__(test=test, **kwargs)
+        with _memory_lock:
+            self._store(key, result, memory)
+        return result
+
+    def _check_stamp(self, config, memory):
+        stamp = []
+        for path in self.stamp_files:
+            try:
+                st = os.stat(path)
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append(None)
+        stamp = repr(stamp)
+
+        if stamp != memory['stamp']:
+            # The SUT has changed (or this is the first call): all the results
+            # cached for previous versions are outdated.
+            memory['results'].clear()
+            memory['stamp'] = stamp
+        if self.cache_file and stamp != self.db_stamp:
+            db = self._connect()
+            with db:
+                db.execute('DELETE FROM results WHERE config = ? AND stamp != ?', (config, stamp))
+            self.db_stamp = stamp
+
+    def _connect(self):
+        if not self.db:
+            os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+            self.db = sqlite3.connect(self.cache_file, timeout=60, check_same_thread=False)
+            with self.db:
+                self.db.execute('CREATE TABLE IF NOT EXISTS results (config TEXT, digest TEXT, stamp TEXT, result BLOB, PRIMARY KEY (config, digest))')
+        return self.db
+
+    def _lookup(self, key, memory):
+        results = memory['results']
+        if key in results:
+            results.move_to_end(key)
+            return True, pickle.loads(results[key])
+
+        if self.cache_file:
+            row = self._connect().execute('SELECT result FROM results WHERE config = ? AND digest = ? AND stamp = ?', key + (memory['stamp'],)).fetchone()
+            if row:
+                self._remember(key, row[0], memory)
+                return True, pickle.loads(row[0])
+
+        return False, None
+
+    def _store(self, key, result, memory):
+        # Results are kept pickled so that callers cannot modify the cached
+        # versions.
+        data = pickle.dumps(result)
+        self._remember(key, data, memory)
+
+        if self.cache_file:
+            db = self._connect()
+            with db:
+                db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)', key + (memory['stamp'], data))
+
+    def _remember(self, key, data, memory):
+        results = memory['results']
+        results[key] = data
+        results.move_to_end(key)
+        while len(results) > self.size:
+            results.popitem(last=False)
@@ -11,8 +11,10 @@ import subprocess
 import time
 
 from ..config import as_bool, as_dict, as_pargs, as_path, decode
+from ..resource_limits import ResourceLimits
 from .call import Call
 from .non_issue import NonIssue
+from .output_buffer import run_subprocess, truncation_details
 
 logger = logging.getLogger(__name__)
 
@@ -36,12 +38,22 @@ class StdinSubprocessCall(Call):
         the exit code.
       - ``timeout``: run subprocess with timeout.
       - ``encoding``: stdout and stderr encoding (default: autodetect).
+      - ``max_output``: if not ``None``, the maximum number of bytes kept of
+        stdout and stderr each (the beginning and the end of the output are
+        kept, the middle is dropped).
+      - ``memory_limit``, ``cpu_time_limit``, ``max_procs``,
+        ``max_file_size``, ``cgroup``: resource limits of the SUT process
+        (see :class:`fuzzinator.ResourceLimits`).
 
     **Result of the SUT call:**
 
       - If the child process exits with 0 exit code, no issue is returned.
       - Otherwise, an issue with ``'exit_code'``, ``'stdout'``, ``'stderr'``
-        and ``'time'`` properties is returned.
+        and ``'time'`` properties is returned. If the output was truncated
+        because of ``max_output``, the number of dropped bytes is recorded in
+        ``'stdout_truncated'`` and/or ``'stderr_truncated'`` properties. If
+        the process was terminated by a resource limit, the cause is recorded
+        in the ``'resource_limit'`` property.
 
     **Example configuration snippet:**
 
@@ -56,29 +68,30 @@ class StdinSubprocessCall(Call):
             env={"BAR": "1"}
     """
 
-    def __init__(self, *, command, cwd=None, env=None, no_exit_code=None, timeout=None, encoding=None, **kwargs):
+    def __init__(self, *, command, cwd=None, env=None, no_exit_code=None, timeout=None, encoding=None, max_output=None, memory_limit=None, cpu_time_limit=None, max_procs=None, max_file_size=None, cgroup=None, **kwargs):
         self.command = command
         self.cwd = as_path(cwd) if cwd else os.getcwd()
         self.env = dict(os.environ, **as_dict(env)) if env else None
         self.no_exit_code = as_bool(no_exit_code)
         self.timeout = int(timeout) if timeout else None
         self.encoding = encoding
+        self.max_output = int(max_output) if max_output else None
+        self.limits = ResourceLimits(memory_limit=memory_limit, cpu_time_limit=cpu_time_limit, max_procs=max_procs, max_file_size=max_file_size, cgroup=cgroup)
 
     def __call__(self, *, test, timeout=None, **kwargs):
         issue = {}
 
         try:
             start_time = time.time()
-            result = subprocess.run(as_pargs(self.command),
+            result = run_subprocess(as_pargs(self.command),
                                     input=test,
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE,
+                                    max_output=self.max_output,
                                     cwd=self.cwd,
                                     env=self.env,
-                                    timeout=timeout or self.timeout,
-                                    check=False)
+                                    limits=self.limits,
+                                    timeout=timeout or self.timeout)
             end_time = time.time()
-            stdout, stderr = decode(result.stdout, self.encoding), decode(result.stderr, self.encoding)
+            stdout, stderr = decode(result.stdout.getvalue(), self.encoding), decode(result.stderr.getvalue(), self.encoding)
             logger.debug('%s\n%s', stdout, stderr)
 
             issue = {
@@ -87,6 +100,10 @@ class StdinSubprocessCall(Call):
                 'stderr': stderr,
                 'time': end_time - start_time,
             }
+            issue.update(truncation_details(stdout=result.stdout, stderr=result.stderr))
+            resource_limit = self.limits.classify(result.returncode)
+            if resource_limit:
+                issue['resource_limit'] = resource_limit
             if self.no_exit_code or result.returncode != 0:
                 return issue
         except subprocess.TimeoutExpired as e:
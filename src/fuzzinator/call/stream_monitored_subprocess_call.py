@@ -1,4 +1,4 @@
-# Copyright (c) 2016-2023 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
@@ -13,10 +13,12 @@ import select
 import subprocess
 import time
 
-from ..config import as_dict, as_list, as_pargs, as_path, decode
+from ..config import as_dict, as_list, as_pargs, as_path, decode, StreamDecoder
 from ..controller import Controller
+from ..resource_limits import ResourceLimits
 from .call import Call
 from .non_issue import NonIssue
+from .output_buffer import OutputBuffer, truncation_details
 from .regex_automaton import RegexAutomaton
 
 logger = logging.getLogger(__name__)
@@ -44,9 +46,17 @@ class StreamMonitoredSubprocessCall(Call):
         update the environment with.
       - ``end_patterns``: array of patterns to match against the lines of stdout
         and stderr streams. The patterns and instructions are interpreted as
-        defined in :class:`fuzzinator.call.RegexAutomaton`.
+        defined in :class:`fuzzinator.call.RegexAutomaton`. (Lines longer than
+        1 MiB are matched in pieces.)
       - ``timeout``: run subprocess with timeout.
       - ``encoding``: stdout and stderr encoding (default: autodetect).
+      - ``max_output``: if not ``None``, the maximum number of bytes kept of
+        stdout and stderr each (the beginning and the end of the output are
+        kept, the middle is dropped). All lines are still matched against
+        ``end_patterns``.
+      - ``memory_limit``, ``cpu_time_limit``, ``max_procs``,
+        ``max_file_size``, ``cgroup``: resource limits of the SUT process
+        (see :class:`fuzzinator.ResourceLimits`).
 
     **Result of the SUT call:**
 
@@ -54,7 +64,11 @@ class StreamMonitoredSubprocessCall(Call):
         any result, no issue is returned.
       - Otherwise, an issue with keys from the matching patterns of
         ``end_pattern`` extended with the ``'exit_code'``, ``'stdout'``,
-        ``'stderr'`` and ``'time'`` properties is returned.
+        ``'stderr'`` and ``'time'`` properties is returned. If the output was
+        truncated because of ``max_output``, the number of dropped bytes is
+        recorded in ``'stdout_truncated'`` and/or ``'stderr_truncated'``
+        properties. If the process was terminated by a resource limit, the
+        cause is recorded in the ``'resource_limit'`` property.
 
     **Example configuration snippet:**
 
@@ -77,25 +91,36 @@ class StreamMonitoredSubprocessCall(Call):
        Not available on platforms without fcntl support (e.g., Windows).
     """
 
-    def __init__(self, *, command, cwd=None, env=None, end_patterns=None, timeout=None, encoding=None, **kwargs):
+    chunk_size = 65536
+    max_line_length = 1 << 20
+
+    def __init__(self, *, command, cwd=None, env=None, end_patterns=None, timeout=None, encoding=None, max_output=None, memory_limit=None, cpu_time_limit=None, max_procs=None, max_file_size=None, cgroup=None, **kwargs):
         self.command = command
         self.cwd = as_path(cwd) if cwd else os.getcwd()
         self.end_patterns = [RegexAutomaton.split_pattern(p) for p in as_list(end_patterns)] if end_patterns else []
         self.env = dict(os.environ, **as_dict(env)) if env else None
         self.timeout = int(timeout) if timeout else None
         self.encoding = encoding
+        self.max_output = int(max_output) if max_output else None
+        self.limits = ResourceLimits(memory_limit=memory_limit, cpu_time_limit=cpu_time_limit, max_procs=max_procs, max_file_size=max_file_size, cgroup=cgroup)
 
     def __call__(self, *, test, timeout=None, **kwargs):
         timeout = timeout or self.timeout
         start_time = time.time()
 
-        proc = subprocess.Popen(as_pargs(self.command.format(test=test)),
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE,
-                                cwd=self.cwd,
-                                env=self.env)
+        proc = self.limits.popen(as_pargs(self.command.format(test=test)),
+                                 stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE,
+                                 cwd=self.cwd,
+                                 env=self.env,
+                                 start_new_session=True)
 
-        streams = {'stdout': '', 'stderr': ''}
+        # The raw content of the streams not yet processed by the automaton
+        # (i.e., the incomplete last lines and the recently read chunks), and
+        # the (possibly truncated) raw content of the whole streams.
+        streams = {'stdout': bytearray(), 'stderr': bytearray()}
+        outputs = {stream: OutputBuffer(self.max_output) for stream in streams}
+        decoders = {stream: StreamDecoder(self.encoding) for stream in streams}
 
         select_fds = [stream.fileno() for stream in [proc.stderr, proc.stdout]]
         for fd in select_fds:
@@ -105,8 +130,60 @@ class StreamMonitoredSubprocessCall(Call):
         issue = {}
         end_loop = False
         regex_automaton = RegexAutomaton(self.end_patterns)
+
+        def _read_stream(stream):
+            # Read at most one chunk, so that an endless output can neither
+            # delay the check of the timeout nor pile up unprocessed. Return
+            # the number of bytes read, or None if the stream is closed.
+            chunk = getattr(proc, stream).read(self.chunk_size)
+            if chunk is None:
+                return 0
+            if not chunk:
+                return None
+            streams[stream] += chunk
+            outputs[stream].write(chunk)
+            return len(chunk)
+
+        def _decode_stream(stream, final):
+            # Decode the lines completed since the last call only (or all
+            # remaining content, if final). Overlong lines are split to keep
+            # the memory use bounded.
+            end = len(streams[stream]) if final else streams[stream].rfind(b'\n') + 1
+            if len(streams[stream]) - end >= self.max_line_length:
+                end = len(streams[stream])
+            text = decoders[stream].decode(bytes(streams[stream][:end]), final)
+            del streams[stream][:end]
+            return text
+
+        def _process_stream(stream, final):
+            text = _decode_stream(stream, final)
+            if not text:
+                return False
+            terminate, new_details = regex_automaton.process(text.splitlines(), issue)
+            return new_details or terminate
+
+        def _drain_stream(stream):
+            # Read and process the remaining output of an exited process in a
+            # bounded number of chunks, as its descendants may still be
+            # writing the pipes.
+            for _ in range(16):
+                if not _read_stream(stream) or (timeout and time.time() - start_time > timeout):
+                    return False
+                if _process_stream(stream, final=False):
+                    return True
+            return False
+
         while not end_loop:
             try:
+                if not select_fds:
+                    # Both streams are closed, only the exit of the process is
+                    # waited for (blocking in waitpid instead of polling).
+                    try:
+                        proc.wait(timeout=max(timeout - (time.time() - start_time), 0) if timeout else None)
+                    except subprocess.TimeoutExpired:
+                        pass
+                    break
+
                 try:
                     read_fds = select.select(select_fds, [], select_fds, 0.5)[0]
                 except select.error as e:
@@ -115,16 +192,11 @@ class StreamMonitoredSubprocessCall(Call):
                     raise
 
                 for stream in streams:
-                    if getattr(proc, stream).fileno() in read_fds:
-                        while True:
-                            chunk = getattr(proc, stream).read(512)
-                            if not chunk:
-                                break
-                            streams[stream] += decode(chunk, self.encoding)
-
-                        # Process the stream content line-by-line.
-                        terminate, new_details = regex_automaton.process(streams[stream].splitlines(), issue)
-                        if new_details or terminate:
+                    fd = getattr(proc, stream).fileno()
+                    if fd in read_fds:
+                        if _read_stream(stream) is None:
+                            select_fds.remove(fd)
+                        if _process_stream(stream, final=False):
                             end_loop = True
 
                 if proc.poll() is not None or (timeout and time.time() - start_time > timeout):
@@ -132,8 +204,20 @@ class StreamMonitoredSubprocessCall(Call):
             except IOError as e:
                 logger.warning('Exception in stream filtering.', exc_info=e)
 
+        if not end_loop:
+            # Process the output that arrived after the last select (if the
+            # process has exited) and the incomplete last lines.
+            try:
+                for stream in streams:
+                    if (proc.returncode is not None and _drain_stream(stream)) or _process_stream(stream, final=True):
+                        break
+            except IOError as e:
+                logger.warning('Exception in stream filtering.', exc_info=e)
+
         end_time = time.time()
-        Controller.kill_process_tree(proc.pid)
+        Controller.kill_process_group(proc)
+        # The decoders have already detected the encodings, if needed.
+        streams = {stream: decode(outputs[stream].getvalue(), decoders[stream].encoding) for stream in streams}
         logger.debug('%s\n%s', streams['stdout'], streams['stderr'])
 
         proc_details = {
@@ -142,6 +226,10 @@ class StreamMonitoredSubprocessCall(Call):
             'stdout': streams['stdout'],
             'time': end_time - start_time,
         }
+        proc_details.update(truncation_details(**outputs))
+        resource_limit = self.limits.classify(proc.returncode)
+        if resource_limit:
+            proc_details['resource_limit'] = resource_limit
         if issue:
             issue.update(proc_details)
             return issue
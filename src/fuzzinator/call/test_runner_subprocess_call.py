@@ -1,4 +1,4 @@
-# Copyright (c) 2016-2023 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
@@ -13,22 +13,30 @@ import select
 import subprocess
 import time
 
-from ..config import as_bool, as_dict, as_list, as_pargs, as_path, decode
+from ..config import as_bool, as_dict, as_list, as_pargs, as_path, decode, StreamDecoder
 from ..controller import Controller
+from ..resource_limits import ResourceLimits
 from .call import Call
 from .non_issue import NonIssue
+from .output_buffer import OutputBuffer, truncation_details
 
 logger = logging.getLogger(__name__)
 
 
 class TestRunnerSubprocessCall(Call):
     """
+    If ``max_output`` is not ``None``, at most that many bytes are kept of
+    stdout and stderr each for every test (the beginning and the end of the
+    output are kept, the middle is dropped, and the number of dropped bytes
+    is recorded in ``'stdout_truncated'`` and/or ``'stderr_truncated'``
+    properties). ``end_texts`` are still searched in the whole output.
+
     .. note::
 
        Not available on platforms without fcntl support (e.g., Windows).
     """
 
-    def __init__(self, *, command, cwd=None, env=None, end_texts=None, init_wait=None, timeout_per_test=None, encoding=None, **kwargs):
+    def __init__(self, *, command, cwd=None, env=None, end_texts=None, init_wait=None, timeout_per_test=None, encoding=None, max_output=None, memory_limit=None, cpu_time_limit=None, max_procs=None, max_file_size=None, cgroup=None, **kwargs):
         self.end_texts = as_list(end_texts) if end_texts else []
         self.init_wait = as_bool(init_wait)
         self.timeout_per_test = int(timeout_per_test) if timeout_per_test else None
@@ -36,6 +44,8 @@ class TestRunnerSubprocessCall(Call):
         self.command = as_pargs(command)
         self.env = dict(os.environ, **as_dict(env)) if env else None
         self.encoding = encoding
+        self.max_output = int(max_output) if max_output else None
+        self.limits = ResourceLimits(memory_limit=memory_limit, cpu_time_limit=cpu_time_limit, max_procs=max_procs, max_file_size=max_file_size, cgroup=cgroup)
         self.proc = None
 
     def __enter__(self):
@@ -44,7 +54,7 @@ class TestRunnerSubprocessCall(Call):
 
     def __exit__(self, *exc):
         if self.proc and self.proc.poll() is None:
-            Controller.kill_process_tree(self.proc.pid)
+            Controller.kill_process_group(self.proc)
         return False
 
     def __call__(self, *, test, **kwargs):
@@ -59,17 +69,23 @@ class TestRunnerSubprocessCall(Call):
             return NonIssue()
 
     def start(self, init_wait=True):
-        self.proc = subprocess.Popen(self.command,
-                                     stdout=subprocess.PIPE,
-                                     stderr=subprocess.PIPE,
-                                     stdin=subprocess.PIPE,
-                                     cwd=self.cwd,
-                                     env=self.env)
+        self.proc = self.limits.popen(self.command,
+                                      stdout=subprocess.PIPE,
+                                      stderr=subprocess.PIPE,
+                                      stdin=subprocess.PIPE,
+                                      cwd=self.cwd,
+                                      env=self.env,
+                                      start_new_session=True)
         if init_wait:
             self.wait_til_end()
 
     def wait_til_end(self):
-        streams = {'stdout': '', 'stderr': ''}
+        # The (possibly truncated) raw output, and the end of the decoded
+        # output that may contain the beginning of an end text.
+        streams = {'stdout': OutputBuffer(self.max_output), 'stderr': OutputBuffer(self.max_output)}
+        decoders = {stream: StreamDecoder(self.encoding) for stream in streams}
+        windows = {stream: '' for stream in streams}
+        overlap = max((len(end_text) for end_text in self.end_texts), default=1) - 1
 
         select_fds = [stream.fileno() for stream in [self.proc.stderr, self.proc.stdout]]
         for fd in select_fds:
@@ -83,7 +99,7 @@ class TestRunnerSubprocessCall(Call):
                 time_left = self.timeout_per_test - (time.time() - start_time) if self.timeout_per_test else 0.5
                 if time_left <= 0:
                     # Avoid waiting for the current test in the next iteration.
-                    Controller.kill_process_tree(self.proc.pid)
+                    Controller.kill_process_group(self.proc)
                     break
 
                 try:
@@ -93,27 +109,33 @@ class TestRunnerSubprocessCall(Call):
                         continue
                     raise
 
-                for stream in streams:
+                for stream, buffer in streams.items():
                     if getattr(self.proc, stream).fileno() in read_fds:
                         while True:
                             chunk = getattr(self.proc, stream).read(512)
                             if not chunk:
                                 break
-                            streams[stream] += decode(chunk, self.encoding)
+                            buffer.write(chunk)
+                            windows[stream] += decoders[stream].decode(chunk)
 
-                        for end_pattern in self.end_texts:
-                            if end_pattern in streams[stream]:
+                            if any(end_text in windows[stream] for end_text in self.end_texts):
                                 end_loop = True
-                                break
+                            windows[stream] = windows[stream][max(0, len(windows[stream]) - overlap):] if overlap else ''
 
                 if self.proc.poll() is not None:
                     break
             except IOError as e:
                 logger.warning('Exception in stream filtering.', exc_info=e)
 
-        logger.debug('%s\n%s', streams['stdout'], streams['stderr'])
-        return {
+        outputs = {stream: decode(buffer.getvalue(), decoders[stream].encoding) for stream, buffer in streams.items()}
+        logger.debug('%s\n%s', outputs['stdout'], outputs['stderr'])
+        issue = {
             'exit_code': self.proc.returncode,
-            'stderr': streams['stderr'],
-            'stdout': streams['stdout'],
+            'stderr': outputs['stderr'],
+            'stdout': outputs['stdout'],
         }
+        issue.update(truncation_details(**streams))
+        resource_limit = self.limits.classify(self.proc.returncode)
+        if resource_limit:
+            issue['resource_limit'] = resource_limit
+        return issue
@@ -1,10 +1,11 @@
-# Copyright (c) 2016-2023 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
 # This file may not be copied, modified, or distributed except
 # according to those terms.
 
+import codecs
 import hashlib
 import json
 import logging
@@ -16,8 +17,10 @@ from collections import OrderedDict
 from configparser import ConfigParser
 from inspect import signature
 from io import StringIO
+from itertools import count
 from math import inf
 from uuid import uuid4
+from weakref import WeakKeyDictionary
 
 import chardet
 
@@ -25,17 +28,141 @@ from inators.imp import import_object
 
 logger = logging.getLogger(__name__)
 
+# Generations are unique across Config objects.
+_generations = count()
+
+
+class Config(ConfigParser):
+    """
+    Parser of the configuration of fuzz sessions. It keeps track of the
+    changes of the options in its ``generation`` attribute, which gets a new
+    value whenever the configuration is read or modified. This lets
+    :func:`config_get_object` reuse the objects it has computed from the
+    configuration without comparing the options. (Changes that bypass the
+    methods of the parser, i.e., modify its internal data, are not tracked.)
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.generation = next(_generations)
+        super().__init__(*args, **kwargs)
+
+    def _changed(self):
+        self.generation = next(_generations)
+
+    def read(self, filenames, encoding=None):
+        try:
+            return super().read(filenames, encoding=encoding)
+        finally:
+            self._changed()
+
+    def read_file(self, f, source=None):
+        try:
+            super().read_file(f, source=source)
+        finally:
+            self._changed()
+
+    def read_dict(self, dictionary, source='<dict>'):
+        try:
+            super().read_dict(dictionary, source=source)
+        finally:
+            self._changed()
+
+    def set(self, section, option, value=None):
+        super().set(section, option, value)
+        self._changed()
+
+    def add_section(self, section):
+        super().add_section(section)
+        self._changed()
+
+    def remove_section(self, section):
+        existed = super().remove_section(section)
+        self._changed()
+        return existed
+
+    def remove_option(self, section, option):
+        existed = super().remove_option(section, option)
+        self._changed()
+        return existed
+
 
 def config_get_kwargs(config, section):
     return dict(config.items(section)) if config.has_section(section) else {}
 
 
+# Decorated classes are created for every object (see config_get_object), so
+# the cache must not keep them alive.
+_work_dir_params = WeakKeyDictionary()
+
+
+def _has_work_dir_param(cls):
+    has_param = _work_dir_params.get(cls)
+    if has_param is None:
+        has_param = _work_dir_params[cls] = any(param == 'work_dir' for param in signature(cls.__init__).parameters)
+    return has_param
+
+
 def config_init_object(config, cls, kwargs):
-    if any(param == 'work_dir' for param in signature(cls.__init__).parameters):
+    if _has_work_dir_param(cls):
         kwargs['work_dir'] = os.path.join(as_path(config.get('fuzzinator', 'work_dir')), f'{os.getpid()}-{cls.__name__}-{uuid4().hex}')
     return cls(**kwargs)
 
 
+# Cache of the classes, decorator classes, and instantiation arguments read from
+# the configuration, keyed by (section, option). Every entry also stores the
+# generation of the configuration (for Config objects) or the values of all the
+# config options it was computed from (otherwise), to detect when the entry
+# gets outdated. Decorator objects are not cached, as they may have a state
+# (e.g., a work_dir) that must not be shared by the decorated objects.
+_factory_cache = {}
+
+
+def _config_section_items(config, section):
+    return tuple(config.items(section)) if config.has_section(section) else None
+
+
+def _config_get_factory(config, section, option):
+    # The generation of a Config is checked without listing its options.
+    fingerprint = config.generation if isinstance(config, Config) else None
+    cached = _factory_cache.get((section, option))
+    if cached and fingerprint is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    opt_prefix = f'{option}.decorate('
+    opt_suffix = ')'
+    decorator_options = [opt for opt in config.options(section)
+                         if opt.startswith(opt_prefix) and opt.endswith(opt_suffix)]
+    decorator_options.sort(key=lambda opt, pre=opt_prefix, suf=opt_suffix: int(opt[len(pre):-len(suf)]))
+
+    init_section = f'{section}.{option}.init'
+    if fingerprint is None:
+        fingerprint = tuple(_config_section_items(config, s) for s in [section, init_section, f'{section}.{option}'] + [f'{section}.{decopt}' for decopt in decorator_options])
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+
+    # 1) get the class named in $(section:option)
+    obj_class = import_object(config.get(section, option))
+
+    # 2) find decorator classes named in $(section:option.decorate(*)) and
+    # their arguments given in $(section.option.decorate(*):*)
+    decorators = [(import_object(config.get(section, decopt)), config_get_kwargs(config, f'{section}.{decopt}'))
+                  for decopt in decorator_options]
+
+    # 3) compute class instantiation arguments
+    obj_kwargs = {}
+
+    # 3.a) get old-style arguments from $(section.option.init:*)
+    if config.has_section(init_section):
+        logger.warning('.init sections are deprecated (%s)', init_section)
+        obj_kwargs.update(config_get_kwargs(config, init_section))
+
+    # 3.b) get arguments from $(section.option:*)
+    obj_kwargs.update(config_get_kwargs(config, f'{section}.{option}'))
+
+    _factory_cache[(section, option)] = (fingerprint, (obj_class, decorators, obj_kwargs))
+    return obj_class, decorators, obj_kwargs
+
+
 def config_get_object(config, section, options, *, init_kwargs=None):
     """
     Create an object as defined by ``$(section:option)`` in the configuration.
@@ -53,6 +180,13 @@ def config_get_object(config, section, options, *, init_kwargs=None):
     3. Instantiate the "base" class with keyword arguments given in
         ``$(section.option:*)`` and in ``init_kwargs``, and return the object.
 
+    The classes loaded in steps 1 and 2 (and the keyword arguments read from
+    the configuration in steps 2 and 3) are cached in the process and reused
+    until any of the config options they were computed from changes (or, if
+    ``config`` is a :class:`Config`, until any option changes). The
+    decorator objects are instantiated and applied for every object created,
+    thus, they are never shared by objects.
+
     :param configparser.ConfigParser config: the configuration options of the
         fuzz session.
     :param str section: section name.
@@ -65,51 +199,26 @@ def config_get_object(config, section, options, *, init_kwargs=None):
     """
     options = options if isinstance(options, list) else [options]
 
-    obj = None
     for option in options:
         if not config.has_option(section, option):
             continue
 
-        # 1) get the class named in $(section:option)
-        obj_class = import_object(config.get(section, option))
-
-        # 2) find decorator classes named in $(section:option.decorate(*)) and apply
-        # them with their arguments given in $(section.option.decorate(*):*)
-        opt_prefix = f'{option}.decorate('
-        opt_suffix = ')'
-        decorator_options = [opt for opt in config.options(section)
-                             if opt.startswith(opt_prefix) and opt.endswith(opt_suffix)]
-        decorator_options.sort(key=lambda opt, pre=opt_prefix, suf=opt_suffix: int(opt[len(pre):-len(suf)]))
-        for decopt in decorator_options:
-            decorator_class = import_object(config.get(section, decopt))
-            decorator_kwargs = config_get_kwargs(config, f'{section}.{decopt}')
-            decorator = config_init_object(config, decorator_class, decorator_kwargs)
-            obj_class = decorator(obj_class)
-
-        # 3) compute class instantiation arguments
-        obj_kwargs = {}
-
-        # 3.a) get old-style arguments from $(section.option.init:*)
-        init_section = f'{section}.{option}.init'
-        if config.has_section(init_section):
-            logger.warning('.init sections are deprecated (%s)', init_section)
-            obj_kwargs.update(config_get_kwargs(config, init_section))
+        obj_class, decorators, obj_kwargs = _config_get_factory(config, section, option)
 
-        # 3.b) get arguments from $(section.option:*)
-        obj_kwargs.update(config_get_kwargs(config, f'{section}.{option}'))
+        # 2.b-c) instantiate and apply the decorators
+        for decorator_class, decorator_kwargs in decorators:
+            decorator = config_init_object(config, decorator_class, dict(decorator_kwargs))
+            obj_class = decorator(obj_class)
 
         # 3.c) get arguments from init_kwargs
+        obj_kwargs = dict(obj_kwargs)
         if init_kwargs:
             obj_kwargs.update(init_kwargs)
 
-        # 3.d) instantiate class
-        obj = config_init_object(config, obj_class, obj_kwargs)
-
-        # break the loop after finding the first matching option.
-        break
+        # 3.d) instantiate class from the first matching option.
+        return config_init_object(config, obj_class, obj_kwargs)
 
-    # return the object
-    return obj
+    return None
 
 
 def config_get_fuzzers(config):
@@ -188,5 +297,36 @@ def as_pargs(s):
 
 
 def decode(b, encoding=None):
-    encoding = encoding or chardet.detect(b)['encoding'] or 'latin-1'
+    # Try UTF-8 first, as the detection of chardet is slow.
+    if not encoding:
+        try:
+            return b.decode('utf-8')
+        except UnicodeDecodeError:
+            encoding = chardet.detect(b)['encoding'] or 'latin-1'
     return b.decode(encoding, errors='ignore')
+
+
+class StreamDecoder:
+    """
+    Incremental decoder of a byte stream that arrives in chunks. Multi-byte
+    characters split across chunks are decoded correctly. If no encoding is
+    given, the stream is decoded as UTF-8 until it turns out not to be valid
+    UTF-8. Then, the encoding is detected (once) and used for the rest of the
+    stream.
+    """
+
+    def __init__(self, encoding=None):
+        self.encoding = encoding
+        self._decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='ignore' if encoding else 'strict')
+
+    def decode(self, b, final=False):
+        if not self.encoding:
+            try:
+                return self._decoder.decode(b, final)
+            except UnicodeDecodeError:
+                # The decoder keeps the incomplete character of the previous
+                # chunk (if any) on error.
+                b = self._decoder.getstate()[0] + b
+                self.encoding = chardet.detect(b)['encoding'] or 'latin-1'
+                self._decoder = codecs.getincrementaldecoder(self.encoding)(errors='ignore')
+        return self._decoder.decode(b, final)
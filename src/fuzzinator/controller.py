@@ -7,18 +7,25 @@
 
 import os
 import shutil
+import signal
 import time
 import traceback
 
+from heapq import heappop, heappush
+from itertools import chain
 from math import inf
-from multiprocessing import Lock, Process, Queue
+from multiprocessing import Lock, Pipe, Process, Queue, Value
+from multiprocessing.connection import wait
+from queue import Empty
 
 import psutil
 
 from .config import as_bool, as_int_or_inf, as_path, config_get_fuzzers, config_get_kwargs, config_get_object
-from .job import FuzzJob, ReduceJob, UpdateJob, ValidateJob
+from .file_slots import tmpfs_session_dir
+from .job import EnrichJob, FuzzJob, ReduceJob, UpdateJob, ValidateJob
 from .listener import ListenerManager
 from .mongo_driver import MongoDriver
+from .scheduler import RoundRobinScheduler
 
 
 class Controller:
@@ -46,12 +53,38 @@ class Controller:
           driver will wait to find an available server (in milliseconds).
           (Optional, default: 30000)
 
+        - Option ``db_max_pool_size``: Maximum number of connections in the
+          connection pool of the database client. Every process of the fuzz
+          session keeps one client (and pool) that is reused for all database
+          accesses. (Optional, default: the default of the database driver)
+
+        - Option ``db_max_idle_time``: Maximum time (in milliseconds) that a
+          connection can remain idle in the connection pool of the database
+          client before being closed. (Optional, default: no limit)
+
         - Option ``cost_budget``: (Optional, default: number of cpus)
 
         - Option ``validate_after_update``: Boolean to enable the validation
           of valid issues of all SUTs after their update.
           (Optional, default: ``False``)
 
+        - Option ``job_pool``: Boolean to run jobs in a pool of long-lived
+          worker processes instead of starting a new process for every job.
+          The pool is initially sized to ``cost_budget``, and workers keep
+          their imported classes and database connections between jobs.
+          (Optional, default: ``False``)
+
+        - Option ``scheduler``: Fully qualified name of a callable class that
+          selects the fuzz job to be queued next whenever there is no other
+          work to do. When an instance of the class is called, it must accept a
+          ``fuzzers`` keyword argument listing the names of the selectable fuzz
+          jobs and must return one of them. The constructor of the class is
+          given the fuzz job definitions, the configuration, and the database
+          in ``fuzzers``, ``config``, and ``db`` keyword arguments.
+          (Optional, default: :class:`fuzzinator.scheduler.RoundRobinScheduler`)
+
+          See package :mod:`fuzzinator.scheduler` for potential schedulers.
+
       - Sections ``sut.NAME``: Definitions of a SUT named *NAME*
 
         - Option ``call``: Fully qualified name of a callable context manager
@@ -61,12 +94,31 @@ class Controller:
           or a value considered false otherwise (which can be a simple ``None``,
           but can also be a ``NonIssue`` in complex cases). The returned issue
           dictionary (if any) *should* contain an ``'id'`` field that equals for
-          issues that are not considered unique. (Mandatory)
+          issues that are not considered unique. If an instance also has a
+          ``call_batch`` method and a ``batch_size`` attribute, fuzz jobs call
+          that method with lists of (at most ``batch_size``) tests instead.
+          (Mandatory)
 
           See package :mod:`fuzzinator.call` for potential SUT calls.
 
         - Option ``cost``: (Optional, default: 1)
 
+        - Option ``fuzz_priority``: Scheduling priority of the fuzz jobs of
+          the SUT. Queued jobs with higher priority are started first, jobs of
+          equal priority are started in the order they were queued. (Note
+          that a new fuzz job is queued only if no other job is queued, i.e.,
+          priorities order the fuzz jobs only among each other, and all the
+          other jobs precede the next fuzz job, even those with lower
+          priority.) (Optional, default: 0)
+
+        - Option ``fuzz_concurrency``: Number of tests that a fuzz job of the
+          SUT keeps in flight, i.e., calls concurrently on separate ``call``
+          objects (in threads). The cost of the fuzz job is multiplied by this
+          number (but the concurrency is reduced to fit the cost budget). The
+          results of the calls are processed in the order of the tests. The
+          ``call`` objects are not renewed after issues and the tests are
+          called one by one (not in batches). (Optional, default: 1)
+
         - Option ``validate_call``: Fully qualified name of a callable context
           manager class that acts as the SUT's ``call`` option during test case
           validation. (Optional, default: the value of option ``call``)
@@ -76,6 +128,9 @@ class Controller:
         - Option ``validate_cost``: (Optional, default: the value of option
           ``cost``)
 
+        - Option ``validate_priority``: Scheduling priority of the validate
+          jobs of the SUT. (Optional, default: 1)
+
         - Option ``reduce``: Fully qualified name of a callable class. When an
           instance of the class is called, it must accept ``issue``,
           ``sut_call``, ``on_job_progressed`` keyword arguments representing
@@ -97,6 +152,35 @@ class Controller:
         - Option ``reduce_cost``: (Optional, default: the value of option
           ``cost``)
 
+        - Option ``reduce_priority``: Scheduling priority of the reduce jobs of
+          the SUT. (Optional, default: 2)
+
+        - Option ``enrich_call``: Fully qualified name of a callable context
+          manager class that acts as the SUT's ``call`` option during issue
+          enrichment. If defined, an enrich job is queued whenever a job stores
+          a new issue (or an issue that was stored without enrichment). The
+          enrich job calls the SUT with the stored issue and extends it with
+          the properties of the resulting issue that are not stored yet. This
+          allows expensive analyses (e.g., getting backtraces with
+          :class:`fuzzinator.call.GdbBacktraceDecorator`) to run only once per
+          unique issue, without blocking the job that found the issue. The
+          ``'enriched'`` property of an issue is ``None`` while its enrichment
+          is pending, ``False`` if it failed, and the time of the enrichment
+          afterwards. (The enrichment of a pending issue is requested again
+          whenever the issue is found, but an issue has at most one enrich
+          job queued or running at a time.) (Optional, no enrichment for this
+          SUT if option is missing.)
+
+          See package :mod:`fuzzinator.call` for potential SUT calls.
+
+        - Option ``enrich_cost``: (Optional, default: the value of option
+          ``cost``)
+
+        - Option ``enrich_priority``: Scheduling priority of the enrich jobs of
+          the SUT. (Note that enrich jobs still precede the next fuzz job, see
+          option ``fuzz_priority``. The default priority only puts them after
+          the other queued jobs.) (Optional, default: -1)
+
         - Option ``update_condition``: Fully qualified name of a callable class.
           When an instance of the class is called, it must return ``True`` if
           and only if the SUT should be updated. (Optional, SUT is never updated
@@ -113,6 +197,14 @@ class Controller:
         - Option ``update_cost``: (Optional, default: the value of option
           ``fuzzinator:cost_budget``)
 
+        - Option ``update_priority``: Scheduling priority of the update jobs of
+          the SUT. (Optional, default: 3)
+
+        - Option ``update_stamp``: Path of a file that is rewritten whenever an
+          update job of the SUT completes. (Optional, default: no stamp file)
+
+          See :class:`fuzzinator.call.ResultCacheDecorator` for a use case.
+
         - Option ``validate_after_update``: Boolean to enable the validation
           of the valid issues of the SUT after its update. (Optional, default:
           the value of option ``fuzzinator:validate_after_update``)
@@ -226,9 +318,14 @@ class Controller:
 
         self.capacity = int(self.config.get('fuzzinator', 'cost_budget'))
         self.validate_after_update = as_bool(self.config.get('fuzzinator', 'validate_after_update'))
+        self.job_pool = as_bool(self.config.get('fuzzinator', 'job_pool', fallback=False))
 
+        db_max_pool_size = self.config.get('fuzzinator', 'db_max_pool_size', fallback=None)
+        db_max_idle_time = self.config.get('fuzzinator', 'db_max_idle_time', fallback=None)
         self.db = MongoDriver(self.config.get('fuzzinator', 'db_uri'),
-                              int(self.config.get('fuzzinator', 'db_server_selection_timeout')))
+                              int(self.config.get('fuzzinator', 'db_server_selection_timeout')),
+                              max_pool_size=int(db_max_pool_size) if db_max_pool_size else None,
+                              max_idle_time=int(db_max_idle_time) if db_max_idle_time else None)
         self.db.init_db(self.fuzzers)
 
         self.session_start = time.time()
@@ -238,8 +335,17 @@ class Controller:
         for name in config_get_kwargs(self.config, 'listeners'):
             self.listener += config_get_object(self.config, 'listeners', name, init_kwargs={'config': config})
 
+        scheduler_kwargs = {'fuzzers': self.fuzzers, 'config': self.config, 'db': self.db}
+        self.scheduler = config_get_object(self.config, 'fuzzinator', 'scheduler', init_kwargs=scheduler_kwargs) or RoundRobinScheduler(**scheduler_kwargs)
+
         self._shared_queue = Queue()
         self._shared_lock = Lock()
+        # The controller waits for requests on a pipe of its own: every
+        # request is counted, and the first one since the controller last
+        # polled the queue sends a wake-up message. (Thus, there is at most
+        # one message in the pipe, which never fills up.)
+        self._shared_requests = Value('i', 0, lock=False)
+        self._wakeup_reader, self._wakeup_writer = Pipe(duplex=False)
 
     def run(self, *, max_cycles=None, validate=None, reduce=None):
         """
@@ -257,16 +363,68 @@ class Controller:
         max_cycles = max_cycles if max_cycles is not None else inf
         cycle = 0
         fuzz_idx = 0
-        fuzz_names = list(self.fuzzers)
         load = 0
         job_id = 0
         job_queue = []
+        queued_jobs = {}
+        job_requests = {}
         running_jobs = {}
+        idle_workers = []
+        update_conditions = {}
+
+        def _start_worker():
+            conn, worker_conn = Pipe()
+            proc = Process(target=self._run_worker, args=(worker_conn,))
+            proc.start()
+            worker_conn.close()
+            return {'proc': proc, 'conn': conn}
+
+        def _job_finished(job):
+            # In pool mode, a job is finished when its worker reports back (and
+            # the worker becomes idle again), or when its worker has died
+            # (e.g., because the job got cancelled).
+            worker = job.get('worker')
+            if worker and worker['conn'].poll():
+                try:
+                    worker['conn'].recv()
+                    idle_workers.append(worker)
+                except (EOFError, OSError):
+                    pass
+                return True
+            return not job['proc'].is_alive() or not psutil.pid_exists(job['proc'].pid)
+
+        def _push_job(job, priority):
+            # The queue is a heap of (priority, order, job id) entries. Jobs
+            # added with the priority flag precede all others (the most
+            # recently added first), otherwise jobs are ordered by their
+            # priority and then by the order they were added in.
+            if priority:
+                heappush(job_queue, (-inf, -job.id, job.id))
+            else:
+                heappush(job_queue, (-job.priority, job.id, job.id))
+            queued_jobs[job.id] = job
+
+        def _peek_job():
+            # Cancelled jobs are only removed from queued_jobs, their heap
+            # entries are dropped lazily when they get to the top.
+            while job_queue and job_queue[0][2] not in queued_jobs:
+                heappop(job_queue)
+            return queued_jobs[job_queue[0][2]] if job_queue else None
+
+        def _pop_job():
+            job = _peek_job()
+            heappop(job_queue)
+            del queued_jobs[job.id]
+            return job
+
+        def _has_instance_capacity(fuzzer_name):
+            instances = as_int_or_inf(self.config.get(f'fuzz.{fuzzer_name}', 'instances', fallback='inf'))
+            return instances > sum(1 for job in running_jobs.values() if isinstance(job['job'], FuzzJob) and job['job'].fuzzer_name == fuzzer_name)
 
         def _update_load():
             current_load = 0
             for job_id in list(running_jobs):
-                if not running_jobs[job_id]['proc'].is_alive() or not psutil.pid_exists(running_jobs[job_id]['proc'].pid):
+                if _job_finished(running_jobs[job_id]):
                     self.listener.on_job_removed(job_id=job_id)
                     del running_jobs[job_id]
                 else:
@@ -277,10 +435,39 @@ class Controller:
                 load = current_load
                 self.listener.on_load_updated(load=load)
 
+        def _wait_events():
+            # Block (without consuming CPU) until a running job exits or a new
+            # job/cancel request arrives on the shared queue.
+            objects = [self._wakeup_reader]
+            for job in running_jobs.values():
+                objects.append(job['proc'].sentinel)
+                if 'worker' in job:
+                    objects.append(job['worker']['conn'])
+            wait(objects)
+
         def _poll_jobs():
             with self._shared_lock:
-                while not self._shared_queue.empty():
-                    job_class, job_kwargs, priority = self._shared_queue.get_nowait()
+                requests = self._shared_requests.value
+                self._shared_requests.value = 0
+                while self._wakeup_reader.poll():
+                    self._wakeup_reader.recv_bytes()
+
+                # The counted requests have been put on the queue, but they
+                # may still be in transit (multiprocessing.Queue.empty() is
+                # unreliable). Requests of killed processes may get lost,
+                # hence the timeout, and late ones are picked up by the next
+                # poll.
+                while True:
+                    try:
+                        if requests > 0:
+                            requests -= 1
+                            job_class, job_kwargs, priority = self._shared_queue.get(timeout=1)
+                        else:
+                            job_class, job_kwargs, priority = self._shared_queue.get_nowait()
+                    except Empty:
+                        if requests > 0:
+                            continue
+                        break
                     if job_class is not None:
                         _add_job(job_class, job_kwargs, priority)
                     else:
@@ -288,12 +475,18 @@ class Controller:
 
         def _add_job(job_class, job_kwargs, priority):
             nonlocal job_id
+            # Drop the request if the same issue is already being enriched.
+            if job_class is EnrichJob and any(isinstance(job, EnrichJob) and job.issue['_id'] == job_kwargs['issue']['_id']
+                                              for job in chain(queued_jobs.values(), (running['job'] for running in running_jobs.values()))):
+                return
+
             next_job = job_class(id=job_id,
                                  config=self.config,
                                  db=self.db,
                                  listener=self.listener,
                                  **job_kwargs)
             job_id += 1
+            job_requests[next_job.id] = (job_class, job_kwargs)
 
             if priority:
                 next_job.cost = 0
@@ -322,18 +515,26 @@ class Controller:
                 lambda: self.listener.on_update_job_added(job_id=next_job.id,
                                                           cost=next_job.cost,
                                                           sut=next_job.sut_name),
+                EnrichJob:
+                lambda: self.listener.on_enrich_job_added(job_id=next_job.id,
+                                                          cost=next_job.cost,
+                                                          sut=next_job.sut_name,
+                                                          issue_oid=next_job.issue['_id'],
+                                                          issue_id=next_job.issue['id']),
             }[job_class]()
 
-            job_queue.insert(0 if priority else len(job_queue), next_job)
+            _push_job(next_job, priority)
 
         def _cancel_job(job_id):
             if job_id in running_jobs:
                 Controller.kill_process_tree(running_jobs[job_id]['proc'].pid)
-            else:
-                job_idx = [job_idx for job_idx, job in enumerate(job_queue) if job.id == job_id]
-                if job_idx:
-                    self.listener.on_job_removed(job_id=job_id)
-                    del job_queue[job_idx[0]]
+            elif job_id in queued_jobs:
+                self.listener.on_job_removed(job_id=job_id)
+                del queued_jobs[job_id]
+                del job_requests[job_id]
+
+        if self.job_pool:
+            idle_workers.extend(_start_worker() for _ in range(self.capacity))
 
         if validate is not None:
             self.validate_all(sut_name=validate)
@@ -350,62 +551,83 @@ class Controller:
                     cycle += 1
                 if cycle > max_cycles or (not self.fuzzers and max_cycles != inf):
                     while load > 0:
-                        time.sleep(1)
+                        _wait_events()
                         _poll_jobs()  # only to let running jobs cancelled; newly added jobs don't get scheduled
                         _update_load()
                     break
 
                 # Hunt for new issues only if there is no other work to do.
-                if not job_queue:
+                if not queued_jobs:
                     if not self.fuzzers:
-                        time.sleep(1)
+                        _wait_events()
                         continue
 
-                    # Determine fuzz job to be queued and then update fuzz_idx
-                    # to point to the next job's parameters.
-                    fuzzer_name = fuzz_names[fuzz_idx]
-                    fuzz_section = f'fuzz.{fuzzer_name}'
+                    # Count the selection of a fuzz job towards the cycle.
                     fuzz_idx = (fuzz_idx + 1) % len(self.fuzzers)
 
-                    # Skip fuzz job if limit on parallel instances is reached.
-                    instances = as_int_or_inf(self.config.get(fuzz_section, 'instances', fallback='inf'))
-                    if instances <= sum(1 for job in running_jobs.values() if isinstance(job['job'], FuzzJob) and job['job'].fuzzer_name == fuzzer_name):
+                    # Let the scheduler determine the fuzz job to be queued
+                    # from those that have not reached their limit on parallel
+                    # instances. If there is none, wait for a running job.
+                    fuzzer_names = [fuzzer_name for fuzzer_name in self.fuzzers if _has_instance_capacity(fuzzer_name)]
+                    if not fuzzer_names:
+                        if running_jobs:
+                            _wait_events()
                         continue
 
+                    fuzzer_name = self.scheduler(fuzzers=fuzzer_names)
+                    fuzz_section = f'fuzz.{fuzzer_name}'
+
                     # Before queueing a new fuzz job, check if we are working
                     # with the latest version of the SUT and queue an update if
                     # needed.
+                    # (The update condition of every SUT is instantiated
+                    # only once per session.)
                     sut_name = self.config.get(fuzz_section, 'sut')
-                    update_condition = config_get_object(self.config, f'sut.{sut_name}', 'update_condition')
+                    if sut_name not in update_conditions:
+                        update_conditions[sut_name] = config_get_object(self.config, f'sut.{sut_name}', 'update_condition')
+                    update_condition = update_conditions[sut_name]
                     if update_condition and update_condition():
                         self.add_update_job(sut_name)
 
                     self.add_fuzz_job(fuzzer_name)
 
-                    # Poll newly added job(s). Looping ensures that jobs will
+                    # Poll newly added job(s). Waiting ensures that jobs will
                     # eventually arrive.
                     # (Unfortunately, multiprocessing.Queue.empty() is unreliable.)
-                    while not job_queue:
+                    while not queued_jobs:
+                        _wait_events()
                         _poll_jobs()
+                        _update_load()
 
                 # Perform next job as soon as there is enough capacity for it.
                 while True:
-                    if not job_queue:
-                        next_job = None
+                    next_job = _peek_job()
+                    if not next_job:
                         break
-                    if load + job_queue[0].cost <= self.capacity:
-                        next_job = job_queue.pop(0)
+                    if load + next_job.cost <= self.capacity:
+                        _pop_job()
                         break
-                    time.sleep(1)
+                    _wait_events()
                     _poll_jobs()
                     _update_load()
                 if not next_job:
                     continue
 
-                proc = Process(target=self._run_job, args=(next_job,))
-                running_jobs[next_job.id] = {'job': next_job, 'proc': proc}
-                self.listener.on_job_activated(job_id=next_job.id)
-                proc.start()
+                job_class, job_kwargs = job_requests.pop(next_job.id)
+                if self.job_pool:
+                    # Reuse an idle worker if there is any alive (cancelled
+                    # jobs take their workers with them), or grow the pool.
+                    while idle_workers and not idle_workers[-1]['proc'].is_alive():
+                        idle_workers.pop()
+                    worker = idle_workers.pop() if idle_workers else _start_worker()
+                    running_jobs[next_job.id] = {'job': next_job, 'proc': worker['proc'], 'worker': worker}
+                    self.listener.on_job_activated(job_id=next_job.id)
+                    worker['conn'].send((job_class, next_job.id, job_kwargs))
+                else:
+                    proc = Process(target=self._run_job_process, args=(next_job,))
+                    running_jobs[next_job.id] = {'job': next_job, 'proc': proc}
+                    self.listener.on_job_activated(job_id=next_job.id)
+                    proc.start()
 
         except KeyboardInterrupt:
             pass
@@ -415,8 +637,22 @@ class Controller:
             Controller.kill_process_tree(os.getpid(), kill_root=False)
             if os.path.exists(self.work_dir):
                 shutil.rmtree(self.work_dir, ignore_errors=True)
+            tmpfs_dir = tmpfs_session_dir(self.work_dir)
+            if tmpfs_dir and os.path.exists(tmpfs_dir):
+                shutil.rmtree(tmpfs_dir, ignore_errors=True)
+            self.db.close()
+
+    def _run_job_process(self, job):
+        try:
+            self._run_job(job)
+        finally:
+            self.db.close()
 
     def _run_job(self, job):
+        # Enrichment of new (or not yet enriched) issues, in the background, as
+        # soon as the job stores them.
+        if hasattr(job, 'enrich_callback'):
+            job.enrich_callback = self.add_enrich_job
         try:
             for issue in job.run():
                 # Automatic reduction and/or validation if the job found something new
@@ -425,11 +661,37 @@ class Controller:
         except Exception as e:
             self.listener.warning(job_id=job.id, msg=f'Exception in {job!r}: {e}\n{traceback.format_exc()}')
 
+    def _run_worker(self, conn):
+        # Jobs may install their own SIGINT handler, which must not outlive
+        # them in a long-lived worker.
+        sigint_handler = signal.getsignal(signal.SIGINT)
+        while True:
+            try:
+                job_class, job_id, job_kwargs = conn.recv()
+            except EOFError:
+                break
+
+            try:
+                job = job_class(id=job_id,
+                                config=self.config,
+                                db=self.db,
+                                listener=self.listener,
+                                **job_kwargs)
+            except Exception as e:
+                self.listener.warning(job_id=job_id, msg=f'Exception in creating {job_class.__name__}: {e}\n{traceback.format_exc()}')
+            else:
+                self._run_job(job)
+            signal.signal(signal.SIGINT, sigint_handler)
+            conn.send(job_id)
+
+        # The database client is shared by the jobs of the worker.
+        self.db.close()
+
     def add_fuzz_job(self, fuzzer_name, priority=False):
         # Added for the sake of completeness and consistency.
         # Should not be used by UI to add fuzz jobs.
         with self._shared_lock:
-            self._shared_queue.put((FuzzJob, {'fuzzer_name': fuzzer_name, 'subconfig_id': self.fuzzers[fuzzer_name]['subconfig']}, priority))
+            self._put_request((FuzzJob, {'fuzzer_name': fuzzer_name, 'subconfig_id': self.fuzzers[fuzzer_name]['subconfig']}, priority))
         return True
 
     def add_validate_job(self, issue, priority=False):
@@ -437,7 +699,7 @@ class Controller:
             return False
 
         with self._shared_lock:
-            self._shared_queue.put((ValidateJob, {'issue': issue}, priority))
+            self._put_request((ValidateJob, {'issue': issue}, priority))
         return True
 
     def add_reduce_job(self, issue, priority=False):
@@ -445,7 +707,15 @@ class Controller:
             return False
 
         with self._shared_lock:
-            self._shared_queue.put((ReduceJob, {'issue': issue}, priority))
+            self._put_request((ReduceJob, {'issue': issue}, priority))
+        return True
+
+    def add_enrich_job(self, issue, priority=False):
+        if not self.config.has_option(f'sut.{issue["sut"]}', 'enrich_call'):
+            return False
+
+        with self._shared_lock:
+            self._put_request((EnrichJob, {'issue': issue}, priority))
         return True
 
     def add_update_job(self, sut_name, priority=False):
@@ -453,13 +723,20 @@ class Controller:
             return False
 
         with self._shared_lock:
-            self._shared_queue.put((UpdateJob, {'sut_name': sut_name}, priority))
+            self._put_request((UpdateJob, {'sut_name': sut_name}, priority))
 
         if as_bool(self.config.get(f'sut.{sut_name}', 'validate_after_update', fallback=self.validate_after_update)):
             self.validate_all(sut_name)
 
         return True
 
+    def _put_request(self, request):
+        # Must be called with the shared lock held.
+        self._shared_queue.put(request)
+        self._shared_requests.value += 1
+        if self._shared_requests.value == 1:
+            self._wakeup_writer.send_bytes(b'')
+
     def validate_all(self, sut_name=None):
         sut_name = [sut_name] if sut_name else [section.split('.', maxsplit=1)[1] for section in self.config.sections() if section.startswith('sut.') and section.count('.') == 1]
         for issue in self.db.find_issues_by_suts(sut_name):
@@ -474,7 +751,7 @@ class Controller:
 
     def cancel_job(self, job_id):
         with self._shared_lock:
-            self._shared_queue.put((None, {'job_id': job_id}, None))
+            self._put_request((None, {'job_id': job_id}, None))
         return True
 
     @staticmethod
@@ -497,3 +774,28 @@ class Controller:
                     pass
         except psutil.NoSuchProcess:
             pass
+
+    @staticmethod
+    def kill_process_group(proc):
+        """
+        Kill a subprocess together with all the processes in its process group,
+        and reap the subprocess. The subprocess must have been started in a new
+        session (i.e., with ``start_new_session=True``), which makes it the
+        leader of a new process group. Killing the group needs no walk of the
+        process tree and no polling. On platforms without process groups,
+        :meth:`kill_process_tree` is used instead.
+
+        :param subprocess.Popen proc: the subprocess to kill.
+        """
+        if not hasattr(os, 'killpg'):
+            Controller.kill_process_tree(proc.pid)
+            return
+
+        try:
+            # The process group outlives its leader as long as any of its
+            # members are alive, so killing is needed even if the subprocess
+            # has already exited.
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        proc.wait()
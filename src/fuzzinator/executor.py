@@ -1,4 +1,4 @@
-# Copyright (c) 2016-2023 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 # Copyright (c) 2019 Tamas Keri.
 #
 # Licensed under the BSD 3-Clause License
@@ -15,15 +15,16 @@ import sys
 
 import inators
 
+from .config import Config
 from .pkgdata import __version__
 
 root_logger = logging.getLogger()
 
 
 def process_args(args):
-    config = configparser.ConfigParser(interpolation=configparser.ExtendedInterpolation(),
-                                       strict=False,
-                                       allow_no_value=True)
+    config = Config(interpolation=configparser.ExtendedInterpolation(),
+                    strict=False,
+                    allow_no_value=True)
 
     config.read_dict({
         'fuzzinator': {
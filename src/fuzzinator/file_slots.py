@@ -0,0 +1,159 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+
+def tmpfs_session_dir(session_work_dir):
+    """
+    Directory on the memory-backed file system for the files of the fuzz
+    session with the given work directory (or ``None`` if no tmpfs is
+    available). It is removed by :class:`fuzzinator.Controller` when the
+    session ends, even if the jobs using it are killed.
+    """
+    if not os.path.isdir('/dev/shm'):
+        return None
+    key = hashlib.sha1(os.path.abspath(session_work_dir).encode('utf-8', errors='surrogateescape')).hexdigest()[:16]
+    return os.path.join('/dev/shm', f'fuzzinator-{key}')
+
+
+class FileSlots:
+    """
+    Fixed set of reusable files to deliver test inputs to SUTs through the file
+    system without creating and removing a file for every test. The files are
+    created once, in memory, and are overwritten in a round-robin manner. A
+    slot is in use from the time a test input is written to it until it is
+    released, and slots in use are never overwritten.
+
+    The supported storages are:
+
+      - ``'tmpfs'``: the files are created in a temporary directory on a
+        memory-backed file system (``/dev/shm``), if available, or in the
+        given fallback directory otherwise. (The temporary directory is
+        placed in the directory of the fuzz session, see
+        :func:`tmpfs_session_dir`.)
+      - ``'memfd'``: the files are anonymous memory files (see
+        ``memfd_create``), accessible to other processes of the same user via
+        their ``/proc/<pid>/fd/<fd>`` paths. Available on Linux only, falls
+        back to ``'tmpfs'`` elsewhere.
+
+    :param str storage: ``'tmpfs'`` or ``'memfd'``.
+    :param str filename: name pattern of the files, which may contain the
+        substring ``{uid}`` as a placeholder for the index of the slot.
+    :param int slots: number of files.
+    :param str work_dir: fallback directory for ``'tmpfs'`` storage. Its
+        parent is expected to be the work directory of the fuzz session.
+    """
+
+    storages = ('tmpfs', 'memfd')
+
+    def __init__(self, *, storage, filename, slots, work_dir):
+        if storage not in self.storages:
+            raise ValueError(f'unknown file storage {storage!r}')
+        if storage == 'memfd' and (not hasattr(os, 'memfd_create') or not os.path.isdir(f'/proc/{os.getpid()}/fd')):
+            logger.warning('memfd file storage is not available on this platform, falling back to tmpfs')
+            storage = 'tmpfs'
+
+        self.storage = storage
+        self.filename = filename
+        self.slots = slots
+        self.work_dir = work_dir
+        self.dir = None
+        self.fds = []
+        self.paths = []
+        self.busy = set()
+        self.lock = Lock()
+
+    def open(self):
+        self.close()
+
+        if self.storage == 'tmpfs':
+            session_dir = tmpfs_session_dir(os.path.dirname(self.work_dir))
+            if session_dir:
+                os.makedirs(session_dir, exist_ok=True)
+                self.dir = tempfile.mkdtemp(prefix='slots-', dir=session_dir)
+            else:
+                logger.warning('no tmpfs is available, falling back to %s', self.work_dir)
+                os.makedirs(self.work_dir, exist_ok=True)
+                self.dir = tempfile.mkdtemp(prefix='slots-', dir=self.work_dir)
+
+        for slot in range(self.slots):
+            name = self.filename.format(uid=slot)
+            if self.storage == 'memfd':
+                fd = os.memfd_create(name, os.MFD_CLOEXEC)
+                path = f'/proc/{os.getpid()}/fd/{fd}'
+            else:
+                path = os.path.join(self.dir, name)
+                fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+            self.fds.append(fd)
+            self.paths.append(path)
+
+    def close(self):
+        for fd in self.fds:
+            os.close(fd)
+        self.fds = []
+        self.paths = []
+        self.busy = set()
+
+        if self.dir:
+            shutil.rmtree(self.dir, ignore_errors=True)
+            # Remove the session directory too if no other slots use it.
+            try:
+                os.rmdir(os.path.dirname(self.dir))
+            except OSError:
+                pass
+            self.dir = None
+
+    def write(self, test, uid):
+        """
+        Overwrite the content of a free slot with a test input. The slot is in
+        use until it is released with :meth:`release`.
+
+        :param test: the test input (str, bytes, or anything convertible to
+            str).
+        :param int uid: unique id of the test, which determines the slot to
+            use (if it is free, otherwise the next free slot is used).
+        :return: the path of the file containing the test input.
+        :raises RuntimeError: if all slots are in use.
+        """
+        if not isinstance(test, bytes):
+            test = (test if isinstance(test, str) else str(test)).encode('utf-8')
+
+        with self.lock:
+            if not self.fds:
+                self.open()
+            for i in range(self.slots):
+                slot = (uid + i) % self.slots
+                if slot not in self.busy:
+                    break
+            else:
+                raise RuntimeError(f'all {self.slots} file slots are in use (the number of slots should not be less than the number of test inputs in use at the same time)')
+            self.busy.add(slot)
+        fd = self.fds[slot]
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, test)
+        os.ftruncate(fd, len(test))
+        return self.paths[slot]
+
+    def release(self, path):
+        """
+        Mark the slot of a test input as free, i.e., allow it to be overwritten
+        by a later test input.
+
+        :param str path: the path of the file, as returned by :meth:`write`.
+        """
+        with self.lock:
+            if path in self.paths:
+                self.busy.discard(self.paths.index(path))
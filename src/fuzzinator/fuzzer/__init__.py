@@ -7,10 +7,12 @@
 
 from .afl_runner import AFLRunner
 from .byte_flip_decorator import ByteFlipDecorator
+from .directory_watcher import DirectoryWatcher
 from .file_writer_decorator import FileWriterDecorator
 from .fuzzer import Fuzzer
 from .fuzzer_decorator import FuzzerDecorator
 from .list_directory import ListDirectory
+from .prefetch_decorator import PrefetchDecorator
 from .random_content import RandomContent
 from .random_integer import RandomInteger
 from .subprocess_runner import SubprocessRunner
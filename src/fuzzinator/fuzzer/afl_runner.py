@@ -1,4 +1,4 @@
-# Copyright (c) 2016-2023 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
@@ -7,9 +7,15 @@
 
 import logging
 import os
-import pexpect
+import signal
+import subprocess
+import tempfile
+import time
 
-from ..config import as_dict, as_pargs, as_path
+from ..config import as_dict, as_pargs, as_path, decode
+from ..controller import Controller
+from ..resource_limits import ResourceLimits
+from .directory_watcher import DirectoryWatcher
 from .fuzzer import Fuzzer
 
 logger = logging.getLogger(__name__)
@@ -17,12 +23,25 @@ logger = logging.getLogger(__name__)
 
 class AFLRunner(Fuzzer):
     """
-    Wrapper around AFL to be executed continuously in a subprocess. The findings
-    of AFL are periodically checked and any new test cases are returned as test
+    Wrapper around AFL to be executed continuously in a subprocess. AFL is
+    started when the fuzz job starts and keeps running until the job ends.
+    The crashes found by AFL are picked up as soon as AFL writes them (see
+    :class:`fuzzinator.fuzzer.DirectoryWatcher`) and are returned as test
     inputs to the SUT. (Thus, all AFL findings are processed, extended, and
     filtered by any and all SUT decorators, uniqueness is determined, etc.)
+    Requesting a test blocks until AFL finds a new crash.
 
-    For AFL, it is best not to run multiple instances in parallel.
+    The fuzzer can also run secondary AFL instances (with the ``-S`` option
+    of AFL) besides the main one, which share their findings with each other.
+    The statistics of the running AFL instances (read from their
+    ``fuzzer_stats`` files) are exposed in the ``fuzzer_stats`` attribute of
+    the fuzzer, which is reported to the listeners by fuzz jobs via
+    :meth:`fuzzinator.listener.EventListener.on_fuzzer_stats_updated`, also
+    periodically while the fuzzer is waiting for crashes (fuzz jobs set the
+    ``stats_callback`` attribute of the fuzzer to get notified).
+
+    For AFL, it is best not to run multiple instances of this fuzzer in
+    parallel, but to use the ``secondaries`` parameter instead.
 
     **Mandatory parameters of the fuzzer:**
 
@@ -50,6 +69,17 @@ class AFLRunner(Fuzzer):
         random tweaks.
         For further details check:
         https://github.com/mirrorer/afl/blob/master/docs/parallel_fuzzing.txt
+      - ``secondaries``: number of secondary AFL instances to run besides the
+        main one (named ``secondary0``, ``secondary1``, etc.; default: 0). If
+        neither ``master_name`` nor ``slave_name`` is given, the main instance
+        is named ``main``.
+      - ``stats_interval``: seconds between the reports of the statistics of
+        the AFL instances while waiting for crashes (default: 10).
+      - ``memory_limit``, ``cpu_time_limit``, ``max_procs``,
+        ``max_file_size``, ``cgroup``: resource limits of the AFL processes,
+        inherited by the SUT processes (see
+        :class:`fuzzinator.ResourceLimits`). (AFL applies its own memory limit
+        to the SUT, see its ``-m`` option.)
 
     **Example configuration snippet:**
 
@@ -75,58 +105,169 @@ class AFLRunner(Fuzzer):
             cwd=${sut.foo.call:cwd}
             env=${sut.foo.call:env}
             input=/home/alice/foo-inputs
+            secondaries=3
     """
 
-    def __init__(self, *, afl_fuzz, input, output, sut_command, cwd=None, env=None, timeout=None, dictionary=None,
-                 master_name=None, slave_name=None, work_dir, **kwargs):
-        if 'output' in kwargs:
+    # The output of a running AFL instance is discarded when it grows larger
+    # than this (only its end is needed to report abnormal terminations).
+    max_output = 1 << 20
+
+    def __init__(self, *, afl_fuzz, input, sut_command, output=None, cwd=None, env=None, timeout=None, dictionary=None,
+                 master_name=None, slave_name=None, secondaries=None, stats_interval=None, memory_limit=None, cpu_time_limit=None, max_procs=None,
+                 max_file_size=None, cgroup=None, work_dir, **kwargs):
+        if output is not None:
             logger.warning('output parameter of fuzzinator.fuzzer.AFLRunner is deprecated')
 
         self.afl_fuzz = as_path(afl_fuzz)
         self.input = as_path(input)
         self.sut_command = as_pargs(sut_command.format(test='@@'))
         self.cwd = as_path(cwd) if cwd else None
-        self.env = as_dict(env) if env else {}
+        self.env = dict(os.environ, **as_dict(env)) if env else dict(os.environ)
         self.env.update(AFL_NO_UI='1')
         self.timeout = timeout
         self.dictionary = as_path(dictionary) if dictionary else None
+        self.secondaries = int(secondaries) if secondaries else 0
+        if not master_name and not slave_name and self.secondaries:
+            master_name = 'main'
         self.master_name = master_name
         self.slave_name = slave_name
+        self.stats_interval = float(stats_interval) if stats_interval else 10
+        self.limits = ResourceLimits(memory_limit=memory_limit, cpu_time_limit=cpu_time_limit, max_procs=max_procs, max_file_size=max_file_size, cgroup=cgroup)
 
         self.work_dir = work_dir
-        self.iteration = 1
-        self.checked = set()
+        self.instances = []
         self.tests = []
+        self.stats_callback = None
+        self.stats_reported = 0
 
     def __enter__(self):
         os.makedirs(self.work_dir, exist_ok=True)
+        self.tests = []
+        self.instances = []
+        self.stats_reported = time.time()
+
+        names = [(['-M', self.master_name] if self.master_name else []) + (['-S', self.slave_name] if self.slave_name else [])]
+        names += [['-S', f'secondary{i}'] for i in range(self.secondaries)]
+        for name_args in names:
+            command = ['-i', self.input, '-o', self.work_dir] + \
+                (['-t', self.timeout] if self.timeout else []) + \
+                (['-x', self.dictionary] if self.dictionary else []) + \
+                name_args + \
+                self.sut_command
+            # The output of AFL is collected in a file (not a pipe) so that AFL
+            # cannot block on it. The file is opened in append mode (which
+            # TemporaryFile does not set on the file descriptor), so that it
+            # can be truncated while AFL is writing it.
+            output_fd, output_path = tempfile.mkstemp()
+            output = open(output_path, 'a+b')
+            os.close(output_fd)
+            os.remove(output_path)
+            proc = self.limits.popen([self.afl_fuzz] + command,
+                                     cwd=self.cwd,
+                                     env=self.env,
+                                     stdin=subprocess.DEVNULL,
+                                     stdout=output,
+                                     stderr=subprocess.STDOUT,
+                                     start_new_session=True)
+            # The directory of the instance is created by AFL.
+            instance_dir = os.path.join(self.work_dir, name_args[-1] if name_args else '')
+            self.instances.append({'proc': proc, 'output': output, 'dir': instance_dir, 'watcher': None})
         return self
 
     def __exit__(self, *exc):
+        for instance in self.instances:
+            if instance['proc'].poll() is None:
+                Controller.kill_process_group(instance['proc'])
+            if instance['watcher']:
+                instance['watcher'].close()
+            instance['output'].close()
+        self.instances = []
         return False
 
     def __call__(self, *, index):
-        crash_dir = os.path.join(self.work_dir, self.master_name or self.slave_name or '', 'crashes')
-
-        while True:
-            if self.tests:
-                test = self.tests.pop()
-                self.checked.add(os.path.basename(test))
-                with open(test, 'rb') as f:
-                    return f.read()
-
-            command = \
-                (['-i', self.input] if self.iteration == 1 else ['-i-']) + \
-                ['-o', self.work_dir] + \
-                (['-t', self.timeout] if self.timeout else []) + \
-                (['-x', self.dictionary] if self.dictionary else []) + \
-                (['-M', self.master_name] if self.master_name else []) + \
-                (['-S', self.slave_name] if self.slave_name else []) + \
-                self.sut_command
+        while not self.tests:
+            if self.stats_callback and time.time() - self.stats_reported >= self.stats_interval:
+                self.stats_reported = time.time()
+                self.stats_callback()  # pylint: disable=not-callable
+
+            running = [instance for instance in self.instances if not self._check_exit(instance)]
+            if not running:
+                # All the instances have terminated, collect their last crashes.
+                for instance in self.instances:
+                    self._collect(instance, flush=True)
+                if not self.tests:
+                    return None
+                break
+
+            for instance in self.instances:
+                # Wait for new crashes for about half a second in total to
+                # notice the termination of the instances in time.
+                self._collect(instance, timeout=0.5 / len(self.instances))
+
+        test = self.tests.pop(0)
+        with open(test, 'rb') as f:
+            return f.read()
+
+    @property
+    def fuzzer_stats(self):
+        """
+        Statistics of the AFL instances, summed (``'execs_done'``,
+        ``'execs_per_sec'``, ``'saved_crashes'``, and ``'saved_hangs'``), and
+        the number of the AFL instances that have written statistics
+        (``'instances'``).
+        """
+        stats = {}
+        for instance in self.instances:
+            try:
+                with open(os.path.join(instance['dir'], 'fuzzer_stats')) as f:
+                    instance_stats = dict(line.split(':', 1) for line in f if ':' in line)
+            except OSError:
+                continue
+
+            instance_stats = {key.strip(): value.strip() for key, value in instance_stats.items()}
+            stats['instances'] = stats.get('instances', 0) + 1
+            # Older AFL versions use unique_crashes and unique_hangs.
+            for key, keys in [('execs_done', ['execs_done']),
+                              ('execs_per_sec', ['execs_per_sec']),
+                              ('saved_crashes', ['saved_crashes', 'unique_crashes']),
+                              ('saved_hangs', ['saved_hangs', 'unique_hangs'])]:
+                for afl_key in keys:
+                    if afl_key in instance_stats:
+                        try:
+                            stats[key] = stats.get(key, 0) + float(instance_stats[afl_key])
+                        except ValueError:
+                            pass
+                        break
+        return stats
+
+    def _collect(self, instance, timeout=0, flush=False):
+        if not instance['watcher']:
+            crash_dir = os.path.join(instance['dir'], 'crashes')
+            if not os.path.isdir(crash_dir):
+                # AFL has not set up its output directory yet (e.g., it is
+                # still calibrating the initial test cases).
+                time.sleep(timeout)
+                return
+            instance['watcher'] = DirectoryWatcher(crash_dir)
 
-            child = pexpect.spawn(self.afl_fuzz, command, cwd=self.cwd, env=self.env)
-            child.expect([f'Fuzzing test case [#]{self.iteration}.*', pexpect.EOF], timeout=None)
-            child.terminate(force=True)
+        crashes = instance['watcher'].flush() if flush else instance['watcher'].wait(timeout)
+        # Skip README.txt and other auxiliary files of AFL.
+        self.tests.extend(crash for crash in crashes if os.path.basename(crash).startswith('id'))
 
-            self.tests = [os.path.join(crash_dir, test) for test in os.listdir(crash_dir) if test.startswith('id') and test not in self.checked]
-            self.iteration += 1
+    def _check_exit(self, instance):
+        proc = instance['proc']
+        if proc.poll() is None:
+            if os.fstat(instance['output'].fileno()).st_size > self.max_output:
+                instance['output'].truncate(0)
+            return False
+        if not instance.get('reported'):
+            instance['reported'] = True
+            if proc.returncode not in (0, -signal.SIGKILL):
+                instance['output'].seek(0)
+                resource_limit = self.limits.classify(proc.returncode)
+                logger.warning('AFL instance %s terminated with exit code %d%s.\n%s',
+                               instance['dir'],
+                               proc.returncode,
+                               f' ({resource_limit})' if resource_limit else '',
+                               decode(instance['output'].read()))
+        return True
@@ -1,4 +1,4 @@
-# Copyright (c) 2017-2021 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2017-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
@@ -6,9 +6,14 @@
 # according to those terms.
 
 import math
-import random
 
 from .fuzzer_decorator import FuzzerDecorator
+from .random_content import random_bytes, seeded_random
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class ByteFlipDecorator(FuzzerDecorator):
@@ -26,6 +31,13 @@ class ByteFlipDecorator(FuzzerDecorator):
         default, the smallest ASCII code of the printable characters).
       - ``max_byte``: maximum value for the flipped bytes (integer number, 126
         by default, the largest ASCII code of the printable characters).
+      - ``seed``: seed of the random number generator, which makes the flips
+        reproducible (the flips of the test generated for an index depend only
+        on the seed, the index, and the test; default: not reproducible).
+
+    If NumPy is installed, the positions of the flips are selected and the
+    bytes are replaced with vectorized operations. (The flips generated for a
+    seed differ with and without NumPy.)
 
     **Example configuration snippet:**
 
@@ -49,18 +61,32 @@ class ByteFlipDecorator(FuzzerDecorator):
             max_byte=255
     """
 
-    def __init__(self, *, frequency, min_byte=32, max_byte=126, **kwargs):
+    def __init__(self, *, frequency, min_byte=32, max_byte=126, seed=None, **kwargs):
         self.frequency = int(frequency)
         self.min_byte = int(min_byte)
         self.max_byte = int(max_byte)
+        self.seed = seed
+        self.alphabet = bytes(range(self.min_byte, self.max_byte + 1))
 
     def call(self, cls, obj, *, index):
         test = super(cls, obj).__call__(index=index)
         if test is None:
             return None
 
-        test = bytearray(test)
-        for pos in random.sample(range(len(test)), math.ceil(len(test) / self.frequency)):
-            test[pos] = random.randint(self.min_byte, self.max_byte)
+        rng = seeded_random(self.seed, index)
+        count = math.ceil(len(test) / self.frequency)
+        values = random_bytes(rng, count, self.alphabet)
+        if count == len(test):
+            # Every byte is flipped (in random order, which does not matter).
+            return values
 
+        if numpy is not None:
+            np_rng = numpy.random.default_rng(rng.getrandbits(64))
+            test = numpy.frombuffer(test, dtype=numpy.uint8).copy()
+            test[np_rng.choice(len(test), count, replace=False)] = numpy.frombuffer(values, dtype=numpy.uint8)
+            return test.tobytes()
+
+        test = bytearray(test)
+        for pos, value in zip(rng.sample(range(len(test)), count), values):
+            test[pos] = value
         return bytes(test)
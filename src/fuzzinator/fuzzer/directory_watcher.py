@@ -0,0 +1,186 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _inotify_libc():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        return libc if hasattr(libc, 'inotify_init1') else None
+    except OSError:
+        return None
+
+
+class DirectoryWatcher:
+    """
+    Auxiliary class to watch a directory for new files written by another
+    process. A file is reported once it is complete, i.e., when the writer
+    closes it or moves it into the directory. On Linux, the directory is
+    watched with inotify. Elsewhere (or if inotify is not available), the
+    directory is polled, and a file is considered complete once its size and
+    modification time are unchanged between two polls. The files present when
+    the watcher is created are considered complete.
+
+    :param str path: the directory to watch (created if it does not exist).
+    :param float poll_interval: time between the polls of the directory (in
+        seconds) if inotify is not available.
+    """
+
+    def __init__(self, path, *, poll_interval=0.1):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.fd = None
+        self.reported = set()
+        self.pending = {}
+        self.ready = []
+
+        os.makedirs(path, exist_ok=True)
+        libc = _inotify_libc()
+        if libc:
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+            if fd >= 0 and libc.inotify_add_watch(fd, os.fsencode(path), _IN_CLOSE_WRITE | _IN_MOVED_TO) >= 0:
+                self.fd = fd
+            else:
+                logger.debug('inotify is not available (%s), polling %s', os.strerror(ctypes.get_errno()), path)
+                if fd >= 0:
+                    os.close(fd)
+
+        self.ready.extend(self._scan())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def forget(self, path):
+        """
+        Forget a reported file (e.g., after it has been removed), to keep the
+        bookkeeping of the watcher small. If a file with the same name is
+        written later, it is reported again.
+        """
+        self.reported.discard(os.path.basename(path))
+
+    def wait(self, timeout=None):
+        """
+        Wait for new complete files.
+
+        :param float timeout: maximum time to wait (in seconds, ``None`` means
+            no limit).
+        :return: the paths of the new files (may be empty if the timeout has
+            expired).
+        :rtype: list
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        while not self.ready:
+            time_left = max(deadline - time.time(), 0) if deadline is not None else None
+            if self.fd is not None:
+                if select.select([self.fd], [], [], time_left)[0]:
+                    self._read_events()
+            else:
+                self.ready.extend(self._poll())
+                if not self.ready:
+                    time.sleep(min(self.poll_interval, time_left) if time_left is not None else self.poll_interval)
+
+            if deadline is not None and time.time() >= deadline:
+                break
+
+        ready, self.ready = self.ready, []
+        return [os.path.join(self.path, name) for name in ready]
+
+    def flush(self):
+        """
+        Return all the files not reported yet, regardless of whether they are
+        complete (i.e., when the writer is known to have finished).
+
+        :rtype: list
+        """
+        if self.fd is not None:
+            self._read_events()
+        self.ready.extend(self._scan())
+        self.pending = {}
+        return self.wait(0)
+
+    def _report(self, names):
+        new = []
+        for name in names:
+            if name not in self.reported:
+                self.reported.add(name)
+                new.append(name)
+        return new
+
+    def _scan(self):
+        try:
+            names = sorted(entry.name for entry in os.scandir(self.path) if entry.is_file())
+        except OSError:
+            return []
+        return self._report(names)
+
+    def _poll(self):
+        try:
+            entries = {entry.name: entry.stat() for entry in os.scandir(self.path) if entry.is_file() and entry.name not in self.reported}
+        except OSError:
+            return []
+
+        stable = []
+        pending = {}
+        for name, st in sorted(entries.items()):
+            state = (st.st_size, st.st_mtime_ns)
+            if self.pending.get(name) == state:
+                stable.append(name)
+            else:
+                pending[name] = state
+        self.pending = pending
+        return self._report(stable)
+
+    def _read_events(self):
+        while True:
+            try:
+                buffer = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return
+            if not buffer:
+                return
+
+            names = []
+            offset = 0
+            while offset < len(buffer):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    # Events were lost, the directory has to be rescanned.
+                    self.ready.extend(self._scan())
+                elif name:
+                    names.append(os.fsdecode(name))
+            self.ready.extend(self._report(names))
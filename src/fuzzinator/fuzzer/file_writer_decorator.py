@@ -1,4 +1,4 @@
-# Copyright (c) 2017-2021 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2017-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
@@ -9,6 +9,9 @@ import logging
 import os
 import shutil
 
+from collections import deque
+
+from ..file_slots import FileSlots
 from .fuzzer_decorator import FuzzerDecorator
 
 logger = logging.getLogger(__name__)
@@ -26,6 +29,24 @@ class FileWriterDecorator(FuzzerDecorator):
         substring ``{uid}`` as a placeholder for a unique string (replaced by
         the decorator).
 
+    **Optional parameters of the decorator:**
+
+      - ``storage``: where to write the test inputs to. ``disk`` (the default)
+        creates a new file in the working directory for every test. ``tmpfs``
+        and ``memfd`` reuse a fixed set of in-memory files (see
+        :class:`fuzzinator.FileSlots`). A file is reused only after the
+        result of its test has been given back to the fuzzer as feedback (as
+        done by fuzz jobs, in the order of the tests). (Note that with
+        ``memfd``, the output is a ``/proc/<pid>/fd/<fd>`` path, i.e., its name
+        does not follow ``filename``.)
+      - ``slots``: number of reused files for ``tmpfs`` and ``memfd`` storages
+        (default: 1). Should not be less than the number of tests that are
+        waiting for their results at the same time, e.g., the value of the
+        ``fuzz_concurrency`` option of SUTs, their batch size, or the size of
+        a :class:`fuzzinator.fuzzer.PrefetchDecorator` applied after this
+        decorator. The decorated fuzzer raises an error if all the files are
+        in use.
+
     **Example configuration snippet:**
 
         .. code-block:: ini
@@ -40,17 +61,21 @@ class FileWriterDecorator(FuzzerDecorator):
 
             [fuzz.foo-with-random.fuzzer.decorate(0)]
             filename=test-{uid}.txt
+            storage=tmpfs
     """
 
-    def __init__(self, *, filename, work_dir, **kwargs):
+    def __init__(self, *, filename, storage=None, slots=None, work_dir, **kwargs):
         if os.path.basename(filename) != filename:
             logger.warning('specifying directories in filename parameter of fuzzinator.fuzzer.FileWriterDecorator is deprecated (%s) (explicit use of ${fuzzinator:work_dir}?)', filename)
             filename = os.path.basename(filename)
 
         self.filename = filename
+        self.file_slots = FileSlots(storage=storage, filename=filename, slots=int(slots) if slots else 1, work_dir=work_dir) if storage and storage != 'disk' else None
 
         self.work_dir = work_dir
         self.uid = 0
+        # Files written but not released yet, in the order of the tests.
+        self.used_paths = deque()
 
     def init(self, cls, obj, **kwargs):
         super(cls, obj).__init__(**kwargs)
@@ -63,6 +88,9 @@ class FileWriterDecorator(FuzzerDecorator):
 
     def exit(self, cls, obj, *exc):
         suppress = super(cls, obj).__exit__(*exc)
+        if self.file_slots:
+            self.file_slots.close()
+            self.used_paths.clear()
         shutil.rmtree(self.work_dir, ignore_errors=True)
         return suppress
 
@@ -71,10 +99,34 @@ class FileWriterDecorator(FuzzerDecorator):
         if obj.test is None:
             return None
 
-        file_path = os.path.join(self.work_dir, self.filename.format(uid=self.uid))
+        uid = self.uid
         self.uid += 1
 
+        if self.file_slots:
+            file_path = self.file_slots.write(obj.test, uid)
+            self.used_paths.append(file_path)
+            return file_path
+
+        file_path = os.path.join(self.work_dir, self.filename.format(uid=uid))
+
         with open(file_path, 'w' if not isinstance(obj.test, bytes) else 'wb') as f:
             f.write(obj.test if isinstance(obj.test, (str, bytes)) else str(obj.test))
 
         return file_path
+
+    def feedback(self, cls, obj, issue):
+        if self.used_paths:
+            self.file_slots.release(self.used_paths.popleft())
+        if hasattr(super(cls, obj), 'feedback'):
+            super(cls, obj).feedback(issue)
+
+    def __call__(self, fuzzer_class):
+        decorator = self
+        decorated_class = super().__call__(fuzzer_class)
+
+        class SlotReleasingFuzzer(decorated_class):
+
+            def feedback(self, issue):
+                decorator.feedback(decorated_class, self, issue)
+
+        return SlotReleasingFuzzer
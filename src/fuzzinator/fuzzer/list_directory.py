@@ -1,16 +1,26 @@
-# Copyright (c) 2016-2021 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
 # This file may not be copied, modified, or distributed except
 # according to those terms.
 
+import fnmatch
+import hashlib
+import json
 import logging
+import mmap
 import os
+import random
+import re
+import time
+import zlib
 
+from collections import deque
 from pathlib import Path
 
 from ..config import as_bool, as_path
+from ..resource_limits import as_size
 from .fuzzer import Fuzzer
 
 logger = logging.getLogger(__name__)
@@ -22,20 +32,47 @@ class ListDirectory(Fuzzer):
     return their contents one by one. Useful for re-testing previously
     discovered issues.
 
-    Since the fuzzer starts iterating from the beginning of the directory in
-    every fuzz job, there is no gain in running multiple instances of this
-    fuzzer in parallel. Because of the same reason, the fuzzer should be left
-    running in the same fuzz job batch until all the files of the directory are
-    processed.
+    The directories are walked lazily (i.e., the files are not listed up
+    front), in a deterministic order (sorted by path). The fuzzer records the
+    last processed file (a cursor) and a later fuzz job of the same fuzzer
+    continues from there, so the fuzzer can be left running in batches of any
+    size. A file counts as processed when the result of its test is given
+    back to the fuzzer as feedback (as done by fuzz jobs, in the order of the
+    tests), thus, the files of tests that have been generated but not executed
+    (e.g., prefetched ones) are listed again by the next fuzz job. Once all the
+    files are processed, the cursor is reset, and the next fuzz job starts
+    from the beginning of the directory again.
+
+    Multiple instances of the fuzzer can process the files in parallel, if the
+    files are split into shards (by the hash of their path). Every fuzz job
+    claims a shard not processed by another job, and each shard has its own
+    cursor. (The number of shards should match the ``instances`` of the fuzz
+    job.)
 
     **Mandatory parameter of the fuzzer:**
 
-      - ``pattern``: shell-like pattern to the test files.
+      - ``pattern``: shell-like pattern to the test files. (As with
+        :meth:`pathlib.Path.glob`, wildcards match the names starting with a
+        dot, too, i.e., hidden files are listed and hidden directories are
+        walked.)
 
-    **Optional parameter of the fuzzer:**
+    **Optional parameters of the fuzzer:**
 
       - ``contents``: if it's true then the content of the files will be
         returned instead of their path (boolean value, True by default).
+      - ``shards``: number of the shards to split the files into (integer
+        number, 1 by default).
+      - ``state_dir``: directory to store the cursors and the claims of the
+        shards in. If not specified, it is placed in the work directory of
+        fuzzinator, i.e., the state is kept between the fuzz jobs of a session
+        only. (Use a separate directory for every fuzz job configuration.)
+      - ``mmap_threshold``: if specified, files of at least this size (with
+        optional K, M, or G suffix) are returned as memory-mapped buffers
+        instead of being read into memory (only if ``contents`` is true). The
+        SUT call has to accept bytes-like objects as tests (e.g., when
+        writing them to files with
+        :class:`fuzzinator.call.FileWriterDecorator`). The tests stored with
+        the found issues are converted to ``bytes``.
 
     **Example configuration snippet:**
 
@@ -47,28 +84,226 @@ class ListDirectory(Fuzzer):
             [fuzz.foo-with-oldbugs]
             sut=foo
             fuzzer=fuzzinator.fuzzer.ListDirectory
-            instances=1
-            batch=inf
+            instances=4
+            batch=10000
 
             [fuzz.foo-with-oldbugs.fuzzer]
             pattern=/home/alice/foo-old-bugs/**/*.js
+            shards=4
+            state_dir=/home/alice/foo-old-bugs-state
+            mmap_threshold=16M
     """
-    def __init__(self, *, pattern, contents=True, **kwargs):
+    def __init__(self, *, pattern, contents=True, shards=None, state_dir=None, mmap_threshold=None, work_dir=None, **kwargs):
         self.contents = as_bool(contents)
         pattern = as_path(pattern)
         path = Path(pattern)
-        anchor, pattern = ('.', pattern) if not path.anchor else (path.anchor, str(path.relative_to(path.anchor)))
-        self.tests = [str(fn) for fn in Path(anchor).glob(pattern) if os.path.isfile(str(fn))]
-        self.tests.sort(reverse=True)
+        anchor, pattern = ('', pattern) if not path.anchor else (path.anchor, str(path.relative_to(path.anchor)))
+        self.anchor = anchor
+        self.pattern = [part if part == '**' else re.compile(fnmatch.translate(os.path.normcase(part))) for part in Path(pattern).parts]
+        self.shards = int(shards) if shards else 1
+        if state_dir:
+            self.state_dir = as_path(state_dir)
+        elif work_dir:
+            # The parent of the work directory is the work directory of
+            # fuzzinator, shared by the fuzz jobs of the session.
+            key = hashlib.sha1(f'{anchor}\0{pattern}\0{self.shards}'.encode('utf-8', errors='surrogateescape')).hexdigest()[:16]
+            self.state_dir = os.path.join(os.path.dirname(work_dir), f'{self.__class__.__name__}-{key}')
+        else:
+            self.state_dir = None
+        self.mmap_threshold = as_size(mmap_threshold) if mmap_threshold else None
+
+        self.shard = None
+        self.claim = None
+        self.tests = None
+        # Paths of the listed files not processed yet, in the order of the
+        # tests.
+        self.unprocessed = deque()
+        self.exhausted = False
+
+    def __enter__(self):
+        self.shard = self._claim_shard()
+        if self.shard is None:
+            logger.warning('All the %d shard(s) of %s are processed by other fuzz jobs.', self.shards, self.state_dir)
+            self.tests = iter(())
+        else:
+            self.tests = self._walk(self.anchor, (), {0}, self._load_cursor())
+        self.unprocessed.clear()
+        self.exhausted = False
+        return self
+
+    def __exit__(self, *exc):
+        if self.shard is not None:
+            self._release_shard()
+            self.shard = None
+        self.tests = None
+        return False
 
     def __call__(self, *, index):
-        if not self.tests:
+        rel = next(self.tests, None)
+        if rel is None:
+            # Start from the beginning in the next fuzz job (once all the
+            # listed files are processed).
+            self.exhausted = True
+            if not self.unprocessed:
+                self._remove_cursor()
             return None
 
-        test = self.tests.pop()
+        self.unprocessed.append(rel)
+        test = os.path.join(self.anchor, *rel)
         logger.debug('index=%d, test=%r', index, test)
         if not self.contents:
             return test
 
         with open(test, 'rb') as f:
+            if self.mmap_threshold is not None:
+                size = os.fstat(f.fileno()).st_size
+                if size and size >= self.mmap_threshold:
+                    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
             return f.read()
+
+    def feedback(self, issue):
+        if self.unprocessed:
+            rel = self.unprocessed.popleft()
+            if self.exhausted and not self.unprocessed:
+                self._remove_cursor()
+            else:
+                self._save_cursor(rel)
+
+        if self.mmap_threshold is not None and issue and isinstance(issue.get('test'), mmap.mmap):
+            issue['test'] = issue['test'][:]
+
+    def _walk(self, dir_path, rel, positions, cursor):
+        # Yield the paths (relative to the anchor, as tuples of components) of
+        # the files matching the pattern, in depth-first order with sorted
+        # entries, which is the order of the tuples. positions are the
+        # indices of the pattern components that the entries of the directory
+        # are matched against. Subtrees before the cursor are skipped.
+        try:
+            with os.scandir(dir_path or '.') as it:
+                entries = sorted((entry.name, entry.is_dir(), entry.is_file()) for entry in it)
+        except OSError as e:
+            logger.debug('Cannot list %s: %s', dir_path, e)
+            return
+
+        # '**' matches zero or more directories.
+        positions = set(positions)
+        for pos in sorted(positions):
+            while pos < len(self.pattern) and self.pattern[pos] == '**':
+                pos += 1
+                positions.add(pos)
+
+        for name, is_dir, is_file in entries:
+            path = rel + (name,)
+            if cursor and path < cursor and (not is_dir or cursor[:len(path)] != path):
+                continue
+
+            normname = os.path.normcase(name)
+            matched = {pos + 1 for pos in positions if pos < len(self.pattern) and self.pattern[pos] != '**' and self.pattern[pos].match(normname)}
+            if is_file and len(self.pattern) in matched and (not cursor or path > cursor) and self._in_shard(path):
+                yield path
+            if is_dir:
+                subpositions = {pos for pos in positions if pos < len(self.pattern) and self.pattern[pos] == '**'}
+                subpositions.update(pos for pos in matched if pos < len(self.pattern))
+                if subpositions:
+                    yield from self._walk(os.path.join(dir_path, name), path, subpositions, cursor if cursor and cursor[:len(path)] == path else None)
+
+    def _in_shard(self, rel):
+        return self.shards == 1 or zlib.crc32(os.fsencode('/'.join(rel))) % self.shards == self.shard
+
+    def _claim_shard(self):
+        if not self.state_dir:
+            return 0 if self.shards == 1 else None
+
+        # Every fuzz job marks the shard it wants with a claim file of its
+        # own and gets the shard only if it sees no other live claim of the
+        # shard afterwards. Of two concurrent claims, at least the later one
+        # sees the earlier, so a shard is never given to two jobs (but both
+        # jobs may back off, thus they retry after a short random delay). The
+        # claims of terminated processes are ignored (and removed), so there
+        # is no stale lock to take over.
+        os.makedirs(self.state_dir, exist_ok=True)
+        for shard in range(self.shards):
+            claim = self._state_file(shard, f'claim-{os.getpid()}-{id(self)}')
+            for attempt in range(3):
+                if attempt:
+                    time.sleep(random.uniform(0, 0.01))
+                with open(claim, 'w'):
+                    pass
+                if not self._claimed_by_others(shard, claim):
+                    self.claim = claim
+                    return shard
+                os.remove(claim)
+        return None
+
+    def _release_shard(self):
+        if not self.claim:
+            return
+        try:
+            os.remove(self.claim)
+        except FileNotFoundError:
+            pass
+        self.claim = None
+
+    def _claimed_by_others(self, shard, claim):
+        prefix = os.path.basename(self._state_file(shard, 'claim-'))
+        claimed = False
+        for name in os.listdir(self.state_dir):
+            if not name.startswith(prefix) or name == os.path.basename(claim):
+                continue
+            try:
+                pid = int(name[len(prefix):].split('-')[0])
+            except ValueError:
+                continue
+            if self._pid_alive(pid):
+                claimed = True
+            else:
+                # The claim is left behind by a terminated process.
+                try:
+                    os.remove(os.path.join(self.state_dir, name))
+                except FileNotFoundError:
+                    pass
+        return claimed
+
+    @staticmethod
+    def _pid_alive(pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _state_file(self, shard, kind):
+        return os.path.join(self.state_dir, f'shard-{shard}.{kind}')
+
+    def _load_cursor(self):
+        if not self.state_dir:
+            return None
+        try:
+            with open(self._state_file(self.shard, 'cursor')) as f:
+                cursor = tuple(json.load(f))
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            logger.warning('Ignoring invalid cursor of shard %d in %s: %s', self.shard, self.state_dir, e)
+            return None
+        logger.debug('Resuming shard %d after %r', self.shard, cursor)
+        return cursor
+
+    def _save_cursor(self, cursor):
+        if not self.state_dir or cursor is None:
+            return
+        # Replace the cursor atomically to never leave a truncated file behind.
+        cursor_file = self._state_file(self.shard, 'cursor')
+        with open(cursor_file + '.tmp', 'w') as f:
+            json.dump(list(cursor), f)
+        os.replace(cursor_file + '.tmp', cursor_file)
+
+    def _remove_cursor(self):
+        if not self.state_dir or self.shard is None:
+            return
+        try:
+            os.remove(self._state_file(self.shard, 'cursor'))
+        except FileNotFoundError:
+            pass
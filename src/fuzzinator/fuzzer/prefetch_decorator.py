@@ -0,0 +1,211 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import logging
+import queue
+
+from threading import current_thread, Event, Lock, Thread
+
+from .fuzzer_decorator import FuzzerDecorator
+
+logger = logging.getLogger(__name__)
+
+
+class _PrefetchedAttribute:
+    # Attribute of the fuzzer protocol (``test`` and ``index``) that has
+    # separate values in the producer thread and in the thread(s) of the fuzz
+    # job. The producer thread sees the values set by the job thread until it
+    # sets its own. The job thread sees the values belonging to the test it has
+    # received last.
+
+    producer_key = '_prefetch_producer_attrs'
+    consumer_key = '_prefetch_attrs'
+
+    def __init__(self, name):
+        self.name = name
+
+    @staticmethod
+    def in_producer(obj):
+        return obj.__dict__.get('_prefetch_thread') is current_thread()
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        keys = [self.producer_key, self.consumer_key] if self.in_producer(obj) else [self.consumer_key]
+        for key in keys:
+            values = obj.__dict__.get(key, {})
+            if self.name in values:
+                return values[self.name]
+        raise AttributeError(self.name)
+
+    def __set__(self, obj, value):
+        key = self.producer_key if self.in_producer(obj) else self.consumer_key
+        obj.__dict__.setdefault(key, {})[self.name] = value
+
+    def __delete__(self, obj):
+        key = self.producer_key if self.in_producer(obj) else self.consumer_key
+        try:
+            del obj.__dict__.get(key, {})[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+
+class PrefetchDecorator(FuzzerDecorator):
+    """
+    Decorator for fuzzers to generate tests in the background, i.e., while the
+    SUT is executing the previous tests. The decorated fuzzer is invoked in a
+    producer thread, which keeps a bounded queue of ready tests filled.
+    (Fuzzers that run subprocesses or do I/O benefit the most, but the SUT
+    calls of the fuzz job mostly wait for their subprocesses, too, so
+    generators written in Python can run in parallel with the SUT as well.)
+
+    The decorated fuzzer is called with the same indices as it would be
+    called by the fuzz job (including the jumps of fuzzers maintaining their
+    own ``index``), and the ``test`` and ``index`` attributes of the fuzzer
+    are kept separate for the producer thread and for the fuzz job, i.e., the
+    fuzz job sees the values that belong to the test it has received. If the
+    decorated fuzzer is exhausted, the decorator returns ``None`` after the
+    queue is emptied. If the fuzzer has a ``feedback`` method, the results of
+    the tests are forwarded to it in order, but the feedback lags behind the
+    generation by up to ``size`` tests.
+
+    The decorator should be applied before any decorator that reuses its
+    outputs (e.g., :class:`fuzzinator.fuzzer.FileWriterDecorator` with
+    in-memory storage), since prefetched tests may get overwritten otherwise.
+
+    The decorated fuzzer exposes statistics of the queue in its
+    ``prefetch_stats`` attribute, which is reported to the listeners by fuzz
+    jobs via
+    :meth:`fuzzinator.listener.EventListener.on_fuzzer_prefetch_updated`.
+
+    **Optional parameter of the decorator:**
+
+      - ``size``: maximum number of tests generated in advance (integer
+        number, 16 by default).
+
+    **Example configuration snippet:**
+
+        .. code-block:: ini
+
+            [sut.foo]
+            # see fuzzinator.call.*
+
+            [fuzz.foo-with-bar]
+            sut=foo
+            fuzzer=fuzzinator.fuzzer.SubprocessRunner
+            fuzzer.decorate(0)=fuzzinator.fuzzer.PrefetchDecorator
+            batch=inf
+
+            [fuzz.foo-with-bar.fuzzer]
+            command=barfuzzer -n 50 -o {work_dir}
+
+            [fuzz.foo-with-bar.fuzzer.decorate(0)]
+            size=100
+    """
+
+    def __init__(self, *, size=None, **kwargs):
+        self.size = int(size) if size else 16
+
+    def init(self, cls, obj, **kwargs):
+        super(cls, obj).__init__(**kwargs)
+        obj._prefetch_thread = None
+        obj._prefetch_queue = None
+        obj._prefetch_stop = None
+        obj._prefetch_lock = Lock()
+        obj._prefetch_exhausted = False
+        obj.prefetch_stats = {}
+
+    def enter(self, cls, obj):
+        result = super(cls, obj).__enter__()
+        obj._prefetch_queue = queue.Queue(maxsize=self.size)
+        obj._prefetch_stop = Event()
+        obj._prefetch_exhausted = False
+        # Requests: number of tests taken from the queue; depth: sum of the
+        # queue depths seen by the requests; empty/full: number of times the
+        # fuzz job/the producer had to wait for the other side.
+        obj.prefetch_stats = {'size': self.size, 'requests': 0, 'depth': 0.0, 'empty': 0, 'full': 0}
+        obj._prefetch_depth_sum = 0
+        obj._prefetch_thread = Thread(target=self._produce, args=(cls, obj), daemon=True)
+        obj._prefetch_thread.start()
+        return result
+
+    def exit(self, cls, obj, *exc):
+        thread = obj._prefetch_thread
+        if thread:
+            obj._prefetch_stop.set()
+            # Unblock the producer if it is waiting for free space in the
+            # queue, and wait for the ongoing test generation to finish.
+            while thread.is_alive():
+                try:
+                    obj._prefetch_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            obj._prefetch_thread = None
+        return super(cls, obj).__exit__(*exc)
+
+    def call(self, cls, obj, *, index):
+        if obj._prefetch_exhausted or not obj._prefetch_thread:
+            return None
+
+        stats = obj.prefetch_stats
+        depth = obj._prefetch_queue.qsize()
+        if not depth:
+            stats['empty'] += 1
+        obj._prefetch_depth_sum += depth
+        stats['requests'] += 1
+        stats['depth'] = obj._prefetch_depth_sum / stats['requests']
+
+        kind, value, attrs = obj._prefetch_queue.get()
+        if kind == 'error':
+            obj._prefetch_exhausted = True
+            raise value
+        if value is None:
+            obj._prefetch_exhausted = True
+
+        obj.__dict__.setdefault(_PrefetchedAttribute.consumer_key, {}).update(attrs)
+        return value
+
+    def feedback(self, cls, obj, issue):
+        # Feedback must not interleave with the generation of a test.
+        with obj._prefetch_lock:
+            super(cls, obj).feedback(issue)
+
+    def _produce(self, cls, obj):
+        index = 0
+        while not obj._prefetch_stop.is_set():
+            try:
+                with obj._prefetch_lock:
+                    test = super(cls, obj).__call__(index=index)
+                    attrs = dict(obj.__dict__.get(_PrefetchedAttribute.producer_key, {}))
+            except Exception as e:
+                logger.debug('Exception in prefetching fuzzer.', exc_info=e)
+                item = ('error', e, {})
+            else:
+                item = ('test', test, attrs)
+                # Mimic the index bookkeeping of fuzz jobs.
+                index = attrs['index'] if attrs.get('index', index) > index else index + 1
+
+            if obj._prefetch_queue.full():
+                obj.prefetch_stats['full'] += 1
+            obj._prefetch_queue.put(item)
+            if item[0] == 'error' or item[1] is None:
+                break
+
+    def __call__(self, fuzzer_class):
+        decorator = self
+        decorated_class = super().__call__(fuzzer_class)
+
+        class PrefetchingFuzzer(decorated_class):
+
+            test = _PrefetchedAttribute('test')
+            index = _PrefetchedAttribute('index')
+
+            if hasattr(fuzzer_class, 'feedback'):
+                def feedback(self, issue):
+                    decorator.feedback(decorated_class, self, issue)
+
+        return PrefetchingFuzzer
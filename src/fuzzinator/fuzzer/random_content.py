@@ -1,4 +1,4 @@
-# Copyright (c) 2016-2021 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
@@ -8,9 +8,55 @@
 import random
 import string
 
+from functools import lru_cache
+
 from .fuzzer import Fuzzer
 
 
+@lru_cache(maxsize=None)
+def _translation(alphabet):
+    # Map the random bytes to the alphabet uniformly: the bytes above the
+    # largest multiple of the alphabet size are rejected (deleted).
+    limit = 256 - 256 % len(alphabet)
+    table = bytes(alphabet[b % len(alphabet)] if b < limit else 0 for b in range(256))
+    return table, bytes(range(limit, 256)), limit
+
+
+def random_bytes(rng, length, alphabet):
+    """
+    Generate random bytes uniformly from an alphabet, using bulk operations
+    only (i.e., no Python-level work per byte).
+
+    :param random.Random rng: the random number generator.
+    :param int length: the number of bytes to generate.
+    :param bytes alphabet: the allowed byte values (at most 256).
+    :return: the generated bytes.
+    :rtype: bytes
+    """
+    table, rejected, limit = _translation(bytes(alphabet))
+    result = b''
+    while len(result) < length:
+        # Generate a bit more than expected to be needed to make another
+        # round (because of the rejected bytes) unlikely.
+        missing = length - len(result)
+        result += rng.randbytes(missing * 256 // limit + 16).translate(table, rejected)
+    return result[:length]
+
+
+def seeded_random(seed, index):
+    """
+    Create the random number generator for a test. If a seed is given, the
+    generator depends only on the seed and the index of the test, which makes
+    the test reproducible on its own.
+
+    :param seed: the seed of the fuzzer (``None`` for a non-reproducible
+        generator).
+    :param int index: the index of the test.
+    :rtype: random.Random
+    """
+    return random.Random(f'{seed}:{index}' if seed is not None else None)
+
+
 class RandomContent(Fuzzer):
     """
     Example fuzzer to generate strings of random length from random ASCII
@@ -22,6 +68,9 @@ class RandomContent(Fuzzer):
         number, 1 by default)
       - ``max_length``: maximum length of the string to generate (integer
         number, 1 by default)
+      - ``seed``: seed of the random number generator, which makes the
+        generated tests reproducible (the test generated for an index depends
+        only on the seed and the index; default: not reproducible)
 
     **Example configuration snippet:**
 
@@ -40,10 +89,13 @@ class RandomContent(Fuzzer):
             max_length=1000
     """
 
-    def __init__(self, *, min_length=1, max_length=1, **kwargs):
+    alphabet = (string.ascii_uppercase + string.digits).encode('ascii')
+
+    def __init__(self, *, min_length=1, max_length=1, seed=None, **kwargs):
         self.min_length = int(min_length)
         self.max_length = int(max_length)
+        self.seed = seed
 
     def __call__(self, *, index):
-        return ''.join(random.SystemRandom().choice(string.ascii_uppercase + string.digits)
-                       for _ in range(random.randint(self.min_length, self.max_length))).encode('utf-8', errors='ignore')
+        rng = seeded_random(self.seed, index)
+        return random_bytes(rng, rng.randint(self.min_length, self.max_length), self.alphabet)
@@ -1,4 +1,4 @@
-# Copyright (c) 2016-2022 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
@@ -8,9 +8,17 @@
 import logging
 import os
 import shutil
+import signal
 import subprocess
+import tempfile
+import time
+
+from collections import deque
 
 from ..config import as_bool, as_dict, as_pargs, as_path, decode
+from ..controller import Controller
+from ..resource_limits import ResourceLimits
+from .directory_watcher import DirectoryWatcher
 from .fuzzer import Fuzzer
 
 logger = logging.getLogger(__name__)
@@ -23,6 +31,16 @@ class SubprocessRunner(Fuzzer):
     invoked as a subprocess, and once it has finished, the contents of the
     generated files are returned one by one.
 
+    In streaming mode, the executable runs in the background, and the
+    generated files are returned as soon as they are complete (see
+    :class:`fuzzinator.fuzzer.DirectoryWatcher`), i.e., test generation and
+    SUT execution are pipelined. The returned files are removed once the
+    executable has completed a later file or has terminated (files may still
+    be touched after being closed, e.g., by ``shutil.copy``), and the
+    executable is suspended (with ``SIGSTOP``)
+    while ``max_pending`` generated files are waiting to be returned, which
+    bounds the disk usage of the fuzzer.
+
     **Mandatory parameters of the fuzzer:**
 
       - ``command``: string to pass to the child shell as a command to run,
@@ -40,10 +58,18 @@ class SubprocessRunner(Fuzzer):
         update the environment with (all occurrences of ``{work_dir}`` in the
         values are replaced by the path to the temporary working directory
         unique to this fuzzer instance)..
-      - ``timeout``: run subprocess with timeout.
+      - ``timeout``: run subprocess with timeout (in streaming mode, the time
+        while the subprocess is suspended does not count).
       - ``contents``: if it's true then the content of the files will be
         returned instead of their path (boolean value, True by default).
       - ``encoding``: stdout and stderr encoding (default: autodetect).
+      - ``streaming``: if it's true then the tests are returned while the
+        subprocess is still running (boolean value, False by default).
+      - ``max_pending``: maximum number of generated files waiting to be
+        returned in streaming mode (integer number, 100 by default).
+      - ``memory_limit``, ``cpu_time_limit``, ``max_procs``,
+        ``max_file_size``, ``cgroup``: resource limits of the fuzzer process
+        (see :class:`fuzzinator.ResourceLimits`).
 
     **Example configuration snippet:**
 
@@ -59,9 +85,18 @@ class SubprocessRunner(Fuzzer):
 
             [fuzz.foo-with-bar.fuzzer]
             command=barfuzzer -n ${fuzz.foo-with-bar:batch} -o {work_dir}
+
+            [fuzz.foo-with-baz]
+            sut=foo
+            fuzzer=fuzzinator.fuzzer.SubprocessRunner
+            batch=inf
+
+            [fuzz.foo-with-baz.fuzzer]
+            command=bazfuzzer -n 100000 -o {work_dir}
+            streaming=True
     """
 
-    def __init__(self, *, command, cwd=None, env=None, timeout=None, contents=True, encoding=None, work_dir, **kwargs):
+    def __init__(self, *, command, cwd=None, env=None, timeout=None, contents=True, encoding=None, streaming=None, max_pending=None, memory_limit=None, cpu_time_limit=None, max_procs=None, max_file_size=None, cgroup=None, work_dir, **kwargs):
         if 'outdir' in kwargs:
             logger.warning('outdir parameter of fuzzinator.fuzzer.SubprocessRunner is deprecated')
 
@@ -71,38 +106,61 @@ class SubprocessRunner(Fuzzer):
         self.timeout = int(timeout) if timeout else None
         self.contents = as_bool(contents)
         self.encoding = encoding
+        self.streaming = as_bool(streaming)
+        self.max_pending = int(max_pending) if max_pending else 100
+        self.limits = ResourceLimits(memory_limit=memory_limit, cpu_time_limit=cpu_time_limit, max_procs=max_procs, max_file_size=max_file_size, cgroup=cgroup)
 
         self.work_dir = work_dir
         self.tests = []
 
+        self.proc = None
+        self.outputs = None
+        self.watcher = None
+        self.consumed = []
+        self.last_reported = None
+        self.suspended = None
+        self.run_time = 0
+        self.start_time = None
+
     def __enter__(self):
+        if self.streaming:
+            self._start()
+            return self
+
         os.makedirs(self.work_dir, exist_ok=True)
         try:
-            subprocess.run(self.command,
-                           cwd=self.cwd,
-                           env=self.env,
-                           stdout=subprocess.PIPE,
-                           stderr=subprocess.PIPE,
-                           timeout=self.timeout,
-                           check=True)
+            self.limits.run(self.command,
+                            cwd=self.cwd,
+                            env=self.env,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE,
+                            timeout=self.timeout,
+                            check=True)
         except subprocess.TimeoutExpired as e:
             logger.warning('Fuzzer execution timeout (%ds) expired.\n%s\n%s',
                            e.timeout,
                            decode(e.stdout or b'', self.encoding),
                            decode(e.stderr or b'', self.encoding))
         except subprocess.CalledProcessError as e:
-            logger.warning('Fuzzer command returned with nonzero exit code (%d).\n%s\n%s',
+            resource_limit = self.limits.classify(e.returncode)
+            logger.warning('Fuzzer command returned with nonzero exit code (%d%s).\n%s\n%s',
                            e.returncode,
+                           f', {resource_limit}' if resource_limit else '',
                            decode(e.stdout, self.encoding),
                            decode(e.stderr, self.encoding))
         self.tests = [os.path.join(self.work_dir, test) for test in os.listdir(self.work_dir)]
         return self
 
     def __exit__(self, *exc):
+        if self.streaming:
+            self._stop()
         shutil.rmtree(self.work_dir, ignore_errors=True)
         return False
 
     def __call__(self, *, index):
+        if self.streaming:
+            return self._next_streamed()
+
         if not self.tests:
             return None
 
@@ -112,3 +170,120 @@ class SubprocessRunner(Fuzzer):
 
         with open(test, 'rb') as f:
             return f.read()
+
+    def _start(self):
+        os.makedirs(self.work_dir, exist_ok=True)
+        # Watch the directory before the subprocess could write into it.
+        self.watcher = DirectoryWatcher(self.work_dir)
+        self.tests = deque()
+        self.consumed = []
+        self.last_reported = None
+        self._add_tests(self.watcher.wait(0))
+        # The output is collected outside the working directory, and in files
+        # (not pipes) so that the subprocess cannot block on it.
+        self.outputs = {'stdout': tempfile.TemporaryFile(), 'stderr': tempfile.TemporaryFile()}
+        self.proc = self.limits.popen(self.command,
+                                      cwd=self.cwd,
+                                      env=self.env,
+                                      stdout=self.outputs['stdout'],
+                                      stderr=self.outputs['stderr'],
+                                      start_new_session=True)
+        self.suspended = False
+        self.run_time = 0
+        self.start_time = time.time()
+
+    def _stop(self):
+        if self.proc:
+            if self.proc.poll() is None:
+                Controller.kill_process_group(self.proc)
+            self.proc = None
+        if self.watcher:
+            self.watcher.close()
+            self.watcher = None
+        for output in (self.outputs or {}).values():
+            output.close()
+        self.outputs = None
+
+    def _next_streamed(self):
+        while not self.tests and self.proc:
+            if self.proc.poll() is not None:
+                self._finish()
+                break
+
+            if self.timeout and self.run_time + time.time() - self.start_time > self.timeout:
+                logger.warning('Fuzzer execution timeout (%ds) expired.\n%s\n%s', self.timeout, *self._read_outputs())
+                Controller.kill_process_group(self.proc)
+                self._finish()
+                break
+
+            self._add_tests(self.watcher.wait(0.1))
+            self._throttle()
+
+        if not self.tests:
+            return None
+
+        test = self.tests.popleft()
+        self._throttle()
+        # The previously returned files are not in use by the SUT anymore.
+        self._remove_consumed()
+        self.consumed.append(test)
+        if not self.contents:
+            return test
+
+        with open(test, 'rb') as f:
+            return f.read()
+
+    def _add_tests(self, tests):
+        # Files may be reported again if they are rewritten after removal.
+        tests = [test for test in tests if os.path.exists(test)]
+        if tests:
+            self.tests.extend(tests)
+            self.last_reported = tests[-1]
+            self._remove_consumed()
+
+    def _remove_consumed(self):
+        # Keep the consumed files that the subprocess may still be writing.
+        keep = [self.last_reported] if self.proc and self.last_reported in self.consumed else []
+        for test in self.consumed:
+            if test not in keep:
+                try:
+                    os.remove(test)
+                except OSError:
+                    pass
+                self.watcher.forget(test)
+        self.consumed = keep
+
+    def _throttle(self):
+        # Suspend the subprocess if enough tests are waiting, and resume it
+        # when half of them are consumed.
+        if not self.proc:
+            return
+        if not self.suspended and len(self.tests) >= self.max_pending:
+            os.killpg(self.proc.pid, signal.SIGSTOP)
+            self.run_time += time.time() - self.start_time
+            self.suspended = True
+        elif self.suspended and len(self.tests) <= self.max_pending // 2:
+            os.killpg(self.proc.pid, signal.SIGCONT)
+            self.start_time = time.time()
+            self.suspended = False
+
+    def _finish(self):
+        # The subprocess has terminated: all the files it has written are
+        # complete.
+        self._add_tests(self.watcher.flush())
+        if self.proc.returncode:
+            resource_limit = self.limits.classify(self.proc.returncode)
+            if self.proc.returncode != -signal.SIGKILL:
+                logger.warning('Fuzzer command returned with nonzero exit code (%d%s).\n%s\n%s',
+                               self.proc.returncode,
+                               f', {resource_limit}' if resource_limit else '',
+                               *self._read_outputs())
+        self.proc = None
+        self._remove_consumed()
+
+    def _read_outputs(self):
+        outputs = []
+        for output in self.outputs.values():
+            output.seek(0)
+            outputs.append(decode(output.read(), self.encoding))
+        return outputs
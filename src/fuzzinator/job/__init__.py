@@ -1,10 +1,11 @@
-# Copyright (c) 2018-2020 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2018-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
 # This file may not be copied, modified, or distributed except
 # according to those terms.
 
+from .enrich_job import EnrichJob
 from .fuzz_job import FuzzJob
 from .reduce_job import ReduceJob
 from .update_job import UpdateJob
@@ -1,4 +1,4 @@
-# Copyright (c) 2016-2023 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
@@ -21,6 +21,9 @@ class CallJob:
         self.fuzzer_name = fuzzer_name
         self.db = db
         self.listener = listener
+        # Callback to request the enrichment of a stored issue (see option
+        # enrich_call of SUTs), set by the controller.
+        self.enrich_callback = None
 
     def add_issue(self, issue, new_issues):
         test = issue['test']
@@ -43,6 +46,27 @@ class CallJob:
         else:
             self.listener.on_issue_updated(job_id=self.id, issue=issue)
 
+        # Request the enrichment of the stored issue right away if it has not
+        # been enriched yet, i.e., if the issue is new, it was stored without
+        # enrichment, or its enrichment is still pending (the stored properties
+        # have been merged into issue). The enrichment of a pending issue may
+        # have been requested by a job that got cancelled or crashed, while
+        # duplicate requests of queued or running enrichments are dropped by
+        # the controller.
+        if '_id' in issue and issue.get('enriched') is None and self.config.has_option(f'sut.{self.sut_name}', 'enrich_call'):
+            if 'enriched' not in issue:
+                self.db.update_issue_by_oid(issue['_id'], {'enriched': None})
+                issue['enriched'] = None
+            if self.enrich_callback:
+                self.enrich_callback(issue=issue)
+
+    # Report the statistics collected by the decorators of a SUT call (if any)
+    def report_call_stats(self, sut_call):
+        if hasattr(sut_call, 'cache_hits'):
+            self.listener.on_call_cache_updated(job_id=self.id, sut=self.sut_name, hits=sut_call.cache_hits, misses=sut_call.cache_misses)
+        if getattr(sut_call, 'timeout_stats', None):
+            self.listener.on_call_timeout_updated(job_id=self.id, sut=self.sut_name, stats=dict(sut_call.timeout_stats))
+
     # Ensure that issue has an id, and if not, adds one
     def ensure_id(self, issue):
         if 'id' not in issue or not issue['id']:
@@ -0,0 +1,57 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+from datetime import datetime
+
+from ..config import config_get_object
+from .call_job import CallJob
+
+
+class EnrichJob(CallJob):
+    """
+    Class for running issue enrichment jobs, i.e., for extending stored issues
+    with properties that are too expensive to collect at every SUT call (e.g.,
+    backtraces).
+    """
+
+    def __init__(self, id, config, issue, db, listener):
+        sut_name = issue['sut']
+        sut_section = f'sut.{sut_name}'
+        fuzzer_name = issue['fuzzer']
+        subconfig_id = issue['subconfig'].get('subconfig') if isinstance(issue.get('subconfig'), dict) else None
+        super().__init__(id, config, subconfig_id, sut_name, fuzzer_name, db, listener)
+
+        self.issue = issue
+        capacity = int(config.get('fuzzinator', 'cost_budget'))
+        self.cost = min(int(config.get(sut_section, 'enrich_cost', fallback=config.get(sut_section, 'cost', fallback=1))), capacity)
+        self.priority = int(config.get(sut_section, 'enrich_priority', fallback=-1))
+
+    def run(self):
+        # The issue may have been enriched by another job since this job was
+        # queued (or may have been removed).
+        issue = self.db.find_issue_by_oid(self.issue['_id'])
+        if not issue or issue.get('enriched'):
+            return []
+
+        sut_call = config_get_object(self.config, f'sut.{self.sut_name}', 'enrich_call')
+        with sut_call:
+            enriched_issue = sut_call(**issue)
+
+        if not enriched_issue:
+            # Mark the failure to avoid requesting the enrichment again at
+            # every duplicate of the issue.
+            self.db.update_issue_by_oid(issue['_id'], {'enriched': False})
+            self.listener.warning(job_id=self.id, msg=f'Enrichment of {issue["id"]} failed: the issue did not reproduce.')
+            return []
+
+        # Only add properties, never overwrite the stored ones.
+        enrichment = {key: value for key, value in enriched_issue.items() if key not in issue}
+        enrichment['enriched'] = datetime.utcnow()
+        self.db.update_issue_by_oid(issue['_id'], enrichment)
+        issue.update(enrichment)
+        self.listener.on_issue_updated(job_id=self.id, issue=issue)
+        return []
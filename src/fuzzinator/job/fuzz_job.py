@@ -1,4 +1,4 @@
-# Copyright (c) 2016-2023 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
@@ -8,6 +8,10 @@
 import signal
 import time
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
 from ..config import config_get_object
 from .call_job import CallJob
 
@@ -23,7 +27,11 @@ class FuzzJob(CallJob):
         super().__init__(id, config, subconfig_id, sut_name, fuzzer_name, db, listener)
 
         capacity = int(config.get('fuzzinator', 'cost_budget'))
-        self.cost = min(int(config.get(f'sut.{sut_name}', 'cost', fallback=1)), capacity)
+        cost = min(int(config.get(f'sut.{sut_name}', 'cost', fallback=1)), capacity)
+        # Every test in flight costs as much as a sequential job.
+        self.concurrency = max(1, min(int(config.get(f'sut.{sut_name}', 'fuzz_concurrency', fallback=1)), capacity // max(cost, 1)))
+        self.cost = cost * self.concurrency
+        self.priority = int(config.get(f'sut.{sut_name}', 'fuzz_priority', fallback=0))
         self.batch = float(config.get(fuzz_section, 'batch', fallback=1))
         self.refresh = float(config.get(fuzz_section, 'refresh', fallback=self.batch))
 
@@ -41,58 +49,159 @@ class FuzzJob(CallJob):
         issue_count = 0
         start_time = time.time()
         stat_updated = 0
+        generated = 0
         new_issues = []
 
+        def _next_test():
+            # Generate the next test. Returns the test to call the SUT with,
+            # the test to store (check if fuzzer has its own test), and the
+            # index after the test, or None if there are no more tests.
+            nonlocal generated
+            if generated >= self.batch:
+                return None
+
+            test = fuzzer(index=generated)
+            if test is None:
+                self.batch = generated
+                return None
+
+            # Check if fuzzer maintains its own index.
+            if hasattr(fuzzer, 'index') and fuzzer.index > generated:
+                generated = fuzzer.index
+            else:
+                generated += 1
+
+            return test, fuzzer.test if hasattr(fuzzer, 'test') else test, generated
+
+        def _record(test, test_index, issue):
+            # Process the result of the SUT call with a test. Results must be
+            # processed in the order of the tests.
+            nonlocal index, issue_count, start_time, stat_updated
+            index = test_index
+
+            if issue and test is None:
+                self.batch = index
+                self.listener.warning(job_id=self.id, msg=f'{self.sut_name} crashed before the first test.')
+                return
+
+            if issue is not None and ('test' not in issue or not issue['test']):
+                issue['test'] = test
+
+            if hasattr(fuzzer, 'feedback'):
+                fuzzer.feedback(issue)
+
+            if issue:
+                issue_count += 1
+
+            if index - stat_updated >= self.refresh:
+                self.listener.on_job_progressed(job_id=self.id, progress=index)
+                self.db.update_stat(self.sut_name, self.fuzzer_name, self.subconfig_id, index - stat_updated, issue_count, time.time() - start_time)
+                self.listener.on_stats_updated()
+                self.report_fuzzer_stats(fuzzer)
+                issue_count = 0
+                start_time = time.time()
+                stat_updated = index
+
+            if issue:
+                self.add_issue(issue, new_issues=new_issues)
+
+        # Fuzzers that may block for long (e.g., AFLRunner) report their
+        # statistics while waiting.
+        if hasattr(fuzzer, 'stats_callback'):
+            fuzzer.stats_callback = lambda: self.report_fuzzer_stats(fuzzer)
+
         self.listener.on_stats_updated()
         with fuzzer:
-            while index < self.batch:
-                sut_call = config_get_object(self.config, f'sut.{self.sut_name}', 'call')
-                with sut_call:
-                    while index < self.batch:
-                        test = fuzzer(index=index)
-                        if test is None:
-                            self.batch = index
-                            break
-
-                        issue = sut_call(test=test)
-
-                        # Check if fuzzer maintains its own index.
-                        if hasattr(fuzzer, 'index') and fuzzer.index > index:
-                            index = fuzzer.index
-                        else:
-                            index += 1
-
-                        # Check if fuzzer has its own test.
-                        if hasattr(fuzzer, 'test'):
-                            test = fuzzer.test
-
-                        if issue and test is None:
-                            self.batch = index
-                            self.listener.warning(job_id=self.id, msg=f'{self.sut_name} crashed before the first test.')
-                            break
-
-                        if issue is not None and ('test' not in issue or not issue['test']):
-                            issue['test'] = test
-
-                        if hasattr(fuzzer, 'feedback'):
-                            fuzzer.feedback(issue)
-
-                        if issue:
-                            issue_count += 1
-
-                        if index - stat_updated >= self.refresh:
-                            self.listener.on_job_progressed(job_id=self.id, progress=index)
-                            self.db.update_stat(self.sut_name, self.fuzzer_name, self.subconfig_id, index - stat_updated, issue_count, time.time() - start_time)
-                            self.listener.on_stats_updated()
-                            issue_count = 0
-                            start_time = time.time()
-                            stat_updated = index
-
-                        if issue:
-                            self.add_issue(issue, new_issues=new_issues)
-                            break
+            if self.concurrency > 1:
+                self._run_concurrently(_next_test, _record)
+            else:
+                # Tests generated but not executed by a SUT call (because an
+                # earlier test of the same batch triggered an issue) are
+                # executed by the next SUT call, as not all fuzzers can
+                # generate the same tests again.
+                pending = deque()
+                while index < self.batch:
+                    sut_call = config_get_object(self.config, f'sut.{self.sut_name}', 'call')
+                    with sut_call:
+                        # SUT calls that can execute multiple tests at once get
+                        # the tests in batches.
+                        batch_size = sut_call.batch_size if hasattr(sut_call, 'call_batch') else 1
+
+                        while index < self.batch:
+                            tests = [pending.popleft() for _ in range(min(len(pending), batch_size))]
+                            while len(tests) < batch_size:
+                                test = _next_test()
+                                if test is None:
+                                    break
+                                tests.append(test)
+
+                            if not tests:
+                                break
+
+                            if len(tests) > 1:
+                                issues = sut_call.call_batch(tests=[call_test for call_test, _, _ in tests])
+                            else:
+                                issues = [sut_call(test=tests[0][0])]
+
+                            # Only the tests up to the first issue count as
+                            # executed.
+                            issue = None
+                            executed = 0
+                            for (_, test, test_index), issue in zip(tests, issues):
+                                _record(test, test_index, issue)
+                                executed += 1
+                                if issue:
+                                    break
+                            pending.extendleft(reversed(tests[executed:]))
+
+                            if issue:
+                                break
+
+                    self.report_call_stats(sut_call)
 
         # Update statistics.
         self.db.update_stat(self.sut_name, self.fuzzer_name, self.subconfig_id, index - stat_updated, issue_count, time.time() - start_time)
         self.listener.on_stats_updated()
+        self.report_fuzzer_stats(fuzzer)
         return new_issues
+
+    def report_fuzzer_stats(self, fuzzer):
+        if getattr(fuzzer, 'prefetch_stats', None):
+            self.listener.on_fuzzer_prefetch_updated(job_id=self.id, fuzzer=self.fuzzer_name, stats=dict(fuzzer.prefetch_stats))
+        if getattr(fuzzer, 'fuzzer_stats', None):
+            self.listener.on_fuzzer_stats_updated(job_id=self.id, fuzzer=self.fuzzer_name, stats=dict(fuzzer.fuzzer_stats))
+
+    def _run_concurrently(self, next_test, record):
+        # Keep up to self.concurrency tests in flight, each on its own SUT call
+        # object (in a worker thread, as SUT calls mostly wait for their
+        # subprocesses). Tests are generated and their results are recorded in
+        # order by this thread only. The SUT call objects are kept until the
+        # end of the job, even if they report issues.
+        idle_calls = []
+        in_flight = deque()
+
+        with ExitStack() as calls:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                try:
+                    while True:
+                        while len(in_flight) < self.concurrency:
+                            test = next_test()
+                            if test is None:
+                                break
+
+                            if not idle_calls:
+                                sut_call = config_get_object(self.config, f'sut.{self.sut_name}', 'call')
+                                calls.callback(self.report_call_stats, sut_call)
+                                idle_calls.append(calls.enter_context(sut_call))
+                            sut_call = idle_calls.pop()
+                            in_flight.append((executor.submit(sut_call, test=test[0]), sut_call) + test[1:])
+
+                        if not in_flight:
+                            break
+
+                        future, sut_call, test, test_index = in_flight.popleft()
+                        record(test, test_index, future.result())
+                        idle_calls.append(sut_call)
+                finally:
+                    for future, *_ in in_flight:
+                        future.cancel()
@@ -1,4 +1,4 @@
-# Copyright (c) 2016-2023 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
@@ -27,13 +27,16 @@ class ReduceJob(CallJob):
         self.issue = issue
         capacity = int(config.get('fuzzinator', 'cost_budget'))
         self.cost = min(int(config.get(sut_section, 'reduce_cost', fallback=config.get(sut_section, 'validate_cost', fallback=config.get(sut_section, 'cost', fallback=1)))), capacity)
+        self.priority = int(config.get(sut_section, 'reduce_priority', fallback=2))
 
     def run(self):
-        valid, issues = ValidateJob(id=self.id,
-                                    config=self.config,
-                                    issue=self.issue,
-                                    db=self.db,
-                                    listener=self.listener).validate()
+        validate_job = ValidateJob(id=self.id,
+                                   config=self.config,
+                                   issue=self.issue,
+                                   db=self.db,
+                                   listener=self.listener)
+        validate_job.enrich_callback = self.enrich_callback
+        valid, issues = validate_job.validate()
         if not valid:
             return issues
 
@@ -44,6 +47,7 @@ class ReduceJob(CallJob):
         reduced_src, new_issues = reduce(sut_call=sut_call,
                                          issue=self.issue,
                                          on_job_progressed=partial(self.listener.on_job_progressed, job_id=self.id))
+        self.report_call_stats(sut_call)
 
         if reduced_src is None:
             self.listener.warning(job_id=self.id, msg=f'Reduce of {self.issue["id"]} failed.')
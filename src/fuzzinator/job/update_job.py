@@ -5,7 +5,10 @@
 # This file may not be copied, modified, or distributed except
 # according to those terms.
 
-from ..config import config_get_object
+import os
+import time
+
+from ..config import as_path, config_get_object
 
 
 class UpdateJob:
@@ -18,8 +21,17 @@ class UpdateJob:
         self.sut_name = sut_name
         capacity = int(config.get('fuzzinator', 'cost_budget'))
         self.cost = min(int(config.get(f'sut.{sut_name}', 'update_cost', fallback=config.get('fuzzinator', 'cost_budget'))), capacity)
+        self.priority = int(config.get(f'sut.{sut_name}', 'update_priority', fallback=3))
 
     def run(self):
         update = config_get_object(self.config, f'sut.{self.sut_name}', 'update')
         update()
+
+        # Mark the completion of the update (e.g., for result caches).
+        update_stamp = self.config.get(f'sut.{self.sut_name}', 'update_stamp', fallback=None)
+        if update_stamp:
+            update_stamp = as_path(update_stamp)
+            os.makedirs(os.path.dirname(update_stamp) or '.', exist_ok=True)
+            with open(update_stamp, 'w') as f:
+                f.write(f'{time.time()}\n')
         return []
@@ -26,6 +26,7 @@ class ValidateJob(CallJob):
         self.issue = issue
         capacity = int(config.get('fuzzinator', 'cost_budget'))
         self.cost = min(int(config.get(sut_section, 'validate_cost', fallback=config.get(sut_section, 'cost', fallback=1))), capacity)
+        self.priority = int(config.get(sut_section, 'validate_priority', fallback=1))
 
     def run(self):
         _, new_issues = self.validate()
@@ -35,6 +36,7 @@ class ValidateJob(CallJob):
         sut_call = config_get_object(self.config, f'sut.{self.sut_name}', ['validate_call', 'call'])
         with sut_call:
             issue = sut_call(**self.issue)
+        self.report_call_stats(sut_call)
 
         new_issues = []
 
@@ -1,4 +1,4 @@
-# Copyright (c) 2016-2023 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
@@ -81,6 +81,18 @@ class EventListener:
         :param Any issue_id: ``'id'`` property of the issue to be validated.
         """
 
+    def on_enrich_job_added(self, job_id, cost, sut, issue_oid, issue_id):
+        """
+        Invoked when a new (still inactive) enrich job is instantiated.
+
+        :param int job_id: a unique identifier of the new enrich job.
+        :param int cost: cost associated with the new enrich job.
+        :param str sut: short name of the SUT used in the new enrich job (name
+            of the corresponding config section without the "sut." prefix).
+        :param str issue_oid: ``'_id'`` property of the issue to be enriched.
+        :param Any issue_id: ``'id'`` property of the issue to be enriched.
+        """
+
     def on_job_activated(self, job_id):
         """
         Invoked when a previously instantiated job is activated (started).
@@ -159,3 +171,57 @@ class EventListener:
         counts, issue counts, unique issue counts) are updated in the
         framework's database.
         """
+
+    def on_call_cache_updated(self, job_id, sut, hits, misses):
+        """
+        Invoked when a job has used a SUT call with a result cache (see
+        :class:`fuzzinator.call.ResultCacheDecorator`).
+
+        :param int job_id: identifier of the job that has used the cache.
+        :param str sut: name of the SUT.
+        :param int hits: number of the calls that were answered from the cache.
+        :param int misses: number of the calls that executed the SUT.
+        """
+
+    def on_call_timeout_updated(self, job_id, sut, stats):
+        """
+        Invoked when a job has used a SUT call with a percentile-based adaptive
+        timeout (see :class:`fuzzinator.call.AdaptiveTimeoutDecorator`).
+
+        :param int job_id: identifier of the job that has used the SUT call.
+        :param str sut: name of the SUT.
+        :param dict stats: statistics of the run times of the SUT: the number
+            of the run times in the sketch (``'samples'``), their median,
+            90th, and configured percentiles (``'p50'``, ``'p90'``,
+            ``'percentile'``) in seconds, the current timeout
+            (``'timeout'``), and the numbers of the confirmed and refuted hangs
+            of the SUT call (``'hangs'``, ``'refuted_hangs'``, if any).
+        """
+
+    def on_fuzzer_prefetch_updated(self, job_id, fuzzer, stats):
+        """
+        Invoked when a fuzz job has used a fuzzer that generates tests in the
+        background (see :class:`fuzzinator.fuzzer.PrefetchDecorator`).
+
+        :param int job_id: identifier of the fuzz job.
+        :param str fuzzer: name of the fuzzer.
+        :param dict stats: statistics of the queue of the generated tests: its
+            capacity (``'size'``), the number of the tests taken from the
+            queue (``'requests'``), the average number of ready tests in the
+            queue when a test was requested (``'depth'``), and the number of
+            times the fuzz job found the queue empty (``'empty'``, i.e., the
+            fuzzer is the bottleneck) or the fuzzer found it full (``'full'``,
+            i.e., the SUT is the bottleneck).
+        """
+
+    def on_fuzzer_stats_updated(self, job_id, fuzzer, stats):
+        """
+        Invoked when a fuzz job has used a fuzzer that reports statistics of
+        an external fuzzing engine (e.g., :class:`fuzzinator.fuzzer.AFLRunner`).
+
+        :param int job_id: identifier of the fuzz job.
+        :param str fuzzer: name of the fuzzer.
+        :param dict stats: statistics of the fuzzing engine (e.g., the number
+            of executions per second, ``'execs_per_sec'``). The keys depend on
+            the fuzzer.
+        """
@@ -7,8 +7,10 @@
 # according to those terms.
 
 import logging
+import os
 
 from datetime import datetime
+from threading import Lock
 
 from bson.objectid import ObjectId
 from pymongo import ASCENDING, MongoClient, ReturnDocument
@@ -18,13 +20,54 @@ logger = logging.getLogger(__name__)
 
 class MongoDriver:
 
-    def __init__(self, uri, server_selection_timeout):
+    def __init__(self, uri, server_selection_timeout, max_pool_size=None, max_idle_time=None):
         self.uri = uri
         self.server_selection_timeout = server_selection_timeout
+        self.max_pool_size = max_pool_size
+        self.max_idle_time = max_idle_time
+
+        self._client = None
+        self._client_pid = None
+        self._client_lock = Lock()
 
     @property
     def _db(self):
-        return MongoClient(self.uri, serverSelectionTimeoutMS=self.server_selection_timeout).get_database()
+        # MongoClient instances are not fork-safe, hence the client is
+        # (re-)created lazily in every process that uses the driver, and then
+        # shared by all subsequent accesses in that process.
+        pid = os.getpid()
+        if self._client is None or self._client_pid != pid:
+            with self._client_lock:
+                if self._client is None or self._client_pid != pid:
+                    client_kwargs = {'serverSelectionTimeoutMS': self.server_selection_timeout}
+                    if self.max_pool_size is not None:
+                        client_kwargs['maxPoolSize'] = self.max_pool_size
+                    if self.max_idle_time is not None:
+                        client_kwargs['maxIdleTimeMS'] = self.max_idle_time
+                    self._client = MongoClient(self.uri, **client_kwargs)
+                    self._client_pid = pid
+        return self._client.get_database()
+
+    def __getstate__(self):
+        # Neither the client nor the lock can (or should) be transferred to
+        # another process.
+        state = dict(self.__dict__)
+        state.update(_client=None, _client_pid=None, _client_lock=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._client_lock = Lock()
+
+    def close(self):
+        """
+        Close the database client of the current process (if any).
+        """
+        with self._client_lock:
+            if self._client is not None and self._client_pid == os.getpid():
+                self._client.close()
+            self._client = None
+            self._client_pid = None
 
     def init_db(self, fuzzers):
         """
@@ -0,0 +1,283 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import logging
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import weakref
+
+from .config import as_path
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def as_size(s):
+    """
+    Convert a size string with an optional ``K``, ``M``, or ``G`` suffix
+    (binary multiples, e.g., ``512M``) to a number of bytes.
+    """
+    match = re.fullmatch(r'\s*(\d+)\s*([KMG]?)B?\s*', str(s), flags=re.IGNORECASE)
+    if not match:
+        raise ValueError(f'invalid size {s!r}')
+    return int(match.group(1)) * 1024 ** ' KMG'.index(match.group(2).upper() or ' ')
+
+
+def _remove_cgroup(path):
+    try:
+        os.rmdir(path)
+    except OSError as e:
+        logger.warning('Failed to remove cgroup %s', path, exc_info=e)
+
+
+class ResourceLimits:
+    """
+    Resource limits of the subprocesses of SUT calls, updaters, and fuzzers.
+    The subprocesses are started via :meth:`popen` or :meth:`run`, which
+    apply the limits before the command is executed, and the limits are
+    inherited by all the descendants of the process.
+
+    The limits are not applied by a ``preexec_fn`` (see
+    :class:`subprocess.Popen`), which is not safe in multi-threaded
+    processes. On Linux, the child process is a shell that stops itself
+    before executing the command, while the parent process moves it into the
+    cgroup and sets its limits (via ``prlimit``). Elsewhere, the limits are
+    set by a small Python launcher that executes the command afterwards.
+
+    By default, the limits are applied via ``setrlimit``. If a cgroup v2
+    directory delegated to the user running fuzzinator is given (e.g., a
+    directory under ``/sys/fs/cgroup/user.slice/`` with the ``memory`` and
+    ``pids`` controllers enabled in its ``cgroup.subtree_control``), a new
+    child cgroup is created in it, and the memory and process count limits
+    are enforced by the cgroup (i.e., for the whole process tree, not
+    per-process), while the other limits are still applied via ``setrlimit``.
+
+    The terminations caused by the limits are classified as:
+
+      - ``'oom'``: the memory limit of the cgroup was exceeded. (If the
+        memory limit is applied via ``RLIMIT_AS``, the allocations of the SUT
+        fail instead, which cannot be distinguished from other failures.)
+      - ``'cpu-timeout'``: the process was terminated by ``SIGXCPU``.
+      - ``'file-size-limit'``: the process was terminated by ``SIGXFSZ``.
+
+    (The exit codes of shells reporting the termination of their child
+    processes by these signals are recognized as well.)
+
+    .. note::
+
+       ``RLIMIT_NPROC`` limits the number of processes of the user, not of the
+       process tree, so ``max_procs`` should be used with a cgroup or with a
+       dedicated user. Concurrent subprocesses of the same object share the
+       cgroup, so the classification of ``'oom'`` may be ambiguous with
+       ``fuzz_concurrency`` greater than 1.
+
+    :param memory_limit: maximum memory use in bytes (``K``, ``M``, and
+        ``G`` suffixes are accepted).
+    :param cpu_time_limit: maximum CPU time in seconds.
+    :param max_procs: maximum number of processes.
+    :param max_file_size: maximum size of the files written in bytes (``K``,
+        ``M``, and ``G`` suffixes are accepted).
+    :param max_core_size: maximum size of the core dumps in bytes (``K``,
+        ``M``, and ``G`` suffixes are accepted; can also be set as an
+        attribute before the first subprocess is started, e.g., by
+        :class:`fuzzinator.call.CoreDumpBacktraceDecorator`).
+    :param cgroup: path of a delegated cgroup v2 directory (default: limits
+        are applied via ``setrlimit`` only).
+    """
+
+    def __init__(self, *, memory_limit=None, cpu_time_limit=None, max_procs=None, max_file_size=None, max_core_size=None, cgroup=None):
+        self.memory_limit = as_size(memory_limit) if memory_limit else None
+        self.cpu_time_limit = int(cpu_time_limit) if cpu_time_limit else None
+        self.max_procs = int(max_procs) if max_procs else None
+        self.max_file_size = as_size(max_file_size) if max_file_size else None
+        self.max_core_size = as_size(max_core_size) if max_core_size else None
+        self.cgroup_root = as_path(cgroup) if cgroup else None
+
+        self.cgroup = None
+        self.rlimits = None
+        self.oom_kills = 0
+
+    def __bool__(self):
+        return any(limit is not None for limit in [self.memory_limit, self.cpu_time_limit, self.max_procs, self.max_file_size, self.max_core_size])
+
+    def popen(self, args, **kwargs):
+        """
+        Start a subprocess like :class:`subprocess.Popen` with the limits
+        applied to it (creating the cgroup first, if needed).
+
+        If the limits are applied via a shell or a launcher, a command that
+        cannot be executed is reported by a nonzero exit code instead of an
+        exception.
+
+        :param list args: the command to execute (a sequence of arguments).
+        :return: the :class:`subprocess.Popen` object of the subprocess.
+        """
+        if self and self.rlimits is None:
+            self._setup()
+        if not self.cgroup and not self.rlimits:
+            return subprocess.Popen(args, **kwargs)
+
+        if not hasattr(resource, 'prlimit'):
+            # The limits of another process cannot be set on this platform
+            # (and there are no cgroups either).
+            limits = ','.join(f'{res}:{soft}:{hard}' for res, (soft, hard) in self.rlimits)
+            return subprocess.Popen([sys.executable, '-I', '-S', '-c', self._launcher, limits] + list(args), **kwargs)
+
+        proc = subprocess.Popen(['/bin/sh', '-c', 'kill -STOP $$ && exec "$@"', 'sh'] + list(args), **kwargs)
+        try:
+            _, status = os.waitpid(proc.pid, os.WUNTRACED)
+            if not os.WIFSTOPPED(status):
+                proc.returncode = os.waitstatus_to_exitcode(status)
+                return proc
+            self._apply(proc.pid)
+            os.kill(proc.pid, signal.SIGCONT)
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        return proc
+
+    def run(self, args, *, timeout=None, check=False, **kwargs):
+        """
+        Run a subprocess like :func:`subprocess.run` with the limits applied
+        to it (see :meth:`popen`).
+
+        :return: a :class:`subprocess.CompletedProcess` object.
+        :raises subprocess.TimeoutExpired: if the process does not terminate
+            within ``timeout`` seconds (the process is killed).
+        :raises subprocess.CalledProcessError: if ``check`` is true and the
+            process exits with non-zero exit code.
+        """
+        with self.popen(args, **kwargs) as proc:
+            try:
+                stdout, stderr = proc.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired as e:
+                proc.kill()
+                e.stdout, e.stderr = proc.communicate()
+                raise
+        if check and proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, args, output=stdout, stderr=stderr)
+        return subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
+
+    def classify(self, exit_code):
+        """
+        Determine whether the last termination of a subprocess was caused by a
+        resource limit.
+
+        :param int exit_code: the exit code of the subprocess (negative for
+            signals, or 128 plus the signal number if reported by a shell).
+        :return: ``'oom'``, ``'cpu-timeout'``, ``'file-size-limit'``, or
+            ``None``.
+        """
+        if self.cgroup and self.memory_limit:
+            oom_kills = self._read_oom_kills()
+            if oom_kills > self.oom_kills:
+                self.oom_kills = oom_kills
+                return 'oom'
+        if exit_code is None:
+            return None
+        signum = -exit_code if exit_code < 0 else exit_code - 128
+        if self.cpu_time_limit and signum == getattr(signal, 'SIGXCPU', None):
+            return 'cpu-timeout'
+        if self.max_file_size and signum == getattr(signal, 'SIGXFSZ', None):
+            return 'file-size-limit'
+        return None
+
+    def _setup(self):
+        if self.cgroup_root and (self.memory_limit or self.max_procs):
+            self.cgroup = self._create_cgroup()
+
+        self.rlimits = []
+        if not resource:
+            if not self.cgroup:
+                logger.warning('Resource limits are not supported on this platform.')
+            return
+
+        limits = [(resource.RLIMIT_CPU, self.cpu_time_limit, (self.cpu_time_limit + 1) if self.cpu_time_limit else None),
+                  (resource.RLIMIT_FSIZE, self.max_file_size, self.max_file_size),
+                  (resource.RLIMIT_CORE, self.max_core_size, self.max_core_size)]
+        if not self.cgroup:
+            limits += [(resource.RLIMIT_AS, self.memory_limit, self.memory_limit),
+                       (resource.RLIMIT_NPROC, self.max_procs, self.max_procs)]
+
+        for res, soft, hard in limits:
+            if soft is None:
+                continue
+            # Unprivileged processes cannot raise their hard limits.
+            _, max_hard = resource.getrlimit(res)
+            if max_hard != resource.RLIM_INFINITY:
+                hard = min(hard, max_hard)
+                soft = min(soft, hard)
+            self.rlimits.append((res, (soft, hard)))
+
+    def _create_cgroup(self):
+        if not os.path.exists(os.path.join(self.cgroup_root, 'cgroup.controllers')):
+            logger.warning('%s is not a cgroup v2 directory, falling back to setrlimit.', self.cgroup_root)
+            return None
+
+        try:
+            path = tempfile.mkdtemp(prefix='fuzzinator-', dir=self.cgroup_root)
+        except OSError as e:
+            logger.warning('Failed to create cgroup in %s, falling back to setrlimit.', self.cgroup_root, exc_info=e)
+            return None
+
+        try:
+            if self.memory_limit:
+                self._write_cgroup_file(path, 'memory.max', self.memory_limit)
+                # Swap accounting may be disabled, then there is no swap to limit.
+                if os.path.exists(os.path.join(path, 'memory.swap.max')):
+                    self._write_cgroup_file(path, 'memory.swap.max', 0)
+            if self.max_procs:
+                self._write_cgroup_file(path, 'pids.max', self.max_procs)
+        except OSError as e:
+            logger.warning('Failed to set up cgroup %s, falling back to setrlimit.', path, exc_info=e)
+            _remove_cgroup(path)
+            return None
+
+        weakref.finalize(self, _remove_cgroup, path)
+        self.cgroup = path
+        self.oom_kills = self._read_oom_kills()
+        return path
+
+    @staticmethod
+    def _write_cgroup_file(path, name, value):
+        with open(os.path.join(path, name), 'w') as f:
+            f.write(str(value))
+
+    def _read_oom_kills(self):
+        try:
+            with open(os.path.join(self.cgroup, 'memory.events')) as f:
+                for line in f:
+                    key, value = line.split()
+                    if key == 'oom_kill':
+                        return int(value)
+        except (OSError, ValueError):
+            pass
+        return 0
+
+    def _apply(self, pid):
+        # Executed in the parent process while the child process is stopped.
+        if self.cgroup:
+            self._write_cgroup_file(self.cgroup, 'cgroup.procs', pid)
+        for res, limits in self.rlimits:
+            resource.prlimit(pid, res, limits)
+
+    # Set the limits given in the first argument (as resource:soft:hard
+    # triplets) and execute the rest of the arguments.
+    _launcher = ('import os, resource, sys\n'
+                 'for limit in filter(None, sys.argv[1].split(",")):\n'
+                 '    res, soft, hard = map(int, limit.split(":"))\n'
+                 '    resource.setrlimit(res, (soft, hard))\n'
+                 'os.execvp(sys.argv[2], sys.argv[2:])\n')
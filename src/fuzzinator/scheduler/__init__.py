@@ -0,0 +1,10 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+from .round_robin_scheduler import RoundRobinScheduler
+from .scheduler import Scheduler
+from .thompson_sampling_scheduler import ThompsonSamplingScheduler
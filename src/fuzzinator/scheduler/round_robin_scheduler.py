@@ -0,0 +1,34 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+from .scheduler import Scheduler
+
+
+class RoundRobinScheduler(Scheduler):
+    """
+    Scheduler that selects the fuzz jobs in the order of their definition, one
+    after the other. Fuzz jobs that cannot be selected lose their turn. This is
+    the default scheduler of the framework.
+
+    Example configuration snippet:
+
+        .. code-block:: ini
+
+            [fuzzinator]
+            scheduler=fuzzinator.scheduler.RoundRobinScheduler
+    """
+
+    def __init__(self, *, fuzzers, **kwargs):
+        self.fuzzers = list(fuzzers)
+        self.idx = 0
+
+    def __call__(self, *, fuzzers):
+        while True:
+            fuzzer = self.fuzzers[self.idx]
+            self.idx = (self.idx + 1) % len(self.fuzzers)
+            if fuzzer in fuzzers:
+                return fuzzer
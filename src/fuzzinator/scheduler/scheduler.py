@@ -0,0 +1,27 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+
+class Scheduler:
+    """
+    Abstract base class to represent strategies of selecting the fuzz job to be
+    queued next.
+    """
+
+    def __call__(self, *, fuzzers):
+        """
+        Select the fuzz job to be queued next.
+
+        Raises :exc:`NotImplementedError` by default.
+
+        :param list[str] fuzzers: names of the fuzz jobs to select from (i.e.,
+            those that have not reached their limit on parallel instances).
+            Never empty.
+        :return: the name of the selected fuzz job.
+        :rtype: str
+        """
+        raise NotImplementedError()
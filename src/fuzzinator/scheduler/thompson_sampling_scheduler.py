@@ -0,0 +1,80 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import random
+import time
+
+from .scheduler import Scheduler
+
+
+class ThompsonSamplingScheduler(Scheduler):
+    """
+    Multi-armed bandit scheduler that prefers the fuzz jobs that find new
+    unique issues at a higher rate.
+
+    The discovery of unique issues by a fuzz job is modeled as a Poisson
+    process, whose rate (unique issues per CPU-second, i.e., execution time
+    multiplied by the cost of the SUT) has a Gamma prior. The scheduler samples
+    a rate from the posterior of every selectable fuzz job and selects the one
+    with the highest sample. The posteriors are computed from the statistics of
+    the current configuration of the fuzz jobs stored in the database, which
+    are re-read periodically.
+
+    **Optional parameters of the scheduler:**
+
+      - ``refresh``: number of seconds after which statistics are re-read from
+        the database (default: 60).
+      - ``prior_issues``: shape parameter of the Gamma prior, i.e., the number
+        of unique issues assumed to be found by a fuzz job without statistics
+        (default: 1).
+      - ``prior_time``: rate parameter of the Gamma prior, i.e., the number of
+        CPU-seconds assumed to be spent on finding ``prior_issues`` unique
+        issues (default: 60).
+
+    Example configuration snippet:
+
+        .. code-block:: ini
+
+            [fuzzinator]
+            scheduler=fuzzinator.scheduler.ThompsonSamplingScheduler
+
+            [fuzzinator.scheduler]
+            refresh=300
+            prior_time=600
+    """
+
+    def __init__(self, *, fuzzers, config, db, refresh=60, prior_issues=1, prior_time=60, **kwargs):
+        self.fuzzers = fuzzers
+        self.db = db
+        self.refresh = float(refresh)
+        self.prior_issues = float(prior_issues)
+        self.prior_time = float(prior_time)
+
+        capacity = int(config.get('fuzzinator', 'cost_budget'))
+        self.costs = {fuzzer: min(int(config.get(f'sut.{data["sut"]}', 'cost', fallback=1)), capacity)
+                      for fuzzer, data in fuzzers.items()}
+        self.stats = {}
+        self.refreshed = None
+
+    def _refresh_stats(self):
+        stats = {}
+        for fuzzer_stats in self.db.get_stats(filter={'fuzzer': {'$in': list(self.fuzzers)}}):
+            fuzzer = fuzzer_stats['fuzzer']
+            for subconfig_stats in fuzzer_stats['subconfigs']:
+                if subconfig_stats['subconfig'] == self.fuzzers[fuzzer]['subconfig']:
+                    stats[fuzzer] = (subconfig_stats['unique'], subconfig_stats['time'] * self.costs[fuzzer])
+        self.stats = stats
+        self.refreshed = time.time()
+
+    def _sample(self, fuzzer):
+        unique, cpu_time = self.stats.get(fuzzer, (0, 0))
+        return random.gammavariate(self.prior_issues + unique, 1 / (self.prior_time + cpu_time))
+
+    def __call__(self, *, fuzzers):
+        if self.refreshed is None or time.time() - self.refreshed >= self.refresh:
+            self._refresh_stats()
+        return max(fuzzers, key=self._sample)
@@ -29,6 +29,9 @@ class CliListener(EventListener):
     def on_validate_job_added(self, job_id, cost, sut, issue_oid, issue_id):
         logger.debug('#%s: New validate job for %r in %s.', job_id, issue_id, sut)
 
+    def on_enrich_job_added(self, job_id, cost, sut, issue_oid, issue_id):
+        logger.debug('#%s: New enrich job for %r in %s.', job_id, issue_id, sut)
+
     def on_job_activated(self, job_id):
         logger.debug('#%s: Activate job.', job_id)
 
@@ -76,6 +76,9 @@ class Tui:
     def on_validate_job_added(self, job_id, cost, sut, issue_oid, issue_id):
         self.view.job_table.on_validate_job_added(job_id, sut, issue_id)
 
+    def on_enrich_job_added(self, job_id, cost, sut, issue_oid, issue_id):
+        self.view.job_table.on_enrich_job_added(job_id, sut, issue_id)
+
     def on_job_removed(self, job_id):
         self.view.job_table.on_job_removed(job_id)
 
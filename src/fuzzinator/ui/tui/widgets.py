@@ -372,6 +372,9 @@ class JobsTable(WidgetWrap):
     def on_validate_job_added(self, job_id, sut, issue_id):
         self.insert_widget(job_id, ValidateJobWidget({'sut': sut, 'issue': issue_id}))
 
+    def on_enrich_job_added(self, job_id, sut, issue_id):
+        self.insert_widget(job_id, EnrichJobWidget({'sut': sut, 'issue': issue_id}))
+
     def on_job_activated(self, job_id):
         idx = self.walker.index(self.jobs[job_id])
         self.walker[idx].activate()
@@ -516,6 +519,12 @@ class ValidateJobWidget(JobWidget):
     title = 'Validate Job'
 
 
+class EnrichJobWidget(JobWidget):
+
+    labels = {'sut': 'Sut', 'issue': 'Issue'}
+    title = 'Enrich Job'
+
+
 class FuzzerLogo(WidgetWrap):
 
     def __init__(self, max_load=100):
@@ -113,6 +113,9 @@ class Wui:
     def on_validate_job_added(self, **kwargs):
         self.on_job_added('validate', **kwargs)
 
+    def on_enrich_job_added(self, **kwargs):
+        self.on_job_added('enrich', **kwargs)
+
     def on_job_removed(self, **kwargs):
         del self.jobs[kwargs['job_id']]
         self.send_notification('job_removed', kwargs)
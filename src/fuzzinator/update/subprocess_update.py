@@ -10,6 +10,7 @@ import os
 import subprocess
 
 from ..config import as_dict, as_pargs, as_path, decode
+from ..resource_limits import ResourceLimits
 from .update import Update
 
 logger = logging.getLogger(__name__)
@@ -31,6 +32,9 @@ class SubprocessUpdate(Update):
         update the environment with.
       - ``timeout``: run subprocess with timeout.
       - ``encoding``: stdout and stderr encoding (default: autodetect).
+      - ``memory_limit``, ``cpu_time_limit``, ``max_procs``,
+        ``max_file_size``, ``cgroup``: resource limits of the update process
+        (see :class:`fuzzinator.ResourceLimits`).
 
     **Example configuration snippet:**
 
@@ -46,22 +50,23 @@ class SubprocessUpdate(Update):
             env={"BAR": "1"}
     """
 
-    def __init__(self, *, command, cwd=None, env=None, timeout=None, encoding=None, **kwargs):
+    def __init__(self, *, command, cwd=None, env=None, timeout=None, encoding=None, memory_limit=None, cpu_time_limit=None, max_procs=None, max_file_size=None, cgroup=None, **kwargs):
         self.command = command
         self.cwd = as_path(cwd) if cwd else os.getcwd()
         self.env = dict(os.environ, **as_dict(env)) if env else None
         self.timeout = int(timeout) if timeout else None
         self.encoding = encoding
+        self.limits = ResourceLimits(memory_limit=memory_limit, cpu_time_limit=cpu_time_limit, max_procs=max_procs, max_file_size=max_file_size, cgroup=cgroup)
 
     def __call__(self):
         try:
-            result = subprocess.run(as_pargs(self.command),
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE,
-                                    cwd=self.cwd,
-                                    env=self.env,
-                                    timeout=self.timeout,
-                                    check=True)
+            result = self.limits.run(as_pargs(self.command),
+                                     stdout=subprocess.PIPE,
+                                     stderr=subprocess.PIPE,
+                                     cwd=self.cwd,
+                                     env=self.env,
+                                     timeout=self.timeout,
+                                     check=True)
             logger.info('Update succeeded.\n%s', decode(result.stdout, self.encoding))
         except subprocess.TimeoutExpired as e:
             logger.warning('SUT update execution timeout (%ds) expired.\n%s\n%s',
@@ -69,7 +74,9 @@ class SubprocessUpdate(Update):
                            decode(e.stdout or b'', self.encoding),
                            decode(e.stderr or b'', self.encoding))
         except subprocess.CalledProcessError as e:
-            logger.warning('SUT update command returned with nonzero exit code (%d).\n%s\n%s',
+            resource_limit = self.limits.classify(e.returncode)
+            logger.warning('SUT update command returned with nonzero exit code (%d%s).\n%s\n%s',
                            e.returncode,
+                           f', {resource_limit}' if resource_limit else '',
                            decode(e.stdout, self.encoding),
                            decode(e.stderr, self.encoding))
@@ -0,0 +1,94 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import random
+import time
+
+import pytest
+
+import fuzzinator
+
+from fuzzinator.call.adaptive_timeout_decorator import RunTimeSketch
+
+
+class MockSleepCall(fuzzinator.call.Call):
+    """
+    Sleep as many seconds as the test specifies (but at most until the
+    timeout), return an issue on timeout (if hang_issue is true), and record
+    the timeouts of the calls.
+    """
+
+    def __init__(self, *, timeout=None, hang_issue=True, **kwargs):
+        self.timeout = timeout
+        self.hang_issue = hang_issue
+        self.timeouts = []
+
+    def __call__(self, *, test, timeout=None, **kwargs):
+        timeout = timeout or self.timeout
+        self.timeouts.append(timeout)
+        time.sleep(min(test, timeout))
+        return {'id': 'timeout'} if test >= timeout and self.hang_issue else None
+
+
+@pytest.mark.parametrize('times', [
+    [random.Random(0).uniform(0.001, 0.1) for _ in range(10000)],
+    [random.Random(0).lognormvariate(0, 2) for _ in range(10000)],
+])
+def test_run_time_sketch(tmpdir, times):
+    sketch = RunTimeSketch(str(tmpdir.join('times.sketch')))
+    for t in times:
+        sketch.add(t)
+
+    # Sketches backed by the same file share the run times.
+    other_sketch = RunTimeSketch(str(tmpdir.join('times.sketch')))
+    count, estimates = other_sketch.quantiles(0.5, 0.9, 0.99)
+    assert count == len(times)
+
+    times = sorted(times)
+    for q, estimate in zip([0.5, 0.9, 0.99], estimates):
+        exact = times[int(q * len(times)) - 1]
+        assert abs(estimate - exact) / exact < 0.03
+
+    sketch.close()
+    other_sketch.close()
+
+
+@pytest.mark.parametrize('hang_issue', [True, False])
+def test_adaptive_timeout_decorator_percentile(tmpdir, hang_issue):
+    call_class = fuzzinator.call.AdaptiveTimeoutDecorator(percentile='99', factor='2', min_samples='10', sketch_file=str(tmpdir.join('times.sketch')))(MockSleepCall)
+    call = call_class(timeout=1, hang_issue=hang_issue)
+    with call:
+        for _ in range(40):
+            call(test=0.01)
+        # The timeout is shortened after enough samples (when the percentile
+        # is re-estimated).
+        assert 0.01 < call.timeouts[-1] < 0.1
+        assert call.timeout_stats['timeout'] == call.timeouts[-1]
+
+        # A slow run is re-run with the configured timeout and is not
+        # considered a hang.
+        start_time = time.time()
+        call(test=0.2)
+        assert time.time() - start_time < 1
+        assert call.timeouts[-1] == 1
+        assert call.timeout_stats['refuted_hangs'] == 1
+
+        # A hang is confirmed with the configured timeout (even if the SUT
+        # call does not report timeouts as issues), and it is counted in the
+        # sketch as a run time of the timeout.
+        call(test=5)
+        assert call.timeouts[-2:] == [call.timeout_stats['timeout'], 1]
+        assert call.timeout_stats['hangs'] == 1
+
+    sketch = RunTimeSketch(str(tmpdir.join('times.sketch')))
+    count, (maximum,) = sketch.quantiles(1)
+    sketch.close()
+    assert count == 42
+    assert 0.9 < maximum < 1.1
+
+    # The sketch is closed with the context of the SUT call.
+    assert call._DecoratedCall__sketch is None
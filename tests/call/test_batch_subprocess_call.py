@@ -0,0 +1,46 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import os
+import sys
+
+import pytest
+
+import fuzzinator
+
+from .common_call import linesep, resources_dir
+
+
+@pytest.mark.parametrize('tests, exp_len, exp_issue', [
+    ([b'foo', b'bar', b'baz'], 3, False),
+    ([b'foo', b'bar', b'crash', b'baz', b'crash'], 3, True),
+    ([b'crash', b'foo'], 1, True),
+    ([b'foo', b'bar', b'baz', b'qux', b'crash'], 5, True),
+])
+def test_batch_subprocess_call(tests, exp_len, exp_issue, tmpdir):
+    command = f'{sys.executable} {os.path.join(resources_dir, "mock_tool.py")} --fail-on crash {{tests}}'
+    call = fuzzinator.call.BatchSubprocessCall(command=command, cwd=str(tmpdir), filename='test-{uid}', work_dir=str(tmpdir))
+    with call:
+        results = call.call_batch(tests=tests)
+
+    assert len(results) == exp_len
+    assert not any(results[:-1])
+    if not exp_issue:
+        assert not results[-1]
+    else:
+        # The failing test is called individually at the end.
+        issue = results[-1]
+        assert issue['exit_code'] == 1
+        assert issue['stdout'] == os.path.join(str(tmpdir), 'test-0') + linesep
+
+
+def test_batch_subprocess_call_single(tmpdir):
+    command = f'{sys.executable} {os.path.join(resources_dir, "mock_tool.py")} --fail-on crash {{tests}}'
+    call = fuzzinator.call.BatchSubprocessCall(command=command, work_dir=str(tmpdir))
+    with call:
+        assert not call(test=b'foo')
+        assert call(test='crash')['exit_code'] == 1
@@ -0,0 +1,79 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import os
+import resource
+import shutil
+import sys
+
+import pytest
+
+import fuzzinator
+
+from .common_call import resources_dir
+
+
+def _core_dumps_collectable():
+    try:
+        with open('/proc/sys/kernel/core_pattern') as f:
+            return not f.read().startswith('|')
+    except OSError:
+        return False
+
+
+pytestmark = [
+    pytest.mark.skipif(not hasattr(fuzzinator.call, 'CoreDumpBacktraceDecorator'), reason='platform-dependent component'),
+    pytest.mark.skipif(not _core_dumps_collectable(), reason='core dumps are not written to files'),
+]
+
+
+def _decorated_call(tmpdir, **kwargs):
+    call_class = fuzzinator.call.CoreDumpBacktraceDecorator(executable=sys.executable,
+                                                            core_dir=str(tmpdir.join('cores')),
+                                                            cwd=str(tmpdir),
+                                                            **kwargs)(fuzzinator.call.SubprocessCall)
+    return call_class(command=f'{sys.executable} {os.path.join(resources_dir, "mock_tool.py")} --crash {{test}}',
+                      cwd=str(tmpdir))
+
+
+@pytest.mark.parametrize('tests, max_count, exp_count', [
+    (1, None, 1),
+    (3, None, 3),
+    (3, '2', 2),
+])
+def test_core_dump_backtrace_decorator(tmpdir, tests, max_count, exp_count):
+    core_limit = resource.getrlimit(resource.RLIMIT_CORE)
+    cores = []
+    for _ in range(tests):
+        # SUT calls are renewed after issues.
+        with _decorated_call(tmpdir, max_count=max_count) as call:
+            issue = call(test='foo')
+            # The core dumps are enabled for the SUT only.
+            assert resource.getrlimit(resource.RLIMIT_CORE) == core_limit
+        assert issue['exit_code'] < 0
+        if 'core' not in issue:
+            pytest.skip('no core dump was created')
+        cores.append(issue['core'])
+
+    # The core dumps are moved to the core directory (and the oldest ones are
+    # removed above the quota).
+    assert sorted(os.listdir(tmpdir.join('cores'))) == sorted(os.path.basename(core) for core in cores[-exp_count:])
+    assert not [name for name in os.listdir(tmpdir) if name.startswith('core') and name != 'cores']
+
+
+@pytest.mark.skipif(not shutil.which('gdb'), reason='gdb is not available')
+def test_core_dump_backtrace_decorator_symbolize(tmpdir):
+    with _decorated_call(tmpdir) as call:
+        issue = call(test='foo')
+    if 'core' not in issue:
+        pytest.skip('no core dump was created')
+
+    with _decorated_call(tmpdir, symbolize='True') as call:
+        enriched_issue = call(test='foo', core=issue['core'])
+
+    assert enriched_issue['backtrace']
+    assert not os.path.exists(issue['core'])
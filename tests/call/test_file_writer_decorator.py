@@ -1,4 +1,4 @@
-# Copyright (c) 2016-2023 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
@@ -7,11 +7,14 @@
 
 import os
 import re
+import time
 
 import pytest
 
 import fuzzinator
 
+from fuzzinator.file_slots import tmpfs_session_dir
+
 from .common_call import MockAlwaysFailCall, MockNeverFailCall
 
 
@@ -43,3 +46,79 @@ def test_file_writer_decorator(call_class, call_init_kwargs, call_kwargs, dec_kw
         del out['test']
 
     assert out == exp
+
+
+class MockFileReaderCall(fuzzinator.call.Call):
+    """
+    Return an issue with the content of the file passed as test input.
+    """
+
+    def __call__(self, *, test, **kwargs):
+        with open(test, 'rb') as f:
+            return {'content': f.read()}
+
+
+@pytest.mark.parametrize('storage, slots', [
+    ('tmpfs', None),
+    ('tmpfs', '3'),
+    ('memfd', None),
+    ('memfd', '3'),
+])
+def test_file_writer_decorator_storage(storage, slots, tmpdir):
+    call_class = fuzzinator.call.FileWriterDecorator(filename='baz{uid}.txt', storage=storage, slots=slots, work_dir=str(tmpdir))(MockFileReaderCall)
+    call = call_class()
+
+    with call:
+        for uid, test in enumerate([b'foo', b'barbaz', b'', 'qux', b'x']):
+            out = call(test=test)
+            assert out == {'content': test if isinstance(test, bytes) else test.encode('utf-8'), 'filename': f'baz{uid}.txt'}
+
+
+@pytest.mark.parametrize('storage', ['tmpfs', 'memfd'])
+def test_file_slots(storage, tmpdir):
+    session_dir = tmpfs_session_dir(str(tmpdir))
+    slots = fuzzinator.FileSlots(storage=storage, filename='baz{uid}.txt', slots=2, work_dir=os.path.join(str(tmpdir), 'dec'))
+
+    slots.open()
+    try:
+        path = slots.write(b'foo', 0)
+        with open(path, 'rb') as f:
+            assert f.read() == b'foo'
+        # The slots are not leaked to the subprocesses.
+        assert not any(os.get_inheritable(fd) for fd in slots.fds)
+        if slots.storage == 'tmpfs' and session_dir:
+            # The files are placed where the controller cleans up after the session.
+            assert path.startswith(session_dir + os.sep)
+
+        # Slots in use are not overwritten, released slots are reused.
+        assert slots.write(b'bar', 0) != path
+        with pytest.raises(RuntimeError):
+            slots.write(b'baz', 0)
+        slots.release(path)
+        assert slots.write(b'baz', 1) == path
+    finally:
+        slots.close()
+    # The session directory is not left behind empty.
+    assert not session_dir or not os.path.exists(session_dir)
+
+
+@pytest.mark.parametrize('storage', ['tmpfs', 'memfd'])
+def test_file_writer_decorator_storage_benchmark(storage, tmpdir):
+    # Compare the execs/sec of a SUT reading its input from a file when the
+    # test inputs are written to reused in-memory files and when they are
+    # written to new files on disk.
+    n = 2000
+    tests = [f'test {i}'.encode('ascii') * 64 for i in range(n)]
+    rates = {}
+    for dec_storage in ['disk', storage]:
+        work_dir = os.path.join(str(tmpdir), dec_storage)
+        call_class = fuzzinator.call.FileWriterDecorator(filename='test-{uid}.txt', storage=dec_storage, work_dir=work_dir)(MockFileReaderCall)
+        call = call_class()
+
+        with call:
+            start_time = time.time()
+            for test in tests:
+                assert call(test=test)['content'] == test
+            rates[dec_storage] = n / (time.time() - start_time)
+
+    print(f'{n} tests: disk: {rates["disk"]:.0f} execs/s, {storage}: {rates[storage]:.0f} execs/s')
@@ -0,0 +1,84 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+import fuzzinator
+
+from .common_call import linesep, resources_dir
+
+
+@pytest.mark.skipif(not hasattr(fuzzinator.call, 'ForkserverSubprocessCall'), reason='platform-dependent tests')
+@pytest.mark.parametrize('command, cwd, env, no_exit_code, tests, exp', [
+    (f'{sys.executable} {os.path.join(resources_dir, "mock_tool.py")} --forkserver --echo-stdin', None, None, None, [b'foo', b'bar'],
+     [fuzzinator.call.NonIssue({'stdout': 'foo', 'stderr': '', 'exit_code': 0}), fuzzinator.call.NonIssue({'stdout': 'bar', 'stderr': '', 'exit_code': 0})]),
+    (f'{sys.executable} {os.path.join(resources_dir, "mock_tool.py")} --forkserver --echo-stdin --exit-code 1', None, None, None, [b'foo', b'barbaz', b'qux'],
+     [{'stdout': 'foo', 'stderr': '', 'exit_code': 1}, {'stdout': 'barbaz', 'stderr': '', 'exit_code': 1}, {'stdout': 'qux', 'stderr': '', 'exit_code': 1}]),
+    (f'{sys.executable} {os.path.join(resources_dir, "mock_tool.py")} --forkserver --echo-stdin --to-stderr --crash', None, None, None, [b'foo'],
+     [{'stdout': '', 'stderr': 'foo', 'exit_code': -11}]),
+    (f'{sys.executable} {os.path.join(resources_dir, "mock_tool.py")} --forkserver --print-env BAR --print-args --exit-code 1 {{test}}', resources_dir, '{"BAR": "baz"}', None, [b'foo'],
+     [{'stdout': f'{{work_dir}}{os.sep}test{linesep}baz{linesep}', 'stderr': '', 'exit_code': 1}]),
+    (f'{sys.executable} {os.path.join(resources_dir, "mock_tool.py")} --forkserver --echo-stdin --exit-code 0', None, None, 'True', [b'foo'],
+     [{'stdout': 'foo', 'stderr': '', 'exit_code': 0}]),
+])
+def test_forkserver_subprocess_call(command, cwd, env, no_exit_code, tests, exp, tmpdir):
+    work_dir = str(tmpdir)
+    call = fuzzinator.call.ForkserverSubprocessCall(command=command, cwd=cwd, env=env, no_exit_code=no_exit_code, work_dir=work_dir)
+    with call:
+        for test, exp_issue in zip(tests, exp):
+            out = call(test=test)
+            assert out.pop('time')
+            if 'stdout' in exp_issue:
+                exp_issue['stdout'] = exp_issue['stdout'].replace('{work_dir}', work_dir)
+            assert out == exp_issue
+
+
+@pytest.mark.skipif(not hasattr(fuzzinator.call, 'ForkserverSubprocessCall'), reason='platform-dependent tests')
+@pytest.mark.skipif(not shutil.which('cc'), reason='C compiler is not available')
+def test_forkserver_subprocess_call_benchmark(tmpdir, record_property):
+    # Benchmark against StdinSubprocessCall (i.e., SubprocessCall with input on
+    # stdin) with a stand-in SUT whose initialization takes 20ms.
+    sut = os.path.join(str(tmpdir), 'mock_forkserver')
+    subprocess.run(['cc', '-O2', '-o', sut, os.path.join(resources_dir, 'mock_forkserver.c')], check=True)
+    tests = [b'foo', b'Xbar'] * 25
+
+    def run(call):
+        with call:
+            start_time = time.time()
+            results = [call(test=test) for test in tests]
+            end_time = time.time()
+        return [(result['exit_code'], result['stdout']) for result in results], end_time - start_time
+
+    subprocess_results, subprocess_time = run(fuzzinator.call.StdinSubprocessCall(command=sut))
+    forkserver_results, forkserver_time = run(fuzzinator.call.ForkserverSubprocessCall(command=sut, work_dir=os.path.join(str(tmpdir), 'work')))
+    record_property('subprocess_time', subprocess_time)
+    record_property('forkserver_time', forkserver_time)
+    print(f'{len(tests)} tests: StdinSubprocessCall: {subprocess_time:.3f}s, ForkserverSubprocessCall: {forkserver_time:.3f}s')
+
+    assert forkserver_results == subprocess_results
+
+
+@pytest.mark.skipif(not hasattr(fuzzinator.call, 'ForkserverSubprocessCall'), reason='platform-dependent tests')
+@pytest.mark.parametrize('command, exc', [
+    (f'{sys.executable} -c "import time; time.sleep(10)"', TimeoutError),
+    (f'{sys.executable} -c "pass"', EOFError),
+])
+def test_forkserver_subprocess_call_no_forkserver(command, exc, tmpdir):
+    # The SUT does not start a forkserver (it hangs or exits).
+    call = fuzzinator.call.ForkserverSubprocessCall(command=command, init_timeout='0.5', work_dir=str(tmpdir))
+    start_time = time.time()
+    with pytest.raises(exc):
+        with call:
+            pass
+    assert time.time() - start_time < 5
+    assert call.proc is None
@@ -0,0 +1,49 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import logging
+import shutil
+import sys
+import time
+
+import pytest
+
+import fuzzinator
+
+
+@pytest.mark.parametrize('max_size, chunks, exp, exp_truncated', [
+    (None, [b'foo', b'bar', b'baz'], b'foobarbaz', 0),
+    (10, [b'foo', b'bar', b'baz'], b'foobarbaz', 0),
+    (4, [b'foo', b'bar', b'baz'], b'fo\n[... 5 bytes truncated ...]\naz', 5),
+    (4, [b'foobarbaz'], b'fo\n[... 5 bytes truncated ...]\naz', 5),
+    (5, [b'f', b'o', b'o', b'b', b'a', b'r', b'b', b'a', b'z'], b'fo\n[... 4 bytes truncated ...]\nbaz', 4),
+    (0, [b'foo', b'bar'], b'\n[... 6 bytes truncated ...]\n', 6),
+])
+def test_output_buffer(max_size, chunks, exp, exp_truncated):
+    buffer = fuzzinator.call.OutputBuffer(max_size)
+    for chunk in chunks:
+        buffer.write(chunk)
+    assert buffer.getvalue() == exp
+    assert buffer.truncated == exp_truncated
+    assert buffer.size == sum(len(chunk) for chunk in chunks)
+
+
+@pytest.mark.skipif(sys.platform.startswith('win'), reason='the command needs a POSIX shell')
+@pytest.mark.parametrize('command, exp_warning', [
+    # The background process keeps the output pipes open.
+    ('sleep 30 & echo foo', False),
+    # The background process has left the process group of the shell.
+    pytest.param('setsid sleep 4 & echo foo', True, marks=pytest.mark.skipif(not shutil.which('setsid'), reason='setsid is not available')),
+])
+def test_run_subprocess_descendants(command, exp_warning, caplog):
+    start_time = time.time()
+    with caplog.at_level(logging.WARNING):
+        result = fuzzinator.call.output_buffer.run_subprocess(['sh', '-c', command], timeout=10)
+
+    assert time.time() - start_time < 5
+    assert result.stdout.getvalue() == b'foo\n'
+    assert ('kept open' in caplog.text) == exp_warning
@@ -0,0 +1,71 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import os
+import time
+
+import pytest
+
+import fuzzinator
+
+from .common_call import resources_dir
+
+
+@pytest.mark.parametrize('pattern, exp', [
+    ('(?P<bar>[a-z]+)', None),
+    ('mss /foo (?P<bar>[a-z]+) baz/', (('foo ',), (' baz',))),
+    ('mss /a(bc)?d/', (('a',), ('d',))),
+    ('mss /(abc)+d/', (('abc',), ('d',))),
+    ('mss /(ab|cd)x/', (('ab', 'cd'), ('x',))),
+    ('mss /ab|c./', (('ab', 'c'),)),
+    ('mss /ab|c+/', (('ab', 'c'),)),
+    ('mss /ab|x(cd|e)fg/', (('ab', 'fg'),)),
+    ('mss /ab|[cd]/', None),
+    ('mss /(?i)abc/', None),
+    ('mss /(?!abc)def/', (('def',),)),
+])
+def test_regex_automaton_required_literals(pattern, exp):
+    assert fuzzinator.call.RegexAutomaton.required_literals(fuzzinator.call.RegexAutomaton.split_pattern(pattern)[0]) == exp
+
+
+def _sanitizer_logs():
+    sanitizer_dir = os.path.join(resources_dir, 'sanitizer_data')
+    logs = []
+    for fn in sorted(os.listdir(sanitizer_dir)):
+        if fn.endswith('.txt'):
+            with open(os.path.join(sanitizer_dir, fn), 'r') as f:
+                logs.append(f.read().splitlines())
+    return logs
+
+
+def test_regex_automaton_benchmark():
+    # Compare processing the sanitizer logs with the patterns of
+    # SanitizerAutomatonFilter with and without prefiltering lines.
+    instructions = [fuzzinator.call.RegexAutomaton.split_pattern(p) for p in fuzzinator.call.SanitizerAutomatonFilter.SANITIZER_PATTERNS]
+    logs = _sanitizer_logs() * 20
+
+    def run(prefilter):
+        results = []
+        start_time = time.time()
+        for lines in logs:
+            automaton = fuzzinator.call.RegexAutomaton(instructions)
+            if not prefilter:
+                automaton.prefilters = [None] * len(instructions)
+            issue = {}
+            # Process line-by-line to avoid early termination.
+            for line in lines:
+                automaton.process_line(line, issue)
+            results.append(issue)
+        return results, time.time() - start_time
+
+    prefilter_results, prefilter_time = run(prefilter=True)
+    search_results, search_time = run(prefilter=False)
+    lines = sum(len(lines) for lines in logs)
+    print(f'{lines} lines: without prefilter: {search_time / lines * 1e6:.2f}us/line, with prefilter: {prefilter_time / lines * 1e6:.2f}us/line')
+
+    assert prefilter_results == search_results
+    assert prefilter_time < search_time
@@ -0,0 +1,113 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import os
+
+import pytest
+
+import fuzzinator
+
+from fuzzinator.call import result_cache_decorator
+
+
+@pytest.fixture(autouse=True)
+def memory_caches():
+    # Start every test with empty in-memory caches.
+    result_cache_decorator._memory_caches.clear()
+
+
+class MockCountingCall(fuzzinator.call.Call):
+    """
+    Return an issue for tests containing 'crash' and a non-issue otherwise, and
+    count the executions.
+    """
+
+    calls = 0
+
+    def __init__(self, **kwargs):
+        self.init_kwargs = kwargs
+
+    def __call__(self, *, test, **kwargs):
+        MockCountingCall.calls += 1
+        issue = dict(self.init_kwargs, test=test)
+        return issue if b'crash' in test else fuzzinator.call.NonIssue(issue)
+
+
+def _run(call, tests):
+    MockCountingCall.calls = 0
+    with call:
+        outs = [call(test=test) for test in tests]
+    return outs, MockCountingCall.calls
+
+
+@pytest.mark.parametrize('size, tests, exp_calls, exp_hits', [
+    (None, [b'foo', b'crash', b'foo', b'crash'], 2, 2),
+    (1, [b'foo', b'bar', b'foo'], 3, 0),
+    (2, [b'foo', b'bar', b'foo', b'baz', b'bar'], 4, 1),
+])
+def test_result_cache_decorator(size, tests, exp_calls, exp_hits):
+    call_class = fuzzinator.call.ResultCacheDecorator(size=size)(MockCountingCall)
+    call = call_class(foo='bar')
+
+    outs, calls = _run(call, tests)
+    assert calls == exp_calls
+    assert (call.cache_hits, call.cache_misses) == (exp_hits, exp_calls)
+    for test, out in zip(tests, outs):
+        assert out == {'foo': 'bar', 'test': test}
+        assert bool(out) == (b'crash' in test)
+        assert isinstance(out, fuzzinator.call.NonIssue) != (b'crash' in test)
+
+
+def test_result_cache_decorator_config():
+    # Results are not shared between differently configured calls.
+    call_class = fuzzinator.call.ResultCacheDecorator()(MockCountingCall)
+    assert _run(call_class(foo='bar'), [b'crash'])[1] == 1
+    assert _run(call_class(foo='bar'), [b'crash'])[1] == 0
+    assert _run(call_class(foo='baz'), [b'crash']) == ([{'foo': 'baz', 'test': b'crash'}], 1)
+
+
+def test_result_cache_decorator_memory():
+    # Results in memory are shared by the calls of the same configuration,
+    # even if they are decorated separately (e.g., in consecutive jobs).
+    for exp_calls in [1, 0]:
+        call_class = fuzzinator.call.ResultCacheDecorator()(MockCountingCall)
+        assert _run(call_class(foo='bar'), [b'crash'])[1] == exp_calls
+
+
+def test_result_cache_decorator_disk(tmpdir):
+    cache_file = os.path.join(str(tmpdir), 'cache', 'results.sqlite')
+    stamp = os.path.join(str(tmpdir), 'stamp')
+    with open(stamp, 'w') as f:
+        f.write('0')
+
+    # A new decorator object (e.g., in another job process) finds the results
+    # on disk.
+    for exp_calls in [2, 0]:
+        call_class = fuzzinator.call.ResultCacheDecorator(cache_file=cache_file, stamp=f'["{stamp}"]')(MockCountingCall)
+        assert _run(call_class(), [b'foo', b'crash', b'foo'])[1] == exp_calls
+
+    # Changing the stamp invalidates the results.
+    os.utime(stamp, ns=(0, 0))
+    assert _run(call_class(), [b'foo', b'crash'])[1] == 2
+    call_class = fuzzinator.call.ResultCacheDecorator(cache_file=cache_file, stamp=f'["{stamp}"]')(MockCountingCall)
+    assert _run(call_class(), [b'foo', b'crash'])[1] == 0
+
+
+def test_result_cache_decorator_disk_shared(tmpdir):
+    cache_file = os.path.join(str(tmpdir), 'results.sqlite')
+    stamps = [os.path.join(str(tmpdir), f'stamp{i}') for i in range(2)]
+    for stamp in stamps:
+        with open(stamp, 'w') as f:
+            f.write('0')
+    os.utime(stamps[1], ns=(0, 0))
+
+    # SUTs with different stamps do not invalidate each other's results.
+    for exp_calls in [1, 0]:
+        for i, stamp in enumerate(stamps):
+            result_cache_decorator._memory_caches.clear()
+            call_class = fuzzinator.call.ResultCacheDecorator(cache_file=cache_file, stamp=f'["{stamp}"]')(MockCountingCall)
+            assert _run(call_class(sut=i), [b'crash'])[1] == exp_calls
@@ -1,4 +1,4 @@
-# Copyright (c) 2016-2023 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
@@ -7,7 +7,9 @@
 
 import os
 import sys
+import time
 
+import psutil
 import pytest
 
 import fuzzinator
@@ -34,3 +36,93 @@ def test_stream_monitored_subprocess_call(command, cwd, env, end_patterns, test,
         del out['exit_code']
         assert out.pop('time')
     assert out == exp
+
+
+@pytest.mark.skipif(not hasattr(fuzzinator.call, 'StreamMonitoredSubprocessCall'),
+                    reason='platform-dependent component')
+def test_stream_monitored_subprocess_call_benchmark():
+    # Monitoring several megabytes of output must take time linear in its size.
+    lines = 60000
+    call = fuzzinator.call.StreamMonitoredSubprocessCall(command=f'{sys.executable} {os.path.join(resources_dir, "mock_tool.py")} --print-lines {lines} --to-stderr --exit-code 1',
+                                                         end_patterns=f'["mst /(?P<last>line {lines - 1}):/"]')
+    with call:
+        start_time = time.time()
+        out = call(test='foo')
+        end_time = time.time()
+    print(f'{len(out["stderr"])} bytes of stderr: {end_time - start_time:.3f}s')
+
+    assert out['last'] == f'line {lines - 1}'
+    assert len(out['stderr'].splitlines()) == lines
+    assert end_time - start_time < 10
+
+
+@pytest.mark.skipif(not hasattr(fuzzinator.call, 'StreamMonitoredSubprocessCall'),
+                    reason='platform-dependent component')
+def test_stream_monitored_subprocess_call_max_output():
+    # Lines dropped from the captured output are still processed by the
+    # automaton.
+    command = f'{sys.executable} {os.path.join(resources_dir, "mock_tool.py")} --print-lines 10000 {{test}}'
+    call = fuzzinator.call.StreamMonitoredSubprocessCall(command=command, end_patterns='["(?P<line>line 5000):"]', max_output=1000)
+    with call:
+        out = call(test='foo')
+
+    assert out['line'] == 'line 5000'
+    assert out['stdout'].startswith('line 0: ')
+    # The output is read only up to the match.
+    assert 'line 2500:' not in out['stdout']
+    assert 'line 9999:' not in out['stdout']
+    assert out['stdout_truncated'] > 0
+    assert len(out['stdout'].encode('utf-8')) - 1000 < 100
+
+
+@pytest.mark.skipif(not hasattr(fuzzinator.call, 'StreamMonitoredSubprocessCall'),
+                    reason='platform-dependent component')
+@pytest.mark.parametrize('script', [
+    'import sys\nwhile True: sys.stdout.write("y" * 65536)',
+    'import sys\nwhile True: sys.stdout.write("y\\n" * 32768)',
+])
+def test_stream_monitored_subprocess_call_endless_output(script):
+    # An endless output (with or without newlines) can neither delay the
+    # timeout nor accumulate unprocessed in memory.
+    call = fuzzinator.call.StreamMonitoredSubprocessCall(command=f'{sys.executable} -c \'{script}\'', end_patterns='["(?P<never>never)"]', timeout=1, max_output=1000)
+    rss = psutil.Process().memory_info().rss
+    with call:
+        start_time = time.time()
+        out = call(test='foo')
+        end_time = time.time()
+
+    assert end_time - start_time < 3
+    assert psutil.Process().memory_info().rss < rss + 100 * 1024 * 1024
+    assert out['stdout_truncated'] > 0
+    assert len(out['stdout'].encode('utf-8')) - 1000 < 100
+
+
+def _is_dead(pid):
+    try:
+        return psutil.Process(pid).status() == psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return True
+
+
+@pytest.mark.skipif(not hasattr(fuzzinator.call, 'StreamMonitoredSubprocessCall'),
+                    reason='platform-dependent component')
+def test_stream_monitored_subprocess_call_process_group():
+    # Descendants of the SUT that outlive it (and keep the output pipes open)
+    # must be killed together with the SUT, without waiting for them.
+    tests = 5
+    call = fuzzinator.call.StreamMonitoredSubprocessCall(command='sh -c "sleep 30 & echo $! {test}"', end_patterns='["(?P<pid>[0-9]+) (?P<bar>[a-z]+)"]')
+    with call:
+        start_time = time.time()
+        for _ in range(tests):
+            out = call(test='foo')
+            assert out['bar'] == 'foo'
+            # SIGKILL takes effect asynchronously, hence the grace period.
+            pid = int(out['pid'])
+            deadline = time.time() + 1
+            while not _is_dead(pid) and time.time() < deadline:
+                time.sleep(0.01)
+            assert _is_dead(pid)
+        end_time = time.time()
+    print(f'{(end_time - start_time) / tests * 1000:.3f}ms/test')
+
+    assert end_time - start_time < 10
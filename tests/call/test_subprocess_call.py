@@ -8,6 +8,8 @@
 import os
 import sys
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 import fuzzinator
@@ -29,3 +31,55 @@ def test_subprocess_call(command, cwd, env, no_exit_code, test, exp):
         out = call(test=test)
         assert out.pop('time')
         assert out == exp
+
+
+def test_subprocess_call_max_output():
+    command = f'{sys.executable} {os.path.join(resources_dir, "mock_tool.py")} --print-lines 10000 --exit-code 1 {{test}}'
+    call = fuzzinator.call.SubprocessCall(command=command, max_output=1000)
+    with call:
+        out = call(test='foo')
+
+    assert out['stdout'].startswith('line 0: ')
+    assert out['stdout'].endswith(f'line 9999: {"lorem ipsum dolor sit amet " * 3}{linesep}')
+    assert out['stdout_truncated'] > 0
+    assert len(out['stdout'].encode('utf-8')) - 1000 < 100
+    assert 'stderr_truncated' not in out
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='platform-dependent resource limits')
+@pytest.mark.parametrize('command, limits, exp', [
+    (f'{sys.executable} -c "while True: pass"', {'cpu_time_limit': '1'}, 'cpu-timeout'),
+    ('head -c 100000 /dev/zero', {'max_file_size': '10K'}, 'file-size-limit'),
+    (f'{sys.executable} -c "bytearray(1 << 30)"', {'memory_limit': '256M'}, None),
+])
+def test_subprocess_call_resource_limits(tmpdir, command, limits, exp):
+    # Output is redirected to a file to make file size limits effective.
+    call = fuzzinator.call.SubprocessCall(command=f'sh -c \'{command} > {tmpdir.join("out")}\'', timeout=10, **limits)
+    with call:
+        out = call(test='foo')
+
+    assert out['exit_code'] != 0
+    assert out.get('resource_limit') == exp
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='platform-dependent resource limits')
+def test_subprocess_call_resource_limits_threads():
+    # The limits are applied to the subprocesses started by concurrent
+    # threads, too.
+    call = fuzzinator.call.SubprocessCall(command=f'{sys.executable} -c "import resource; print(resource.getrlimit(resource.RLIMIT_CPU)[0])"', no_exit_code=True, cpu_time_limit='3')
+    with call, ThreadPoolExecutor(max_workers=4) as executor:
+        outs = list(executor.map(lambda _: call(test='foo'), range(16)))
+
+    assert all(out['stdout'] == f'3{linesep}' for out in outs)
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='platform-dependent resource limits')
+def test_subprocess_call_resource_limits_no_cgroup(tmpdir):
+    # Without a usable cgroup, the limits fall back to setrlimit.
+    call = fuzzinator.call.SubprocessCall(command=f'{sys.executable} -c "bytearray(1 << 30)"', memory_limit='256M', cgroup=str(tmpdir))
+    with call:
+        out = call(test='foo')
+
+    assert out['exit_code'] != 0
+    assert 'MemoryError' in out['stderr']
+    assert not tmpdir.listdir()
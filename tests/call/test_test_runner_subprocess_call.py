@@ -0,0 +1,53 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import sys
+import time
+
+import pytest
+
+import fuzzinator
+
+# Mock test runner: for every test read from stdin, write 1000 lines and an
+# end marker at once.
+runner = 'import sys\nfor test in sys.stdin:\n    sys.stdout.write("".join(f"{test.strip()} {i}\\n" for i in range(1000)) + "END\\n")\n    sys.stdout.flush()'
+
+
+@pytest.mark.skipif(not hasattr(fuzzinator.call, 'TestRunnerSubprocessCall'),
+                    reason='platform-dependent component')
+@pytest.mark.parametrize('max_output', [None, '1000'])
+def test_test_runner_subprocess_call(max_output):
+    call = fuzzinator.call.TestRunnerSubprocessCall(command=f'{sys.executable} -c \'{runner}\'', end_texts='["END"]', init_wait='False', max_output=max_output)
+    with call:
+        for test in ['foo', 'bar']:
+            out = call(test=test)
+            assert out['exit_code'] is None
+            assert out['stdout'].startswith(f'{test} 0\n')
+            assert out['stdout'].endswith('END\n')
+            if max_output:
+                assert out['stdout_truncated'] > 0
+                assert len(out['stdout'].encode('utf-8')) - 1000 < 100
+            else:
+                assert f'{test} 500\n' in out['stdout']
+                assert 'stdout_truncated' not in out
+
+
+# Mock test runner: for every test read from stdin, write an end marker in
+# two parts, shorter than the marker.
+split_runner = 'import sys, time\nfor test in sys.stdin:\n    for part in ["FINI", "SHED\\n"]:\n        sys.stdout.write(part)\n        sys.stdout.flush()\n        time.sleep(0.2)'
+
+
+@pytest.mark.skipif(not hasattr(fuzzinator.call, 'TestRunnerSubprocessCall'),
+                    reason='platform-dependent component')
+def test_test_runner_subprocess_call_split_end_text():
+    call = fuzzinator.call.TestRunnerSubprocessCall(command=f'{sys.executable} -c \'{split_runner}\'', end_texts='["FINISHED"]', init_wait='False', timeout_per_test='5')
+    with call:
+        start_time = time.time()
+        out = call(test='foo')
+        # The end text is found, i.e., the call does not wait for the timeout.
+        assert time.time() - start_time < 3
+        assert out['stdout'] == 'FINISHED\n'
@@ -0,0 +1,103 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import os
+import sys
+import time
+
+from os.path import join
+
+import pytest
+
+import fuzzinator
+
+from .common_fuzzer import blinesep, resources_dir
+
+
+@pytest.mark.skipif(sys.platform.startswith('win'), reason='the mock AFL is run via its shebang')
+@pytest.mark.parametrize('secondaries, env, exp_instances', [
+    (None, None, 1),
+    ('2', None, 3),
+    ('1', '{"MOCK_AFL_EXIT": "1"}', 2),
+])
+def test_afl_runner(secondaries, env, exp_instances, tmpdir):
+    fuzzer = fuzzinator.fuzzer.AFLRunner(afl_fuzz=join(resources_dir, 'mock_afl_fuzz.py'),
+                                         input=join(resources_dir, 'mock_tests'),
+                                         sut_command='./bin/foo {test}',
+                                         env=env,
+                                         secondaries=secondaries,
+                                         work_dir=str(tmpdir))
+
+    tests = []
+    with fuzzer:
+        # The mock AFL instances report each input as a crash and, unless
+        # told to exit, keep running.
+        for index in range(3 * exp_instances):
+            test = fuzzer(index=index)
+            assert test is not None
+            tests.append(test)
+
+        stats = fuzzer.fuzzer_stats
+        assert stats['instances'] == exp_instances
+        assert stats['execs_done'] == 300 * exp_instances
+        assert stats['execs_per_sec'] == 50 * exp_instances
+
+        if env:
+            assert fuzzer(index=len(tests)) is None
+        else:
+            assert all(instance['proc'].poll() is None for instance in fuzzer.instances)
+
+    assert sorted(tests) == sorted([b'bar' + blinesep, b'baz' + blinesep, b'foo' + blinesep] * exp_instances)
+
+
+@pytest.mark.skipif(sys.platform.startswith('win'), reason='the mock AFL is run via its shebang')
+def test_afl_runner_wait(tmpdir):
+    fuzzer = fuzzinator.fuzzer.AFLRunner(afl_fuzz=join(resources_dir, 'mock_afl_fuzz.py'),
+                                         input=join(resources_dir, 'mock_tests'),
+                                         sut_command='./bin/foo {test}',
+                                         env='{"MOCK_AFL_DELAY": "1.5"}',
+                                         stats_interval='0.2',
+                                         work_dir=str(tmpdir))
+    reports = []
+    fuzzer.stats_callback = lambda: reports.append(fuzzer.fuzzer_stats)
+
+    with fuzzer:
+        start_time, start_cpu_time = time.time(), time.process_time()
+        assert fuzzer(index=0) is not None
+        wall_time, cpu_time = time.time() - start_time, time.process_time() - start_cpu_time
+
+    # Waiting for AFL to set up its output directory does not spin.
+    assert wall_time >= 1
+    assert cpu_time < wall_time / 4
+    # The statistics are reported while waiting.
+    assert len(reports) >= 3
+
+
+@pytest.mark.skipif(sys.platform.startswith('win'), reason='the mock AFL is run via its shebang')
+def test_afl_runner_output(tmpdir):
+    fuzzer = fuzzinator.fuzzer.AFLRunner(afl_fuzz=join(resources_dir, 'mock_afl_fuzz.py'),
+                                         input=join(resources_dir, 'mock_tests'),
+                                         sut_command='./bin/foo {test}',
+                                         work_dir=str(tmpdir))
+    fuzzer.max_output = 10
+
+    with fuzzer:
+        for index in range(3):
+            assert fuzzer(index=index) is not None
+        instance = fuzzer.instances[0]
+        output = instance['output']
+        # Let the mock AFL print its status.
+        time.sleep(1.5)
+        assert os.fstat(output.fileno()).st_size > fuzzer.max_output
+
+        # The output of the running AFL is not kept growing.
+        assert not fuzzer._check_exit(instance)
+        assert os.fstat(output.fileno()).st_size == 0
+
+        # AFL continues writing at the beginning of the truncated file.
+        time.sleep(1.2)
+        assert 0 < os.fstat(output.fileno()).st_size < 100
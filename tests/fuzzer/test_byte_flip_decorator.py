@@ -1,10 +1,12 @@
-# Copyright (c) 2017-2023 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2017-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
 # This file may not be copied, modified, or distributed except
 # according to those terms.
 
+import time
+
 import pytest
 
 import fuzzinator
@@ -46,3 +48,27 @@ def test_byte_flip_decorator(fuzzer_class, fuzzer_init_kwargs, dec_kwargs, exp_f
             assert len(flips) == exp_flip_cnt
 
             index += 1
+
+
+def test_byte_flip_decorator_seed():
+    def _tests(seed, indices):
+        fuzzer = fuzzinator.fuzzer.ByteFlipDecorator(frequency='4', seed=seed)(MockRepeatingFuzzer)(test=b'\x00' * 100, n=100)
+        with fuzzer:
+            return [fuzzer(index=index) for index in indices]
+
+    # The flips of a test depend only on the seed, the index, and the test.
+    assert _tests('42', range(10)) == _tests('42', range(10))
+    assert _tests('42', range(10))[5:] == _tests('42', range(5, 10))
+    assert _tests('42', range(10)) != _tests('43', range(10))
+
+
+@pytest.mark.parametrize('frequency', ['100', '1'])
+def test_byte_flip_decorator_throughput(record_property, frequency):
+    fuzzer = fuzzinator.fuzzer.ByteFlipDecorator(frequency=frequency)(MockRepeatingFuzzer)(test=b'\x00' * (1 << 20), n=10)
+    with fuzzer:
+        start_time = time.perf_counter()
+        size = sum(len(fuzzer(index=index)) for index in range(10))
+        throughput = size / (time.perf_counter() - start_time) / 1e6
+
+    record_property('throughput_mbps', throughput)
+    print(f'ByteFlipDecorator (frequency={frequency}): {throughput:.1f} MB/s')
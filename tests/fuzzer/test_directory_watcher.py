@@ -0,0 +1,54 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import os
+
+import pytest
+
+import fuzzinator
+
+from fuzzinator.fuzzer import directory_watcher
+
+
+@pytest.mark.parametrize('inotify', [True, False])
+def test_directory_watcher(tmpdir, monkeypatch, inotify):
+    if not inotify:
+        monkeypatch.setattr(directory_watcher, '_inotify_libc', lambda: None)
+
+    tmpdir.join('old').write('old')
+    with fuzzinator.fuzzer.DirectoryWatcher(str(tmpdir), poll_interval=0.01) as watcher:
+        assert (watcher.fd is not None) == (inotify and directory_watcher._inotify_libc() is not None)
+
+        # Files present at creation are considered complete.
+        assert watcher.wait(0) == [str(tmpdir.join('old'))]
+
+        # Files being written are not reported until closed (or, when polling,
+        # until they do not change).
+        with open(tmpdir.join('new'), 'w') as f:
+            f.write('new')
+            f.flush()
+            if inotify:
+                assert watcher.wait(0.1) == []
+        assert watcher.wait(1) == [str(tmpdir.join('new'))]
+
+        # Files moved into the directory are reported.
+        tmpdir.join('tmp').mkdir().join('moved').write('moved')
+        os.rename(tmpdir.join('tmp', 'moved'), tmpdir.join('moved'))
+        assert watcher.wait(1) == [str(tmpdir.join('moved'))]
+
+        # Reported files are not reported again, unless forgotten.
+        tmpdir.join('new').write('newer')
+        assert watcher.wait(0.1) == []
+        watcher.forget(str(tmpdir.join('new')))
+        tmpdir.join('new').write('newest')
+        assert watcher.wait(1) == [str(tmpdir.join('new'))]
+
+        # Flushing reports incomplete files, too.
+        with open(tmpdir.join('incomplete'), 'w') as f:
+            f.write('incomplete')
+            f.flush()
+            assert watcher.flush() == [str(tmpdir.join('incomplete'))]
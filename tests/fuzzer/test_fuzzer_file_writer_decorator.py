@@ -1,4 +1,4 @@
-# Copyright (c) 2017-2023 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2017-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
@@ -41,3 +41,42 @@ def test_file_writer_decorator(fuzzer_class, fuzzer_init_kwargs, dec_kwargs, exp
     else:
         assert re.search(pattern=dec_kwargs['filename'].format(uid='.*') + '$', string=out) is not None
         assert not os.path.exists(out)
+
+
+@pytest.mark.parametrize('storage, slots', [
+    ('tmpfs', None),
+    ('tmpfs', '2'),
+    ('memfd', '2'),
+])
+def test_file_writer_decorator_storage(storage, slots, tmpdir):
+    fuzzer_class = fuzzinator.fuzzer.FileWriterDecorator(filename='baz{uid}.txt', storage=storage, slots=slots, work_dir=str(tmpdir))(MockRepeatingFuzzer)
+    fuzzer = fuzzer_class(test=b'init_bar', n=3)
+
+    paths = set()
+    with fuzzer:
+        for index in range(3):
+            out = fuzzer(index=index)
+            paths.add(out)
+            with open(out, 'rb') as f:
+                assert f.read() == b'init_bar'
+            fuzzer.feedback(None)
+
+    assert len(paths) == int(slots or 1)
+    if storage == 'tmpfs':
+        assert not any(os.path.exists(path) for path in paths)
+
+
+@pytest.mark.parametrize('storage', ['tmpfs', 'memfd'])
+def test_file_writer_decorator_storage_in_use(storage, tmpdir):
+    fuzzer_class = fuzzinator.fuzzer.FileWriterDecorator(filename='baz{uid}.txt', storage=storage, slots='2', work_dir=str(tmpdir))(MockRepeatingFuzzer)
+    fuzzer = fuzzer_class(test=b'init_bar', n=4)
+
+    with fuzzer:
+        outs = [fuzzer(index=0), fuzzer(index=1)]
+        assert outs[0] != outs[1]
+        # The files of tests without feedback are not overwritten.
+        with pytest.raises(RuntimeError):
+            fuzzer(index=2)
+
+        fuzzer.feedback(None)
+        assert fuzzer(index=3) == outs[0]
@@ -1,10 +1,15 @@
-# Copyright (c) 2016-2023 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
 # This file may not be copied, modified, or distributed except
 # according to those terms.
 
+import mmap
+import subprocess
+import sys
+
+from multiprocessing import Process, Queue
 from os.path import join
 
 import pytest
@@ -36,3 +41,138 @@ def test_list_directory(pattern, contents, exp):
             index += 1
 
     assert tests == exp
+
+
+def _list(fuzzer, batch=None):
+    tests = []
+    with fuzzer:
+        while batch is None or len(tests) < batch:
+            test = fuzzer(index=len(tests))
+            if test is None:
+                break
+            tests.append(test)
+            fuzzer.feedback(None)
+    return tests
+
+
+def test_list_directory_relative(monkeypatch):
+    monkeypatch.chdir(mock_tests)
+    assert _list(fuzzinator.fuzzer.ListDirectory(pattern=join('**', '*.txt'), contents=False)) == ['bar.txt', 'baz.txt', 'foo.txt', join('subdir', 'qux.txt')]
+
+
+def test_list_directory_resume(tmpdir):
+    pattern = join(mock_tests, '**', '*')
+    all_tests = _list(fuzzinator.fuzzer.ListDirectory(pattern=pattern, contents=False))
+    assert len(all_tests) == 4
+
+    # Later fuzz jobs continue where the previous ones stopped.
+    fuzzer = fuzzinator.fuzzer.ListDirectory(pattern=pattern, contents=False, work_dir=str(tmpdir.join('job')))
+    assert _list(fuzzer, batch=1) == all_tests[:1]
+    assert _list(fuzzer, batch=2) == all_tests[1:3]
+    assert _list(fuzzinator.fuzzer.ListDirectory(pattern=pattern, contents=False, work_dir=str(tmpdir.join('other-job')))) == all_tests[3:]
+
+    # Once exhausted, the files are listed from the beginning again.
+    assert _list(fuzzer) == all_tests
+
+
+def test_list_directory_resume_unprocessed(tmpdir):
+    pattern = join(mock_tests, '**', '*')
+    all_tests = _list(fuzzinator.fuzzer.ListDirectory(pattern=pattern, contents=False))
+
+    # Files listed but not processed (e.g., prefetched tests) are listed again
+    # by the next fuzz job, even if the listing is exhausted.
+    fuzzer = fuzzinator.fuzzer.ListDirectory(pattern=pattern, contents=False, work_dir=str(tmpdir.join('job')))
+    with fuzzer:
+        assert [fuzzer(index=index) for index in range(3)] == all_tests[:3]
+        fuzzer.feedback(None)
+    assert _list(fuzzer, batch=1) == all_tests[1:2]
+
+    with fuzzer:
+        assert [fuzzer(index=index) for index in range(3)] == all_tests[2:] + [None]
+        fuzzer.feedback(None)
+    assert _list(fuzzer) == all_tests[3:]
+    assert _list(fuzzer) == all_tests
+
+
+def test_list_directory_hidden(tmpdir):
+    # Names starting with a dot are matched by wildcards, as by pathlib.
+    for path in [('.foo',), ('bar',), ('.baz', 'qux'), ('.baz', '.quux')]:
+        tmpdir.join(*path).write('', ensure=True)
+
+    assert _list(fuzzinator.fuzzer.ListDirectory(pattern=join(str(tmpdir), '*'), contents=False)) == [join(str(tmpdir), '.foo'), join(str(tmpdir), 'bar')]
+    assert _list(fuzzinator.fuzzer.ListDirectory(pattern=join(str(tmpdir), '**', '*'), contents=False)) == [join(str(tmpdir), *path) for path in [('.baz', '.quux'), ('.baz', 'qux'), ('.foo',), ('bar',)]]
+
+
+def test_list_directory_shards(tmpdir):
+    pattern = join(mock_tests, '**', '*')
+    fuzzers = [fuzzinator.fuzzer.ListDirectory(pattern=pattern, contents=False, shards='2', state_dir=str(tmpdir)) for _ in range(3)]
+
+    with fuzzers[0], fuzzers[1], fuzzers[2]:
+        shards = [[], []]
+        for fuzzer in fuzzers[:2]:
+            while True:
+                test = fuzzer(index=0)
+                if test is None:
+                    break
+                shards[fuzzer.shard].append(test)
+
+        # All the shards are claimed.
+        assert fuzzers[2](index=0) is None
+
+    assert sorted(shards[0] + shards[1]) == _list(fuzzinator.fuzzer.ListDirectory(pattern=pattern, contents=False))
+    assert shards[0] and shards[1]
+
+    # The released shards can be claimed again.
+    assert len(_list(fuzzers[2])) == len(shards[0])
+
+
+def test_list_directory_stale_claim(tmpdir):
+    pattern = join(mock_tests, '**', '*')
+    # The claim of a terminated process does not block the shard.
+    proc = subprocess.Popen([sys.executable, '-c', 'pass'])
+    proc.wait()
+    tmpdir.join(f'shard-0.claim-{proc.pid}-0').write('')
+
+    assert len(_list(fuzzinator.fuzzer.ListDirectory(pattern=pattern, contents=False, state_dir=str(tmpdir)))) == 4
+    assert not tmpdir.join(f'shard-0.claim-{proc.pid}-0').exists()
+
+
+def _claim(pattern, state_dir, shards, release):
+    fuzzer = fuzzinator.fuzzer.ListDirectory(pattern=pattern, contents=False, state_dir=state_dir)
+    with fuzzer:
+        shards.put(fuzzer.shard)
+        # Hold the shard until all the processes have tried to claim it.
+        release.get()
+
+
+def test_list_directory_concurrent_claims(tmpdir):
+    n = 8
+    shards, release = Queue(), Queue()
+    procs = [Process(target=_claim, args=(join(mock_tests, '*'), str(tmpdir), shards, release)) for _ in range(n)]
+    for proc in procs:
+        proc.start()
+    claimed = [shards.get(timeout=30) for _ in range(n)]
+    for _ in range(n):
+        release.put(None)
+    for proc in procs:
+        proc.join()
+
+    # The only shard is never given to two fuzz jobs at the same time.
+    assert claimed.count(0) <= 1
+
+
+def test_list_directory_mmap(tmpdir):
+    tmpdir.join('small').write_binary(b'small')
+    tmpdir.join('large').write_binary(b'large' * 1024)
+    fuzzer = fuzzinator.fuzzer.ListDirectory(pattern=join(str(tmpdir), '*'), mmap_threshold='1K')
+    with fuzzer:
+        large = fuzzer(index=0)
+        small = fuzzer(index=1)
+        assert isinstance(large, mmap.mmap)
+        assert large[:] == b'large' * 1024
+        assert small == b'small'
+
+        issue = {'test': large}
+        fuzzer.feedback(issue)
+        assert issue['test'] == b'large' * 1024
+        assert isinstance(issue['test'], bytes)
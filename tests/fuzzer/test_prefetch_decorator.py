@@ -0,0 +1,92 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import time
+
+import pytest
+
+import fuzzinator
+
+from .common_fuzzer import MockExhaustedFuzzer, MockRepeatingFuzzer
+
+
+class MockIndexedFuzzer(fuzzinator.fuzzer.Fuzzer):
+    """
+    Generate ``n`` tests, maintain the ``test`` and ``index`` attributes
+    (skipping every second index), and record the received indices and
+    feedback.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.indices = []
+        self.feedbacks = []
+
+    def __call__(self, *, index):
+        self.indices.append(index)
+        if len(self.indices) > self.n:
+            return None
+
+        # Give time for the job to interleave with the generation.
+        time.sleep(0.001)
+        self.index = index + 2
+        self.test = f'test-{index}'
+        return f'call-{index}'
+
+    def feedback(self, issue):
+        self.feedbacks.append(issue)
+
+
+@pytest.mark.parametrize('fuzzer_class, fuzzer_init_kwargs, size, exp', [
+    (MockExhaustedFuzzer, {}, None, []),
+    (MockRepeatingFuzzer, {'test': b'foo', 'n': 10}, None, [b'foo'] * 10),
+    (MockRepeatingFuzzer, {'test': b'foo', 'n': 10}, '1', [b'foo'] * 10),
+])
+def test_prefetch_decorator(fuzzer_class, fuzzer_init_kwargs, size, exp):
+    fuzzer = fuzzinator.fuzzer.PrefetchDecorator(size=size)(fuzzer_class)(**fuzzer_init_kwargs)
+
+    tests = []
+    with fuzzer:
+        index = 0
+        while True:
+            test = fuzzer(index=index)
+            if test is None:
+                break
+            tests.append(test)
+            index += 1
+
+        # The fuzzer remains exhausted.
+        assert fuzzer(index=index) is None
+
+    assert tests == exp
+    assert fuzzer.prefetch_stats['requests'] == len(exp) + 1
+
+
+def test_prefetch_decorator_protocol():
+    fuzzer = fuzzinator.fuzzer.PrefetchDecorator(size='4')(MockIndexedFuzzer)(n=20)
+    assert not hasattr(fuzzer, 'test')
+
+    with fuzzer:
+        generated = 0
+        while True:
+            test = fuzzer(index=generated)
+            if test is None:
+                break
+
+            # The attributes belong to the test just received, even if the
+            # producer has generated further tests since.
+            assert test == f'call-{generated}'
+            assert fuzzer.test == f'test-{generated}'
+            assert fuzzer.index == generated + 2
+            generated = fuzzer.index
+
+            fuzzer.feedback(test)
+
+    assert generated == 40
+    assert fuzzer.indices == list(range(0, 42, 2))
+    assert fuzzer.feedbacks == [f'call-{i}' for i in range(0, 40, 2)]
+    assert set(fuzzer.prefetch_stats) == {'size', 'requests', 'depth', 'empty', 'full'}
@@ -1,10 +1,12 @@
-# Copyright (c) 2016-2021 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
 # This file may not be copied, modified, or distributed except
 # according to those terms.
 
+import time
+
 import pytest
 
 import fuzzinator
@@ -22,3 +24,27 @@ def test_random_content(fuzzer_kwargs, exp_min_len, exp_max_len):
             out = fuzzer(index=index)
             out_len = len(out)
             assert exp_min_len <= out_len <= exp_max_len
+
+
+def test_random_content_seed():
+    def _tests(seed, indices):
+        fuzzer = fuzzinator.fuzzer.RandomContent(min_length='10', max_length='100', seed=seed)
+        with fuzzer:
+            return [fuzzer(index=index) for index in indices]
+
+    # The test generated for an index depends only on the seed and the index.
+    assert _tests('42', range(10)) == _tests('42', range(10))
+    assert _tests('42', range(10))[5:] == _tests('42', range(5, 10))
+    assert _tests('42', range(10)) != _tests('43', range(10))
+    assert all(set(test) <= set(fuzzinator.fuzzer.RandomContent.alphabet) for test in _tests(None, range(10)))
+
+
+def test_random_content_throughput(record_property):
+    fuzzer = fuzzinator.fuzzer.RandomContent(min_length=str(1 << 20), max_length=str(1 << 20))
+    with fuzzer:
+        start_time = time.perf_counter()
+        size = sum(len(fuzzer(index=index)) for index in range(10))
+        throughput = size / (time.perf_counter() - start_time) / 1e6
+
+    record_property('throughput_mbps', throughput)
+    print(f'RandomContent: {throughput:.1f} MB/s')
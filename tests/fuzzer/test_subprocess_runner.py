@@ -1,4 +1,4 @@
-# Copyright (c) 2016-2023 Renata Hodovan, Akos Kiss.
+# Copyright (c) 2016-2026 Renata Hodovan, Akos Kiss.
 #
 # Licensed under the BSD 3-Clause License
 # <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
@@ -6,6 +6,7 @@
 # according to those terms.
 
 import sys
+import time
 
 from os.path import join
 
@@ -24,8 +25,9 @@ from .common_fuzzer import blinesep, resources_dir
     (f'{sys.executable} {join(resources_dir, "mock_fuzzer.py")} -o {{work_dir}}', resources_dir, '{"IDIR": "mock_tests"}', True, {b'foo' + blinesep, b'bar' + blinesep, b'baz' + blinesep}),
     (f'{sys.executable} {join(resources_dir, "mock_fuzzer.py")} -i mock_tests -o {{work_dir}}', resources_dir, None, False, {join('{tmpdir}', 'foo.txt'), join('{tmpdir}', 'bar.txt'), join('{tmpdir}', 'baz.txt')}),
 ])
-def test_subprocess_runner(command, cwd, env, contents, exp, tmpdir):
-    fuzzer = fuzzinator.fuzzer.SubprocessRunner(command=command, cwd=cwd, env=env, contents=contents, work_dir=str(tmpdir))
+@pytest.mark.parametrize('streaming', [None, 'True'])
+def test_subprocess_runner(command, cwd, env, contents, exp, streaming, tmpdir):
+    fuzzer = fuzzinator.fuzzer.SubprocessRunner(command=command, cwd=cwd, env=env, contents=contents, streaming=streaming, work_dir=str(tmpdir))
     with fuzzer:
         tests = set()
         index = 0
@@ -41,3 +43,23 @@ def test_subprocess_runner(command, cwd, env, contents, exp, tmpdir):
         exp = {e.format(tmpdir=tmpdir) for e in exp}
 
     assert tests == exp
+
+
+def test_subprocess_runner_streaming_max_pending(tmpdir):
+    work_dir = tmpdir.join('work')
+    command = 'sh -c "for i in $(seq 30); do echo $i > {work_dir}/test-$i; sleep 0.02; done"'
+    fuzzer = fuzzinator.fuzzer.SubprocessRunner(command=command, streaming='True', max_pending='3', work_dir=str(work_dir))
+    with fuzzer:
+        tests = []
+        while True:
+            test = fuzzer(index=len(tests))
+            if test is None:
+                break
+            tests.append(int(test))
+
+            # The generator is suspended while enough tests are waiting, and
+            # the returned tests are removed.
+            assert len(work_dir.listdir()) <= 5
+            time.sleep(0.05)
+
+    assert sorted(tests) == list(range(1, 31))
@@ -0,0 +1,102 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import configparser
+import os
+import sys
+
+import fuzzinator
+
+resources_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources')
+
+
+class MockDB:
+
+    def __init__(self):
+        self.issues = []
+        self.execs = 0
+
+    def add_issue(self, issue):
+        self.issues.append(issue)
+        return True
+
+    def update_stat(self, sut, fuzzer, subconfig, batch, issues, time):
+        self.execs += batch
+
+
+def test_fuzz_job_batch(tmpdir):
+    # The fuzzer lists the tests from a directory, i.e., it cannot generate
+    # the tests after an issue-triggering test again.
+    tests = [b'a', b'crash1', b'crash2', b'd', b'e', b'f', b'g', b'h']
+    for i, test in enumerate(tests):
+        tmpdir.join('tests', f'test-{i}').write_binary(test, ensure=True)
+
+    config = configparser.ConfigParser(interpolation=None)
+    config.read_dict({
+        'fuzzinator': {'cost_budget': '1', 'work_dir': str(tmpdir.join('work'))},
+        'sut.foo': {'call': 'fuzzinator.call.BatchSubprocessCall'},
+        'sut.foo.call': {
+            'command': f'{sys.executable} {os.path.join(resources_dir, "mock_tool.py")} --fail-on crash {{tests}}',
+            'batch_size': '4',
+        },
+        'fuzz.foo-with-list': {'sut': 'foo', 'fuzzer': 'fuzzinator.fuzzer.ListDirectory', 'batch': 'inf'},
+        'fuzz.foo-with-list.fuzzer': {'pattern': str(tmpdir.join('tests', '*'))},
+    })
+    db = MockDB()
+
+    job = fuzzinator.job.FuzzJob(id=0, config=config, subconfig_id='subconfig', fuzzer_name='foo-with-list', db=db, listener=fuzzinator.listener.ListenerManager())
+    new_issues = job.run()
+
+    # All the tests are executed, even those after an issue in a batch.
+    assert sorted(issue['test'] for issue in new_issues) == [b'crash1', b'crash2']
+    assert db.execs == len(tests)
+
+
+class MockEnrichDB:
+
+    def __init__(self):
+        self.issues = {}
+
+    def add_issue(self, issue):
+        # Merge the stored properties into the issue, as MongoDriver does.
+        stored = self.issues.get(issue['id'])
+        if stored:
+            issue.update(stored)
+            return False
+        issue['_id'] = issue['id']
+        self.issues[issue['id']] = dict(issue)
+        return True
+
+    def update_issue_by_oid(self, oid, _set):
+        self.issues[oid].update(_set)
+
+
+def test_call_job_enrich(tmpdir):
+    config = configparser.ConfigParser(interpolation=None)
+    config.read_dict({
+        'fuzzinator': {'cost_budget': '1', 'work_dir': str(tmpdir.join('work'))},
+        'sut.foo': {'call': 'fuzzinator.call.SubprocessCall', 'enrich_call': 'fuzzinator.call.SubprocessCall'},
+        'fuzz.foo-with-random': {'sut': 'foo', 'fuzzer': 'fuzzinator.fuzzer.RandomContent'},
+    })
+    db = MockEnrichDB()
+    requests = []
+
+    job = fuzzinator.job.FuzzJob(id=0, config=config, subconfig_id='subconfig', fuzzer_name='foo-with-random', db=db, listener=fuzzinator.listener.ListenerManager())
+    job.enrich_callback = lambda issue: requests.append(issue['id'])
+
+    # The enrichment is requested as soon as the issue is stored, and again for
+    # duplicates while it is pending (e.g., if the requesting job was killed).
+    job.add_issue({'id': 'foo', 'test': b'foo'}, new_issues=[])
+    assert requests == ['foo'] and db.issues['foo']['enriched'] is None
+    job.add_issue({'id': 'foo', 'test': b'foo'}, new_issues=[])
+    assert requests == ['foo', 'foo']
+
+    # Enriched issues and failed enrichments are not requested again.
+    for enriched in [False, 'now']:
+        db.issues['foo']['enriched'] = enriched
+        job.add_issue({'id': 'foo', 'test': b'foo'}, new_issues=[])
+        assert requests == ['foo', 'foo']
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import argparse
+import os
+import shutil
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mock AFL that reports the files of its input directory as crashes, one by one (after MOCK_AFL_DELAY seconds, if set), and keeps running (unless the MOCK_AFL_EXIT environment variable is set).')
+    parser.add_argument('-i', metavar='DIR', required=True, help='input directory')
+    parser.add_argument('-o', metavar='DIR', required=True, help='output directory')
+    parser.add_argument('-M', metavar='NAME', help='name of the main instance')
+    parser.add_argument('-S', metavar='NAME', help='name of a secondary instance')
+    parser.add_argument('-t', metavar='MSEC', help='timeout (ignored)')
+    parser.add_argument('-x', metavar='FILE', help='dictionary (ignored)')
+    parser.add_argument('command', nargs=argparse.REMAINDER, help='the target command (ignored)')
+    args = parser.parse_args()
+
+    # Simulate the calibration of the initial test cases.
+    time.sleep(float(os.getenv('MOCK_AFL_DELAY', '0')))
+
+    out_dir = os.path.join(args.o, args.M or args.S or '')
+    crash_dir = os.path.join(out_dir, 'crashes')
+    os.makedirs(crash_dir, exist_ok=True)
+    with open(os.path.join(crash_dir, 'README.txt'), 'w') as f:
+        f.write('Mock AFL crashes.\n')
+
+    for i, name in enumerate(sorted(entry.name for entry in os.scandir(args.i) if entry.is_file())):
+        with open(os.path.join(out_dir, 'fuzzer_stats'), 'w') as f:
+            f.write(f'execs_done        : {(i + 1) * 100}\n'
+                    f'execs_per_sec     : 50.00\n'
+                    f'saved_crashes     : {i + 1}\n')
+        shutil.copy(os.path.join(args.i, name), os.path.join(crash_dir, f'id:{i:06d},sig:11,src:{name}'))
+        print(f'[+] Saved crash #{i} from {name}', flush=True)
+        time.sleep(0.05)
+
+    if os.getenv('MOCK_AFL_EXIT'):
+        return
+
+    while True:
+        time.sleep(1)
+        print(f'[*] Fuzzing, {len(os.listdir(crash_dir)) - 1} crashes saved', flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+/*
+ * Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+ *
+ * Licensed under the BSD 3-Clause License
+ * <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+ * This file may not be copied, modified, or distributed except
+ * according to those terms.
+ */
+
+/*
+ * Stand-in for a SUT with costly initialization: echoes its standard input and
+ * exits with code 1 if the input starts with 'X'. If file descriptor 199 is
+ * open, it serves the forkserver protocol of AFL after initialization.
+ */
+
+#include <fcntl.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <sys/wait.h>
+#include <time.h>
+#include <unistd.h>
+
+static void init(void) {
+    struct timespec ts = { 0, 20 * 1000 * 1000 };
+    nanosleep(&ts, NULL);
+}
+
+static void forkserver(void) {
+    int msg = 0;
+
+    if (fcntl(199, F_GETFD) == -1 || write(199, &msg, 4) != 4)
+        return;
+
+    while (read(198, &msg, 4) == 4) {
+        int status;
+        pid_t pid = fork();
+        if (pid == 0) {
+            close(198);
+            close(199);
+            return;
+        }
+        if (write(199, &pid, 4) != 4 || waitpid(pid, &status, 0) < 0 || write(199, &status, 4) != 4)
+            break;
+    }
+    exit(0);
+}
+
+int main(void) {
+    char buf[4096];
+    size_t n, total = 0;
+    int first = -1;
+
+    init();
+    forkserver();
+
+    while ((n = fread(buf, 1, sizeof(buf), stdin)) > 0) {
+        if (total == 0)
+            first = buf[0];
+        fwrite(buf, 1, n, stdout);
+        total += n;
+    }
+    return first == 'X' ? 1 : 0;
+}
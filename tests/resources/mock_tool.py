@@ -10,9 +10,26 @@
 import argparse
 import os
 import signal
+import struct
 import sys
 
 
+def forkserver():
+    # Serve the forkserver protocol of AFL on file descriptors 198 and 199, and
+    # return in the forked children only.
+    os.write(199, struct.pack('i', 0))
+    while len(os.read(198, 4)) == 4:
+        pid = os.fork()
+        if pid == 0:
+            os.close(198)
+            os.close(199)
+            return
+        os.write(199, struct.pack('i', pid))
+        _, status = os.waitpid(pid, 0)
+        os.write(199, struct.pack('i', status))
+    sys.exit(0)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Mock tool with control over its output & termination.')
     parser.add_argument('--print-args', action='store_true', default=False,
@@ -23,14 +40,23 @@ def main():
                         help='echo the standard input')
     parser.add_argument('--to-stderr', action='store_true', default=False,
                         help='write to standard error instead of standard output')
+    parser.add_argument('--print-lines', metavar='N', type=int, default=0,
+                        help='print N numbered lines of filler text')
+    parser.add_argument('--fail-on', metavar='TEXT', type=str, default=None,
+                        help='exit with code 1 if any of the files given as arguments contains TEXT')
     parser.add_argument('--crash', action='store_true', default=False,
                         help='crash process after output')
     parser.add_argument('--exit-code', metavar='N', type=int, default=0,
                         help='terminate process with given exit code (default: %(default)s)')
+    parser.add_argument('--forkserver', action='store_true', default=False,
+                        help='act as a forkserver and perform the actions in forked children')
     parser.add_argument('args', nargs='*',
                         help='arbitrary command line arguments')
     args = parser.parse_args()
 
+    if args.forkserver:
+        forkserver()
+
     out = sys.stderr if args.to_stderr else sys.stdout
 
     if args.print_args:
@@ -40,10 +66,22 @@ def main():
     if args.print_env is not None:
         print(os.getenv(args.print_env, ''), file=out, flush=True)
 
+    if args.print_lines:
+        for i in range(args.print_lines):
+            print(f'line {i}: {"lorem ipsum dolor sit amet " * 3}', file=out)
+        out.flush()
+
     if args.echo_stdin:
         for line in sys.stdin:
             print(line, file=out, end='', flush=True)
 
+    if args.fail_on is not None:
+        for arg in args.args:
+            with open(arg, 'r') as f:
+                if args.fail_on in f.read():
+                    print(arg, file=out, flush=True)
+                    sys.exit(1)
+
     if args.crash:
         os.kill(os.getpid(), signal.SIGSEGV)
 
@@ -0,0 +1,20 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import pytest
+
+import fuzzinator
+
+
+@pytest.mark.parametrize('fuzzers, selectable, exp', [
+    (['foo', 'bar', 'baz'], [['foo', 'bar', 'baz']] * 4, ['foo', 'bar', 'baz', 'foo']),
+    (['foo', 'bar', 'baz'], [['foo', 'baz']] * 3, ['foo', 'baz', 'foo']),
+    (['foo', 'bar', 'baz'], [['bar'], ['foo', 'bar', 'baz'], ['foo', 'baz']], ['bar', 'baz', 'foo']),
+])
+def test_round_robin_scheduler(fuzzers, selectable, exp):
+    scheduler = fuzzinator.scheduler.RoundRobinScheduler(fuzzers=fuzzers)
+    assert [scheduler(fuzzers=names) for names in selectable] == exp
@@ -0,0 +1,40 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import configparser
+import random
+
+from collections import Counter
+
+import fuzzinator
+
+
+class MockDB:
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def get_stats(self, filter=None):
+        return [{'sut': 'sut', 'fuzzer': fuzzer,
+                 'subconfigs': [{'subconfig': 'current', 'unique': unique, 'time': time},
+                                {'subconfig': 'old', 'unique': 1000, 'time': 1}]}
+                for fuzzer, (unique, time) in self.stats.items() if fuzzer in filter['fuzzer']['$in']]
+
+
+def test_thompson_sampling_scheduler():
+    config = configparser.ConfigParser()
+    config.read_dict({'fuzzinator': {'cost_budget': '4'}, 'sut.sut': {}})
+    fuzzers = {name: {'sut': 'sut', 'subconfig': 'current'} for name in ['foo', 'bar', 'baz']}
+    db = MockDB({'foo': (100, 1000), 'bar': (1, 1000), 'baz': (0, 1000)})
+
+    random.seed(42)
+    scheduler = fuzzinator.scheduler.ThompsonSamplingScheduler(fuzzers=fuzzers, config=config, db=db)
+    selected = Counter(scheduler(fuzzers=['foo', 'bar', 'baz']) for _ in range(100))
+    assert selected.most_common(1)[0][0] == 'foo'
+
+    # Only selectable fuzz jobs may be returned.
+    assert {scheduler(fuzzers=['bar', 'baz']) for _ in range(100)} <= {'bar', 'baz'}
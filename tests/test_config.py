@@ -0,0 +1,143 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import configparser
+import gc
+import os
+import time
+import weakref
+
+import chardet
+import pytest
+
+from fuzzinator.call import FileWriterDecorator
+from fuzzinator.config import _factory_cache, Config, config_get_object, StreamDecoder
+
+resources_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources')
+
+
+def test_config_get_object_cache(tmp_path):
+    config = configparser.ConfigParser()
+    config.read_dict({
+        'fuzzinator': {'work_dir': str(tmp_path)},
+        'sut.foo': {
+            'call': 'fuzzinator.call.SubprocessCall',
+            'call.decorate(0)': 'fuzzinator.call.FileWriterDecorator',
+        },
+        'sut.foo.call': {'command': 'foo {test}'},
+        'sut.foo.call.decorate(0)': {'filename': 'test-{uid}.txt'},
+    })
+
+    call1 = config_get_object(config, 'sut.foo', 'call')
+    factory = _factory_cache[('sut.foo', 'call')]
+    call2 = config_get_object(config, 'sut.foo', 'call', init_kwargs={'timeout': '10'})
+    assert _factory_cache[('sut.foo', 'call')] is factory
+    assert call1 is not call2
+    assert call1.command == call2.command == 'foo {test}'
+    assert call2.timeout == 10
+
+    # The decorators (and their work_dirs) are not shared.
+    assert type(call1) is not type(call2)
+    decorators = [cell.cell_contents for call in (call1, call2) for cell in type(call).__init__.__closure__ if isinstance(cell.cell_contents, FileWriterDecorator)]
+    assert len(decorators) == 2
+    assert decorators[0].work_dir != decorators[1].work_dir
+
+    config.set('sut.foo.call.decorate(0)', 'filename', 'bar-{uid}.txt')
+    config_get_object(config, 'sut.foo', 'call')
+    assert _factory_cache[('sut.foo', 'call')] is not factory
+
+    config.set('sut.foo.call', 'command', 'bar {test}')
+    call4 = config_get_object(config, 'sut.foo', 'call')
+    assert call4.command == 'bar {test}'
+    factory = _factory_cache[('sut.foo', 'call')]
+
+    config.read_dict({'sut.bar': {'call': 'fuzzinator.call.SubprocessCall'}})
+    config_get_object(config, 'sut.foo', 'call')
+    assert _factory_cache[('sut.foo', 'call')] is factory
+
+    assert config_get_object(config, 'sut.foo', 'reduce') is None
+
+    # The decorated classes are not kept alive by the caches.
+    call_class = weakref.ref(type(call4))
+    del call1, call2, call4
+    gc.collect()
+    assert call_class() is None
+
+
+def test_config_get_object_generation(tmp_path):
+    config = Config()
+    config.read_dict({
+        'fuzzinator': {'work_dir': str(tmp_path)},
+        'sut.foo': {'call': 'fuzzinator.call.SubprocessCall'},
+        'sut.foo.call': {'command': 'foo {test}'},
+    })
+
+    config_get_object(config, 'sut.foo', 'call')
+    factory = _factory_cache[('sut.foo', 'call')]
+    config_get_object(config, 'sut.foo', 'call')
+    assert _factory_cache[('sut.foo', 'call')] is factory
+
+    # Every kind of change outdates the cached entries.
+    for change in [lambda: config['sut.foo.call'].__setitem__('command', 'bar {test}'),
+                   lambda: config.read_string('[sut.foo.call]\ncommand=baz {test}\ntimeout=5\n'),
+                   lambda: config.remove_option('sut.foo.call', 'timeout'),
+                   lambda: config.add_section('sut.bar')]:
+        generation = config.generation
+        change()
+        assert config.generation != generation
+        config_get_object(config, 'sut.foo', 'call')
+        assert _factory_cache[('sut.foo', 'call')] is not factory
+        factory = _factory_cache[('sut.foo', 'call')]
+    assert config_get_object(config, 'sut.foo', 'call').command == 'baz {test}'
+
+    # The generations of different configs never match.
+    other = Config()
+    other.read_dict({
+        'fuzzinator': {'work_dir': str(tmp_path)},
+        'sut.foo': {'call': 'fuzzinator.call.SubprocessCall'},
+        'sut.foo.call': {'command': 'qux {test}'},
+    })
+    assert config_get_object(other, 'sut.foo', 'call').command == 'qux {test}'
+
+
+@pytest.mark.parametrize('text, encoding, chunk_size', [
+    ('foo bar', None, 2),
+    ('hélló wörld €', None, 1),
+    ('hélló wörld €', 'utf-8', 3),
+    ('hélló wörld, hélló wörld, hélló wörld', 'latin-1', 4),
+])
+def test_stream_decoder(text, encoding, chunk_size):
+    b = text.encode(encoding or 'utf-8')
+    decoder = StreamDecoder(encoding)
+    out = ''.join(decoder.decode(b[i:i + chunk_size]) for i in range(0, len(b), chunk_size)) + decoder.decode(b'', final=True)
+    assert out == text
+
+
+def test_stream_decoder_benchmark():
+    # Compare the throughput of decoding sanitizer logs in 512-byte chunks
+    # with detecting the encoding of every chunk.
+    sanitizer_dir = os.path.join(resources_dir, 'sanitizer_data')
+    log = b''
+    for fn in sorted(os.listdir(sanitizer_dir)):
+        if fn.endswith('.txt'):
+            with open(os.path.join(sanitizer_dir, fn), 'rb') as f:
+                log += f.read()
+    log = log * (512 * 1024 // len(log) + 1)
+    chunks = [log[i:i + 512] for i in range(0, len(log), 512)]
+
+    start_time = time.time()
+    detect_out = ''.join(chunk.decode(chardet.detect(chunk)['encoding'] or 'latin-1', errors='ignore') for chunk in chunks)
+    detect_time = time.time() - start_time
+
+    start_time = time.time()
+    decoder = StreamDecoder()
+    stream_out = ''.join(decoder.decode(chunk) for chunk in chunks) + decoder.decode(b'', final=True)
+    stream_time = time.time() - start_time
+
+    print(f'{len(log)} bytes: detection per chunk: {len(log) / detect_time / 1e6:.2f}MB/s, StreamDecoder: {len(log) / stream_time / 1e6:.2f}MB/s')
+    assert stream_out == log.decode('utf-8') == detect_out
+    assert stream_time < detect_time
@@ -0,0 +1,55 @@
+# Copyright (c) 2026 Renata Hodovan, Akos Kiss.
+#
+# Licensed under the BSD 3-Clause License
+# <LICENSE.rst or https://opensource.org/licenses/BSD-3-Clause>.
+# This file may not be copied, modified, or distributed except
+# according to those terms.
+
+import pickle
+import time
+
+from pymongo import MongoClient
+
+from fuzzinator.mongo_driver import MongoDriver
+
+# Neither creating a client nor getting its database connects to the server,
+# thus no MongoDB instance is needed.
+db_uri = 'mongodb://localhost/fuzzinator'
+
+
+def test_mongo_driver_client_reuse():
+    driver = MongoDriver(db_uri, 100)
+    try:
+        assert driver._client is None
+        db = driver._db
+        assert driver._client is not None
+        assert driver._db.client is db.client
+
+        # The client is not transferred with the driver.
+        assert pickle.loads(pickle.dumps(driver))._client is None
+    finally:
+        driver.close()
+    assert driver._client is None
+
+
+def test_mongo_driver_access_time(record_property):
+    n = 50
+    start_time = time.perf_counter()
+    for _ in range(n):
+        client = MongoClient(db_uri, serverSelectionTimeoutMS=100)
+        client.get_database()
+        client.close()
+    new_client_time = (time.perf_counter() - start_time) / n
+
+    driver = MongoDriver(db_uri, 100)
+    try:
+        start_time = time.perf_counter()
+        for _ in range(n):
+            driver._db  # pylint: disable=pointless-statement
+        reused_client_time = (time.perf_counter() - start_time) / n
+    finally:
+        driver.close()
+
+    record_property('new_client_us', new_client_time * 1e6)
+    record_property('reused_client_us', reused_client_time * 1e6)
+    print(f'MongoDriver: database access with new client: {new_client_time * 1e6:.1f} us, with reused client: {reused_client_time * 1e6:.1f} us')